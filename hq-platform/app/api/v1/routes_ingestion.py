@@ -0,0 +1,39 @@
+# app/api/v1/routes_ingestion.py
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.base import get_db
+from app.domain.ingestion.encoding import BatchTooLarge, UnsupportedEncoding, decode_batch
+from app.domain.ingestion.schemas import EventBatchIn, IngestionResult
+from app.domain.ingestion.service import ingest_events
+
+
+router = APIRouter(prefix="/v1/ingestion", tags=["ingestion"])
+
+
+@router.post("/events", response_model=IngestionResult)
+async def ingest_events_endpoint(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    # body is JSON or the compressed columnar format, see domain/ingestion/encoding.py
+    try:
+        events = decode_batch(
+            await request.body(),
+            request.headers.get("content-type"),
+            request.headers.get("content-encoding"),
+            settings.INGESTION_MAX_BATCH_BYTES,
+        )
+        payload = EventBatchIn.model_validate({"events": events})
+    except UnsupportedEncoding as exc:
+        raise HTTPException(status_code=415, detail=str(exc))
+    except BatchTooLarge as exc:
+        raise HTTPException(status_code=413, detail=str(exc))
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False))
+    except (ValueError, KeyError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail=f"malformed batch: {exc}")
+
+    return await ingest_events(db, payload.events)
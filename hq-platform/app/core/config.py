@@ -0,0 +1,27 @@
+from pydantic_settings import BaseSettings
+
+class Settings(BaseSettings):
+    DB_URL: str
+    DB_SYNC_URL: str
+
+    # Ingestion: event_ids remembered in-process to short-circuit store retries
+    INGESTION_RECENT_IDS_CACHE_SIZE: int = 200_000
+    # upper bound on a decompressed batch body
+    INGESTION_MAX_BATCH_BYTES: int = 64 * 1024 * 1024
+
+    # Event queue feeding the analytics consumers; a store always maps to the
+    # same partition, which keeps its events in order. Changing the count
+    # remaps stores, so drain the queue first.
+    EVENT_QUEUE_PARTITIONS: int = 8
+    # Sale facts are loaded per partition in batches of up to this many events,
+    # flushed early once the oldest queued event has waited the max latency
+    ANALYTICS_BATCH_SIZE: int = 2000
+    ANALYTICS_MAX_LATENCY_SECONDS: float = 2.0
+    ANALYTICS_POLL_INTERVAL_SECONDS: float = 0.5
+    # run the consumers in this process (one task per queue partition)
+    ANALYTICS_CONSUMERS_ENABLED: bool = True
+    
+    class Config:
+        env_file = ".env"
+
+settings = Settings()
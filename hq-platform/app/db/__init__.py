@@ -0,0 +1,5 @@
+from app.db.base import Base  # noqa
+from app.db.models.inbox import InboxEvent
+from app.db.models.event_queue import QueuedEvent
+from app.db.models.sale_line_facts import SaleLineFact
+from app.db.models.dead_letters import DeadLetterEvent
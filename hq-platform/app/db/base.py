@@ -0,0 +1,20 @@
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import declarative_base, sessionmaker
+from app.core.config import settings
+
+DB_URL = settings.DB_URL
+
+engine = create_async_engine(DB_URL, future=True, echo=False)
+AsyncSessionLocal = sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+Base = declarative_base()
+
+
+async def get_db():
+    async with AsyncSessionLocal() as session:
+        yield session
\ No newline at end of file
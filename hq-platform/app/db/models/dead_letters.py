@@ -0,0 +1,35 @@
+# app/db/models/dead_letters.py
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class DeadLetterEvent(Base):
+    __tablename__ = "hq_event_dead_letters"
+
+    """Queued event the analytics consumer could not load.
+
+    Moved out of hq_event_queue with the error that rejected it, in the same
+    DB transaction as the rest of its batch, so one malformed payload does
+    not hold up its partition. Kept for inspection and manual replay.
+    """
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    queue_id = Column(BigInteger, nullable=False)
+    partition = Column(Integer, nullable=False)
+
+    event_id = Column(UUID(as_uuid=True), nullable=False)
+    event_type = Column(String, nullable=False)
+    store_id = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    occurred_at = Column(DateTime(timezone=True), nullable=False)
+    enqueued_at = Column(DateTime(timezone=True), nullable=False)
+
+    error = Column(Text, nullable=False)
+    failed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_hq_event_dead_letters_event_id", "event_id"),
+    )
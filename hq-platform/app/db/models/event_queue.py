@@ -0,0 +1,33 @@
+# app/db/models/event_queue.py
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class QueuedEvent(Base):
+    __tablename__ = "hq_event_queue"
+
+    """Accepted event waiting for the analytics consumers.
+
+    Stand-in for a Kafka topic: rows are appended by the ingestion insert,
+    partition is derived from store_id so each store's events stay in one
+    partition in id order, and a consumer deletes rows in the same DB
+    transaction that loads them, which makes consumption exactly-once.
+    """
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    partition = Column(Integer, nullable=False)
+
+    event_id = Column(UUID(as_uuid=True), nullable=False)
+    event_type = Column(String, nullable=False)
+    store_id = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    occurred_at = Column(DateTime(timezone=True), nullable=False)
+
+    enqueued_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_hq_event_queue_partition_id", "partition", "id"),
+    )
@@ -0,0 +1,32 @@
+# app/db/models/inbox.py
+from sqlalchemy import Column, Index, String, DateTime
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class InboxEvent(Base):
+    __tablename__ = "hq_inbox"
+
+    """Inbox record for an event received from a store edge.
+
+    The primary key on event_id is the idempotency guard: store relays retry
+    whole batches after timeouts, and only the first copy of each event is
+    inserted and handed to downstream processing.
+    """
+
+    event_id = Column(UUID(as_uuid=True), primary_key=True)
+    event_type = Column(String, nullable=False)
+    store_id = Column(String, nullable=False)
+    aggregate_type = Column(String, nullable=True)
+    aggregate_id = Column(String, nullable=True)
+
+    payload = Column(JSONB, nullable=False)
+
+    occurred_at = Column(DateTime(timezone=True), nullable=False)
+    received_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_hq_inbox_received_at", "received_at"),
+    )
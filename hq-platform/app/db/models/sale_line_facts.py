@@ -0,0 +1,43 @@
+# app/db/models/sale_line_facts.py
+from sqlalchemy import Column, DateTime, Index, Integer, Numeric, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class SaleLineFact(Base):
+    __tablename__ = "sale_line_facts"
+
+    """One sold line from a SaleRecorded event, denormalized for analytics.
+
+    Rows are bulk-loaded with COPY by the analytics consumers and never
+    updated; header fields are repeated on every line of the sale.
+    """
+
+    event_id = Column(UUID(as_uuid=True), primary_key=True)
+    line_number = Column(Integer, primary_key=True)
+
+    store_id = Column(String, nullable=False)
+    terminal_id = Column(String, nullable=True)
+    cashier_id = Column(String, nullable=True)
+    transaction_id = Column(UUID(as_uuid=True), nullable=True)
+    receipt_number = Column(String, nullable=True)
+    currency = Column(String, nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=False)
+
+    sku = Column(String, nullable=False)
+    barcode = Column(String, nullable=True)
+    product_name = Column(String, nullable=True)
+    quantity = Column(Numeric(18, 3), nullable=False)
+    unit_price = Column(Numeric(18, 2), nullable=False)
+    discount_amount = Column(Numeric(18, 2), nullable=False)
+    tax_amount = Column(Numeric(18, 2), nullable=False)
+    line_total = Column(Numeric(18, 2), nullable=False)
+
+    loaded_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_sale_line_facts_store_completed", "store_id", "completed_at"),
+        Index("ix_sale_line_facts_sku_completed", "sku", "completed_at"),
+    )
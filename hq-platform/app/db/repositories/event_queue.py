@@ -0,0 +1,63 @@
+from typing import Dict, List, Sequence
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+# advisory lock class for queue partitions: (class, partition) is held by
+# whichever consumer is loading that partition, across HQ processes
+QUEUE_LOCK_CLASS = 7301
+
+TRY_LOCK_PARTITION_SQL = text("""
+    SELECT pg_try_advisory_xact_lock(CAST(:lock_class AS integer), CAST(:partition AS integer))
+""")
+
+# payload comes back as text so the consumer can parse numbers as Decimal;
+# age is measured on the DB clock, the same one that stamped enqueued_at
+FETCH_PARTITION_BATCH_SQL = text("""
+    SELECT id, event_id, event_type, store_id, CAST(payload AS text) AS payload,
+           occurred_at, EXTRACT(EPOCH FROM clock_timestamp() - enqueued_at) AS age_seconds
+    FROM hq_event_queue
+    WHERE partition = :partition
+    ORDER BY id
+    LIMIT :limit
+""")
+
+DELETE_QUEUED_SQL = text("""
+    DELETE FROM hq_event_queue
+    WHERE partition = :partition AND id = ANY(:ids)
+""")
+
+# moves rejected events out of the queue with the error that rejected them;
+# the caller deletes them from the queue with the rest of the batch
+DEAD_LETTER_SQL = text("""
+    INSERT INTO hq_event_dead_letters (
+        queue_id, partition, event_id, event_type, store_id,
+        payload, occurred_at, enqueued_at, error
+    )
+    SELECT q.id, q.partition, q.event_id, q.event_type, q.store_id,
+           q.payload, q.occurred_at, q.enqueued_at, d.error
+    FROM unnest(CAST(:ids AS bigint[]), CAST(:errors AS text[])) AS d(id, error)
+    JOIN hq_event_queue q ON q.partition = :partition AND q.id = d.id
+""")
+
+async def try_lock_partition(db: AsyncSession, partition: int) -> bool:
+    """Take the partition's consumer lock until the current transaction ends."""
+    result = await db.execute(
+        TRY_LOCK_PARTITION_SQL, {"lock_class": QUEUE_LOCK_CLASS, "partition": partition}
+    )
+    return bool(result.scalar_one())
+
+async def fetch_partition_batch(db: AsyncSession, partition: int, limit: int) -> List[Row]:
+    result = await db.execute(FETCH_PARTITION_BATCH_SQL, {"partition": partition, "limit": limit})
+    return result.all()
+
+async def delete_queued(db: AsyncSession, partition: int, ids: Sequence[int]) -> None:
+    await db.execute(DELETE_QUEUED_SQL, {"partition": partition, "ids": list(ids)})
+
+async def dead_letter_queued(db: AsyncSession, partition: int, failures: Dict[int, str]) -> None:
+    """Copy queued events to hq_event_dead_letters; ``failures`` maps queue id to error."""
+    await db.execute(DEAD_LETTER_SQL, {
+        "partition": partition,
+        "ids": list(failures),
+        "errors": [error[:1000] for error in failures.values()],
+    })
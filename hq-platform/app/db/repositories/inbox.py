@@ -0,0 +1,63 @@
+
+import json
+from typing import List, Sequence
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+# One statement per batch regardless of size: the batch is passed as
+# parallel arrays and unnest()-ed, and the inbox PK does the dedup. Events
+# that were new are queued for the analytics consumers in the same
+# statement, on the queue partition owned by their store.
+INSERT_NEW_EVENTS_SQL = text("""
+    WITH src AS (
+        SELECT *
+        FROM unnest(
+            CAST(:event_ids AS uuid[]),
+            CAST(:event_types AS text[]),
+            CAST(:store_ids AS text[]),
+            CAST(:aggregate_types AS text[]),
+            CAST(:aggregate_ids AS text[]),
+            CAST(:payloads AS text[]),
+            CAST(:occurred_ats AS timestamptz[])
+        ) WITH ORDINALITY
+          AS e(event_id, event_type, store_id, aggregate_type, aggregate_id, payload, occurred_at, ord)
+    ), inserted AS (
+        INSERT INTO hq_inbox (
+            event_id, event_type, store_id, aggregate_type, aggregate_id, payload, occurred_at
+        )
+        SELECT event_id, event_type, store_id, aggregate_type, aggregate_id,
+               CAST(payload AS jsonb), occurred_at
+        FROM src
+        ON CONFLICT (event_id) DO NOTHING
+        RETURNING event_id
+    ), queued AS (
+        -- batch order is the store's outbox order; keep it in the queue ids
+        INSERT INTO hq_event_queue (partition, event_id, event_type, store_id, payload, occurred_at)
+        SELECT (hashtext(src.store_id) & 2147483647) % CAST(:partitions AS integer),
+               src.event_id, src.event_type, src.store_id, CAST(src.payload AS jsonb), src.occurred_at
+        FROM src
+        JOIN inserted ON inserted.event_id = src.event_id
+        ORDER BY src.ord
+    )
+    SELECT event_id FROM inserted
+""")
+
+async def insert_new_events(
+    db: AsyncSession,
+    events: Sequence,
+    partitions: int,
+) -> List[UUID]:
+    """Insert events not yet in the inbox and queue them over ``partitions``
+    queue partitions; returns the ids that were new."""
+    result = await db.execute(INSERT_NEW_EVENTS_SQL, {
+        "partitions": partitions,
+        "event_ids": [e.event_id for e in events],
+        "event_types": [e.event_type for e in events],
+        "store_ids": [e.store_id for e in events],
+        "aggregate_types": [e.aggregate_type for e in events],
+        "aggregate_ids": [e.aggregate_id for e in events],
+        "payloads": [json.dumps(e.payload) for e in events],
+        "occurred_ats": [e.timestamp for e in events],
+    })
+    return [row.event_id for row in result]
@@ -0,0 +1,155 @@
+# app/domain/analytics/consumer.py
+import asyncio
+import logging
+from typing import Dict, List
+
+import asyncpg
+
+from app.db.repositories.event_queue import (
+    dead_letter_queued,
+    delete_queued,
+    fetch_partition_batch,
+    try_lock_partition,
+)
+from .facts import FACT_COLUMNS, sale_line_records
+
+logger = logging.getLogger(__name__)
+
+# what a bad record can make COPY raise: client-side encoding (ValueError,
+# TypeError) or server-side data and constraint errors. Anything else, such
+# as a lost connection, fails the batch so it is retried whole.
+_REJECTED_RECORD_ERRORS = (
+    ValueError,
+    TypeError,
+    asyncpg.exceptions.DataError,
+    asyncpg.exceptions.IntegrityConstraintViolationError,
+)
+
+
+class PartitionConsumer:
+    """Loads one hq_event_queue partition into sale_line_facts in micro-batches.
+
+    Each batch is read in queue order, exploded into line records, COPY-ed
+    into the fact table and deleted from the queue in one DB transaction,
+    so a crash never loses or double-loads a batch. An event that cannot be
+    parsed or loaded is moved to hq_event_dead_letters in that transaction
+    instead of blocking its partition. A batch is committed
+    once it is full or its oldest event has waited ``max_latency`` seconds,
+    whichever comes first. An advisory lock keeps a partition with one
+    consumer at a time, which preserves per-store order across processes.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        partition: int,
+        batch_size: int,
+        max_latency: float,
+        poll_interval: float,
+    ):
+        self._session_factory = session_factory
+        self.partition = partition
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self.poll_interval = poll_interval
+        self._flush_in = poll_interval
+
+    async def run(self) -> None:
+        while True:
+            try:
+                consumed = await self.consume_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("analytics consumer for partition %d failed", self.partition)
+                consumed = 0
+                self._flush_in = self.poll_interval
+
+            # a full batch means there is probably more queued, so go again now
+            if consumed < self.batch_size:
+                await asyncio.sleep(min(self.poll_interval, self._flush_in))
+
+    async def consume_once(self) -> int:
+        """Load at most one batch; returns the number of events consumed."""
+        self._flush_in = self.poll_interval
+        async with self._session_factory() as db:
+            async with db.begin():
+                if not await try_lock_partition(db, self.partition):
+                    return 0
+                rows = await fetch_partition_batch(db, self.partition, self.batch_size)
+                if not rows:
+                    return 0
+                if len(rows) < self.batch_size and rows[0].age_seconds < self.max_latency:
+                    # not full and nothing overdue yet: let the batch grow
+                    self._flush_in = self.max_latency - float(rows[0].age_seconds)
+                    return 0
+
+                failures: Dict[int, str] = {}
+                loadable = []
+                for row in rows:
+                    try:
+                        loadable.append((row, sale_line_records(row)))
+                    except Exception as exc:
+                        failures[row.id] = f"{type(exc).__name__}: {exc}"
+
+                records = [record for _, event_records in loadable for record in event_records]
+                if records:
+                    try:
+                        async with db.begin_nested():
+                            await self._copy_facts(db, records)
+                    except _REJECTED_RECORD_ERRORS:
+                        # one bad event fails the whole COPY; load event by
+                        # event to find it and keep the rest of the batch
+                        records = []
+                        for row, event_records in loadable:
+                            if not event_records:
+                                continue
+                            try:
+                                async with db.begin_nested():
+                                    await self._copy_facts(db, event_records)
+                            except _REJECTED_RECORD_ERRORS as exc:
+                                failures[row.id] = f"{type(exc).__name__}: {exc}"
+                            else:
+                                records.extend(event_records)
+
+                if failures:
+                    for row in rows:
+                        if row.id in failures:
+                            logger.warning("partition %d: dead-lettered event %s (queue id %d): %s",
+                                           self.partition, row.event_id, row.id, failures[row.id])
+                    await dead_letter_queued(db, self.partition, failures)
+                await delete_queued(db, self.partition, [row.id for row in rows])
+
+        logger.debug("partition %d: loaded %d events, %d fact rows, %d dead-lettered",
+                     self.partition, len(rows) - len(failures), len(records), len(failures))
+        return len(rows)
+
+    @staticmethod
+    async def _copy_facts(db, records: List[tuple]) -> None:
+        conn = await db.connection()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            "sale_line_facts", records=records, columns=FACT_COLUMNS,
+        )
+
+
+def start_consumers(
+    session_factory,
+    partitions: int,
+    batch_size: int,
+    max_latency: float,
+    poll_interval: float,
+) -> List[asyncio.Task]:
+    """One consumer task per queue partition."""
+    return [
+        asyncio.create_task(
+            PartitionConsumer(
+                session_factory,
+                partition,
+                batch_size=batch_size,
+                max_latency=max_latency,
+                poll_interval=poll_interval,
+            ).run()
+        )
+        for partition in range(partitions)
+    ]
@@ -0,0 +1,65 @@
+# app/domain/analytics/facts.py
+import json
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+SALE_RECORDED = "SaleRecorded"
+
+# column order of the records handed to COPY
+FACT_COLUMNS = (
+    "event_id", "line_number", "store_id", "terminal_id", "cashier_id",
+    "transaction_id", "receipt_number", "currency", "completed_at",
+    "sku", "barcode", "product_name", "quantity", "unit_price",
+    "discount_amount", "tax_amount", "line_total",
+)
+
+
+def _decimal(value: Any) -> Decimal:
+    return Decimal(0) if value is None else Decimal(value)
+
+
+def _uuid(value: Any) -> Optional[uuid.UUID]:
+    return uuid.UUID(value) if value else None
+
+
+def _timestamp(value: Any, default: datetime) -> datetime:
+    return datetime.fromisoformat(value) if value else default
+
+
+def sale_line_records(row) -> List[Tuple]:
+    """Explode a queued SaleRecorded event into COPY records, one per line.
+
+    The payload shape is the one built by the edge outbox insert
+    (store-edge app/db/repositories/outbox.py).
+    """
+    if row.event_type != SALE_RECORDED:
+        return []
+    # parse_float keeps money exact; COPY's binary format wants Decimal for numeric
+    payload = json.loads(row.payload, parse_float=Decimal)
+    completed_at = _timestamp(payload.get("completed_at"), row.occurred_at)
+    transaction_id = _uuid(payload.get("transaction_id"))
+
+    return [
+        (
+            row.event_id,
+            int(line["line_number"]),
+            row.store_id,
+            payload.get("terminal_id"),
+            payload.get("cashier_id"),
+            transaction_id,
+            payload.get("receipt_number"),
+            payload.get("currency"),
+            completed_at,
+            line["sku_id"],
+            line.get("barcode"),
+            line.get("product_name"),
+            _decimal(line.get("quantity")),
+            _decimal(line.get("unit_price")),
+            _decimal(line.get("discount_amount")),
+            _decimal(line.get("tax_amount")),
+            _decimal(line.get("line_total")),
+        )
+        for line in payload.get("line_items") or []
+    ]
@@ -0,0 +1,34 @@
+# app/domain/ingestion/dedup.py
+from collections import OrderedDict
+from typing import Iterable
+from uuid import UUID
+
+
+class RecentEventIds:
+    """Bounded LRU of event_ids already committed to the inbox.
+
+    Store relays resend whole batches after a timeout, so most duplicates
+    are recent; answering them from memory keeps them off the database.
+    Only ids known to be committed are added, so a hit is always a true
+    duplicate and a miss simply falls through to the inbox insert.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._ids: "OrderedDict[UUID, None]" = OrderedDict()
+
+    def __contains__(self, event_id: UUID) -> bool:
+        if event_id in self._ids:
+            self._ids.move_to_end(event_id)
+            return True
+        return False
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add_many(self, event_ids: Iterable[UUID]) -> None:
+        for event_id in event_ids:
+            self._ids[event_id] = None
+            self._ids.move_to_end(event_id)
+        while len(self._ids) > self.capacity:
+            self._ids.popitem(last=False)
@@ -0,0 +1,98 @@
+# app/domain/ingestion/encoding.py
+"""Decoding of edge event batches (see store-edge app/domain/sync/encoding.py)."""
+import io
+import json
+import uuid
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+JSON_CONTENT_TYPE = "application/json"
+COLUMNAR_CONTENT_TYPE = "application/vnd.pos.events+msgpack"
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class UnsupportedEncoding(Exception):
+    pass
+
+
+class BatchTooLarge(Exception):
+    pass
+
+
+def _decompress(body: bytes, content_encoding: Optional[str], max_bytes: int) -> bytes:
+    if not content_encoding or content_encoding == "identity":
+        data = body
+    elif content_encoding == "gzip":
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        data = decompressor.decompress(body, max_bytes + 1)
+    elif content_encoding == "zstd":
+        if zstandard is None:
+            raise UnsupportedEncoding("zstd not available")
+        reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(body))
+        data = reader.read(max_bytes + 1)
+    else:
+        raise UnsupportedEncoding(f"unsupported Content-Encoding {content_encoding}")
+
+    if len(data) > max_bytes:
+        raise BatchTooLarge(f"decoded batch exceeds {max_bytes} bytes")
+    return data
+
+
+def _expand_columnar(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
+    if doc.get("v") != 1:
+        raise UnsupportedEncoding(f"unsupported columnar version {doc.get('v')}")
+
+    # (seq, event): groups split the batch by event_type, seq restores the
+    # edge's order; encoders that predate it keep group order
+    indexed = []
+    for group in doc["groups"]:
+        shared = group.get("shared", {})
+        shared_payload = group.get("shared_payload", {})
+        seqs = group.get("seq")
+        for i, event_id in enumerate(group["event_id"]):
+            event = {
+                "event_id": uuid.UUID(bytes=event_id),
+                "event_type": group["event_type"],
+                "aggregate_id": group["aggregate_id"][i],
+                "timestamp": EPOCH + timedelta(microseconds=group["timestamp_us"][i]),
+                "payload": {**shared_payload, **group["payload"][i]},
+            }
+            for name, value in shared.items():
+                event[name] = value
+            for name in ("store_id", "aggregate_type"):
+                if name in group:
+                    event[name] = group[name][i]
+            indexed.append((seqs[i] if seqs is not None else len(indexed), event))
+    indexed.sort(key=lambda item: item[0])
+    return [event for _, event in indexed]
+
+
+def decode_batch(
+    body: bytes,
+    content_type: Optional[str],
+    content_encoding: Optional[str],
+    max_bytes: int,
+) -> List[Dict[str, Any]]:
+    """Return the batch as a list of event dicts in EventIn shape."""
+    data = _decompress(body, content_encoding, max_bytes)
+    media_type = (content_type or JSON_CONTENT_TYPE).split(";")[0].strip()
+
+    if media_type == COLUMNAR_CONTENT_TYPE:
+        if msgpack is None:
+            raise UnsupportedEncoding("msgpack not available")
+        return _expand_columnar(msgpack.unpackb(data, raw=False))
+    if media_type == JSON_CONTENT_TYPE:
+        return json.loads(data)["events"]
+    raise UnsupportedEncoding(f"unsupported Content-Type {media_type}")
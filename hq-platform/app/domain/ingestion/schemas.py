@@ -0,0 +1,22 @@
+# app/domain/ingestion/schemas.py
+from datetime import datetime
+from pydantic import BaseModel
+from uuid import UUID
+from typing import Any, Dict, List, Optional
+
+class EventIn(BaseModel):
+    event_id: UUID
+    event_type: str
+    store_id: str
+    aggregate_type: Optional[str] = None
+    aggregate_id: Optional[str] = None
+    timestamp: datetime
+    payload: Dict[str, Any]
+
+class EventBatchIn(BaseModel):
+    events: List[EventIn]
+
+class IngestionResult(BaseModel):
+    accepted: int
+    duplicates: int
+    errors: List[str] = []
@@ -0,0 +1,34 @@
+# app/domain/ingestion/service.py
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.repositories.inbox import insert_new_events
+from .dedup import RecentEventIds
+from .schemas import EventIn, IngestionResult
+
+recent_event_ids = RecentEventIds(settings.INGESTION_RECENT_IDS_CACHE_SIZE)
+
+async def ingest_events(
+    db: AsyncSession,
+    events: List[EventIn],
+) -> IngestionResult:
+    # drop in-batch repeats and anything we committed recently
+    candidates = {}
+    for event in events:
+        if event.event_id not in candidates and event.event_id not in recent_event_ids:
+            candidates[event.event_id] = event
+
+    accepted_ids = []
+    if candidates:
+        accepted_ids = await insert_new_events(
+            db, list(candidates.values()), settings.EVENT_QUEUE_PARTITIONS
+        )
+        await db.commit()
+        # every candidate is in the inbox now, whether we inserted it or not
+        recent_event_ids.add_many(candidates.keys())
+
+    return IngestionResult(
+        accepted=len(accepted_ids),
+        duplicates=len(events) - len(accepted_ids),
+    )
@@ -0,0 +1,36 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from app.api.v1.routes_ingestion import router as ingestion_router
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+from app.domain.analytics.consumer import start_consumers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+    if settings.ANALYTICS_CONSUMERS_ENABLED:
+        tasks = start_consumers(
+            AsyncSessionLocal,
+            settings.EVENT_QUEUE_PARTITIONS,
+            batch_size=settings.ANALYTICS_BATCH_SIZE,
+            max_latency=settings.ANALYTICS_MAX_LATENCY_SECONDS,
+            poll_interval=settings.ANALYTICS_POLL_INTERVAL_SECONDS,
+        )
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+app = FastAPI(lifespan=lifespan)
+
+app.include_router(ingestion_router)
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
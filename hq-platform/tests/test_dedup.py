@@ -0,0 +1,50 @@
+from uuid import uuid4
+
+from app.domain.ingestion.dedup import RecentEventIds
+
+
+def test_remembers_added_ids():
+    seen = RecentEventIds(capacity=10)
+    known, unknown = uuid4(), uuid4()
+
+    seen.add_many([known])
+
+    assert known in seen
+    assert unknown not in seen
+    assert len(seen) == 1
+
+
+def test_evicts_least_recently_used_beyond_capacity():
+    seen = RecentEventIds(capacity=3)
+    a, b, c, d = (uuid4() for _ in range(4))
+    seen.add_many([a, b, c])
+
+    # a hit refreshes a, so b is the oldest when d arrives
+    assert a in seen
+    seen.add_many([d])
+
+    assert len(seen) == 3
+    assert b not in seen
+    assert all(event_id in seen for event_id in (a, c, d))
+
+
+def test_readding_an_id_refreshes_it_without_growing():
+    seen = RecentEventIds(capacity=2)
+    a, b, c = uuid4(), uuid4(), uuid4()
+    seen.add_many([a, b])
+
+    seen.add_many([a])
+    seen.add_many([c])
+
+    assert len(seen) == 2
+    assert a in seen and c in seen
+    assert b not in seen
+
+
+def test_a_batch_larger_than_capacity_keeps_its_newest_ids():
+    seen = RecentEventIds(capacity=2)
+    ids = [uuid4() for _ in range(5)]
+
+    seen.add_many(ids)
+
+    assert [event_id in seen for event_id in ids] == [False, False, False, True, True]
@@ -1,3 +1,4 @@
+import re
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
@@ -5,6 +6,7 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from app.db import import_models
 from app.db.base import Base
 from app.core.config import settings
 
@@ -24,8 +26,20 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
+import_models()
 target_metadata = Base.metadata
 
+# monthly/default partitions are managed by app/db/partitions.py, not autogenerate
+PARTITION_TABLE_RE = re.compile(r"^(transactions|line_items|outbox)_(p\d{4}_\d{2}|default)$")
+
+
+def include_name(name, type_, parent_names):
+    if type_ == "table":
+        return not PARTITION_TABLE_RE.match(name)
+    if type_ == "schema":
+        return name != "archive"
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -50,6 +64,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_name=include_name,
     )
 
     with context.begin_transaction():
@@ -71,7 +86,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,37 @@
+"""add transactions.last_line_number
+
+Revision ID: 5e0b6f2c8d17
+Revises: 3c7d1e9a4b52
+Create Date: 2026-02-18 14:03:22.907114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0b6f2c8d17'
+down_revision: Union[str, None] = '3c7d1e9a4b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('last_line_number', sa.Integer(), server_default='0', nullable=False))
+    # backfill for transactions that already have lines
+    op.execute("""
+        UPDATE transactions t
+        SET last_line_number = li.max_line
+        FROM (
+            SELECT transaction_id, MAX(line_number) AS max_line
+            FROM line_items
+            GROUP BY transaction_id
+        ) li
+        WHERE li.transaction_id = t.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('transactions', 'last_line_number')
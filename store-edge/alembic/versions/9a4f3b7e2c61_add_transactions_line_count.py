@@ -0,0 +1,36 @@
+"""add transactions.line_count
+
+Revision ID: 9a4f3b7e2c61
+Revises: 5e0b6f2c8d17
+Create Date: 2026-02-19 10:41:05.332871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f3b7e2c61'
+down_revision: Union[str, None] = '5e0b6f2c8d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('line_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute("""
+        UPDATE transactions t
+        SET line_count = li.n
+        FROM (
+            SELECT transaction_id, COUNT(*) AS n
+            FROM line_items
+            GROUP BY transaction_id
+        ) li
+        WHERE li.transaction_id = t.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('transactions', 'line_count')
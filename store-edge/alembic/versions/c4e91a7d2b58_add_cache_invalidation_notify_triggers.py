@@ -0,0 +1,110 @@
+"""add NOTIFY triggers for cross-worker cache invalidation
+
+Revision ID: c4e91a7d2b58
+Revises: b8e27c5f1d46
+Create Date: 2026-03-24 10:12:05.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e91a7d2b58'
+down_revision: Union[str, None] = 'b8e27c5f1d46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every worker keeps its own catalog index, pricing rules, availability
+    # cache and payment long-poll waiters; these triggers tell the others
+    # what changed, whichever process (or admin tool) made the change.
+    # All are statement-level, so a bulk statement sends one notification.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION catalog_notify() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('edge_catalog', TG_TABLE_NAME);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in ('local_catalog', 'local_promotions'):
+        op.execute(f"""
+            CREATE TRIGGER {table}_notify
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION catalog_notify()
+        """)
+
+    # The changed rows themselves, so other workers write them through like
+    # the one that made the change; payloads are capped at 8000 bytes, an
+    # empty one (large sweeps) asks listeners to re-read instead.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION local_inventory_notify() RETURNS trigger AS $$
+        DECLARE
+            payload text;
+        BEGIN
+            SELECT CAST(json_agg(json_build_array(store_id, sku, on_hand, reserved, updated_at)) AS text)
+            INTO payload
+            FROM changed_rows;
+            IF payload IS NULL THEN
+                RETURN NULL;
+            END IF;
+            IF octet_length(payload) > 7900 THEN
+                payload := '';
+            END IF;
+            PERFORM pg_notify('edge_inventory', payload);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    # transition tables need one trigger per event
+    for event in ('INSERT', 'UPDATE'):
+        op.execute(f"""
+            CREATE TRIGGER local_inventory_notify_{event.lower()}
+            AFTER {event} ON local_inventory
+            REFERENCING NEW TABLE AS changed_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION local_inventory_notify()
+        """)
+
+    # ids of payments whose status moved, 100 per notification
+    op.execute("""
+        CREATE OR REPLACE FUNCTION payments_status_notify() RETURNS trigger AS $$
+        DECLARE
+            ids text;
+        BEGIN
+            FOR ids IN
+                SELECT string_agg(CAST(changed.id AS text), ',')
+                FROM (
+                    SELECT n.id, (row_number() OVER () - 1) / 100 AS chunk
+                    FROM new_rows n
+                    JOIN old_rows o ON o.id = n.id
+                    WHERE n.status IS DISTINCT FROM o.status
+                ) changed
+                GROUP BY changed.chunk
+            LOOP
+                PERFORM pg_notify('edge_payments', ids);
+            END LOOP;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER payments_status_notify
+        AFTER UPDATE ON payments
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION payments_status_notify()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS payments_status_notify ON payments")
+    op.execute("DROP FUNCTION IF EXISTS payments_status_notify()")
+    for event in ('insert', 'update'):
+        op.execute(f"DROP TRIGGER IF EXISTS local_inventory_notify_{event} ON local_inventory")
+    op.execute("DROP FUNCTION IF EXISTS local_inventory_notify()")
+    for table in ('local_catalog', 'local_promotions'):
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_notify ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS catalog_notify()")
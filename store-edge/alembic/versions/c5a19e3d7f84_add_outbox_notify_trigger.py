@@ -0,0 +1,41 @@
+"""add outbox insert NOTIFY trigger
+
+Revision ID: c5a19e3d7f84
+Revises: b2d84c1f6e09
+Create Date: 2026-02-21 11:08:37.662940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a19e3d7f84'
+down_revision: Union[str, None] = 'b2d84c1f6e09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Statement-level so a multi-row insert wakes the relay once; identical
+    # notifications within one DB transaction are folded by Postgres too.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION outbox_notify() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('outbox_events', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER outbox_notify_insert
+        AFTER INSERT ON outbox
+        FOR EACH STATEMENT EXECUTE FUNCTION outbox_notify()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS outbox_notify_insert ON outbox")
+    op.execute("DROP FUNCTION IF EXISTS outbox_notify()")
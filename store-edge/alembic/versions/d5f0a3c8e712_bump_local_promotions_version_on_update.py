@@ -0,0 +1,45 @@
+"""bump local_promotions version and updated_at on every update
+
+Revision ID: d5f0a3c8e712
+Revises: c4e91a7d2b58
+Create Date: 2026-03-26 09:44:17.402981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f0a3c8e712'
+down_revision: Union[str, None] = 'c4e91a7d2b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Promotions are edited directly in the DB, where neither the ORM's
+    # onupdate nor a version bump happens; the compiled pricing rules are
+    # keyed by max(version)/max(updated_at), so every edit must move them.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION local_promotions_bump_version() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.version IS NOT DISTINCT FROM OLD.version THEN
+                NEW.version := OLD.version + 1;
+            END IF;
+            NEW.updated_at := clock_timestamp();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER local_promotions_bump_version
+        BEFORE UPDATE ON local_promotions
+        FOR EACH ROW EXECUTE FUNCTION local_promotions_bump_version()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS local_promotions_bump_version ON local_promotions")
+    op.execute("DROP FUNCTION IF EXISTS local_promotions_bump_version()")
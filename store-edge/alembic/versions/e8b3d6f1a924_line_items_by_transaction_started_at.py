@@ -0,0 +1,173 @@
+"""partition line_items by their transaction's started_at, restore keys
+
+Revision ID: e8b3d6f1a924
+Revises: d5f0a3c8e712
+Create Date: 2026-03-30 10:05:47.662190
+
+"""
+import re
+from datetime import date
+from typing import List, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3d6f1a924'
+down_revision: Union[str, None] = 'd5f0a3c8e712'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LINE_ITEM_COLUMN_NAMES = (
+    'id', 'transaction_id', 'line_number', 'sku', 'barcode', 'name', 'unit_price', 'quantity',
+    'discount_amount', 'tax_amount', 'tax_rate', 'line_total', 'uom', 'created_at', 'updated_at',
+)
+LINE_ITEM_COLUMNS = ', '.join(LINE_ITEM_COLUMN_NAMES)
+
+PARTITION_NAME_RE = re.compile(r"^(?P<table>\w+)_p(?P<year>\d{4})_(?P<month>\d{2})$")
+
+LIST_PARTITIONS_SQL = sa.text("""
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = CAST(CAST(:parent AS text) AS regclass)
+""")
+
+
+def _line_items_columns(partition_key: bool):
+    columns = [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('transaction_id', sa.UUID(), nullable=False),
+        sa.Column('line_number', sa.Integer(), nullable=False),
+        sa.Column('sku', sa.String(), nullable=False),
+        sa.Column('barcode', sa.String(), nullable=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('unit_price', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('quantity', sa.Numeric(precision=18, scale=3), nullable=False),
+        sa.Column('discount_amount', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('tax_amount', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('tax_rate', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('line_total', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('uom', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    ]
+    if partition_key:
+        columns.append(sa.Column('transaction_started_at', sa.DateTime(timezone=True), nullable=False))
+    return columns
+
+
+def _month_partitions(table: str) -> List[date]:
+    months = []
+    for (relname,) in op.get_bind().execute(LIST_PARTITIONS_SQL, {"parent": table}):
+        match = PARTITION_NAME_RE.match(relname)
+        if match and match["table"] == table:
+            months.append(date(int(match["year"]), int(match["month"]), 1))
+    return sorted(months)
+
+
+def _add_months(d: date, months: int) -> date:
+    index = d.year * 12 + (d.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_partitions(table: str, months: List[date]) -> None:
+    for month in months:
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+            f"TO ('{_add_months(month, 1).isoformat()} 00:00:00+00')"
+        )
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def _move_aside(table: str) -> None:
+    """Rename ``table`` and its partitions out of the way of the new layout."""
+    for (relname,) in op.get_bind().execute(LIST_PARTITIONS_SQL, {"parent": table}).all():
+        op.rename_table(relname, f'{relname}_old')
+    op.rename_table(table, f'{table}_old')
+
+
+def _drop_line_items_keys(table: str) -> None:
+    op.drop_constraint('line_items_pkey', table, type_='primary')
+    op.drop_index('ix_line_items_transaction_line', table_name=table)
+    op.drop_index('ix_line_items_sku', table_name=table)
+    op.drop_index('ix_line_items_barcode', table_name=table)
+
+
+def upgrade() -> None:
+    # unique keys on a partitioned table must contain the partition key;
+    # a replayed insert of the same event carries the same occurred_at.
+    # Receipt numbers get no such key: a retried checkout starts a new
+    # started_at, so it would reject nothing. receipt_counters alone keeps
+    # them unique per store (see f4c82a1d6b37).
+    op.drop_index('ix_outbox_event_id', table_name='outbox')
+    op.create_index('ix_outbox_event_id', 'outbox', ['event_id', 'occurred_at'], unique=True)
+
+    # Lines carry their transaction's started_at and are partitioned on it,
+    # so a line always sits in the same month as its header: the FK and the
+    # line_number key can include it, and lookups from a header prune.
+    _move_aside('line_items')
+    _drop_line_items_keys('line_items_old')
+
+    op.create_table('line_items',
+    *_line_items_columns(partition_key=True),
+    sa.ForeignKeyConstraint(
+        ['transaction_id', 'transaction_started_at'], ['transactions.id', 'transactions.started_at'],
+        name='fk_line_items_transaction',
+    ),
+    sa.PrimaryKeyConstraint('id', 'transaction_started_at', name='line_items_pkey'),
+    postgresql_partition_by='RANGE (transaction_started_at)'
+    )
+    op.create_index(op.f('ix_line_items_barcode'), 'line_items', ['barcode'], unique=False)
+    op.create_index(op.f('ix_line_items_sku'), 'line_items', ['sku'], unique=False)
+    op.create_index(
+        'ix_line_items_transaction_line', 'line_items',
+        ['transaction_id', 'transaction_started_at', 'line_number'], unique=True,
+    )
+    # same months as transactions, which app/db/partitions.py keeps in step
+    _create_partitions('line_items', _month_partitions('transactions'))
+
+    op.execute(f"""
+        INSERT INTO line_items ({LINE_ITEM_COLUMNS}, transaction_started_at)
+        SELECT {', '.join('li.' + name for name in LINE_ITEM_COLUMN_NAMES)}, t.started_at
+        FROM line_items_old li
+        JOIN transactions t ON t.id = li.transaction_id
+    """)
+    # lines whose header was already archived (a basket that crossed a month
+    # boundary) have nothing to reference; keep them next to the archive
+    op.execute(f"""
+        CREATE TABLE archive.line_items_orphaned AS
+        SELECT {LINE_ITEM_COLUMNS}
+        FROM line_items_old li
+        WHERE NOT EXISTS (SELECT 1 FROM transactions t WHERE t.id = li.transaction_id)
+    """)
+    op.drop_table('line_items_old')
+
+
+def downgrade() -> None:
+    _move_aside('line_items')
+    op.drop_constraint('fk_line_items_transaction', 'line_items_old', type_='foreignkey')
+    _drop_line_items_keys('line_items_old')
+
+    op.create_table('line_items',
+    *_line_items_columns(partition_key=False),
+    sa.PrimaryKeyConstraint('id', 'created_at', name='line_items_pkey'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index(op.f('ix_line_items_barcode'), 'line_items', ['barcode'], unique=False)
+    op.create_index(op.f('ix_line_items_sku'), 'line_items', ['sku'], unique=False)
+    op.create_index('ix_line_items_transaction_line', 'line_items', ['transaction_id', 'line_number'], unique=False)
+    _create_partitions('line_items', _month_partitions('transactions'))
+    op.execute(f"""
+        INSERT INTO line_items ({LINE_ITEM_COLUMNS})
+        SELECT {LINE_ITEM_COLUMNS} FROM line_items_old
+        UNION ALL
+        SELECT {LINE_ITEM_COLUMNS} FROM archive.line_items_orphaned
+    """)
+    op.drop_table('line_items_old')
+    op.drop_table('line_items_orphaned', schema='archive')
+
+    op.drop_index('ix_outbox_event_id', table_name='outbox')
+    op.create_index('ix_outbox_event_id', 'outbox', ['event_id'], unique=False)
@@ -0,0 +1,248 @@
+"""partition transactions, line_items and outbox by month
+
+Revision ID: f4c82a1d6b37
+Revises: e3b95d7c0a28
+Create Date: 2026-02-26 09:41:52.305118
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c82a1d6b37'
+down_revision: Union[str, None] = 'e3b95d7c0a28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# partitions created past the current month; app/db/partitions.py keeps it going
+MONTHS_AHEAD = 3
+
+PARTITION_KEYS = {
+    'transactions': 'started_at',
+    'line_items': 'created_at',
+    'outbox': 'occurred_at',
+}
+
+TRANSACTION_COLUMNS = (
+    'id, store_id, terminal_id, cashier_id, receipt_number, status, subtotal, '
+    'tax_amount, total, currency, last_line_number, line_count, started_at, '
+    'completed_at, cancelled_at, client_created_at, note, created_at, updated_at'
+)
+LINE_ITEM_COLUMNS = (
+    'id, transaction_id, line_number, sku, barcode, name, unit_price, quantity, '
+    'discount_amount, tax_amount, line_total, uom, created_at, updated_at'
+)
+OUTBOX_COLUMNS = (
+    'id, event_id, event_type, aggregate_type, aggregate_id, store_id, payload, '
+    'occurred_at, created_at, published_at, publish_attempts, last_error'
+)
+COLUMNS = {
+    'transactions': TRANSACTION_COLUMNS,
+    'line_items': LINE_ITEM_COLUMNS,
+    'outbox': OUTBOX_COLUMNS,
+}
+
+
+def _add_months(d: date, months: int) -> date:
+    index = d.year * 12 + (d.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _transactions_columns():
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('store_id', sa.String(), nullable=False),
+        sa.Column('terminal_id', sa.String(), nullable=False),
+        sa.Column('cashier_id', sa.String(), nullable=True),
+        sa.Column('receipt_number', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('subtotal', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('tax_amount', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('total', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('currency', sa.String(), nullable=False),
+        sa.Column('last_line_number', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('line_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('cancelled_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('client_created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('note', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    ]
+
+
+def _line_items_columns():
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('transaction_id', sa.UUID(), nullable=False),
+        sa.Column('line_number', sa.Integer(), nullable=False),
+        sa.Column('sku', sa.String(), nullable=False),
+        sa.Column('barcode', sa.String(), nullable=True),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('unit_price', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('quantity', sa.Numeric(precision=18, scale=3), nullable=False),
+        sa.Column('discount_amount', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('tax_amount', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('line_total', sa.Numeric(precision=18, scale=2), nullable=False),
+        sa.Column('uom', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    ]
+
+
+def _outbox_columns():
+    # id keeps drawing from the existing sequence so relay cursors stay valid
+    return [
+        sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('outbox_id_seq')"), nullable=False),
+        sa.Column('event_id', sa.UUID(), nullable=False),
+        sa.Column('event_type', sa.String(), nullable=False),
+        sa.Column('aggregate_type', sa.String(), nullable=False),
+        sa.Column('aggregate_id', sa.String(), nullable=False),
+        sa.Column('store_id', sa.String(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('publish_attempts', sa.BigInteger(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+    ]
+
+
+def _create_month_partitions(table: str, first: date, last: date) -> None:
+    month = first
+    while month <= last:
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+            f"TO ('{upper.isoformat()} 00:00:00+00')"
+        )
+        month = upper
+    # catches rows outside the pre-created range (e.g. a terminal with a bad clock)
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def _first_month(table: str, current: date) -> date:
+    oldest = op.get_bind().execute(
+        sa.text(f"SELECT min({PARTITION_KEYS[table]}) FROM {table}_unpartitioned")
+    ).scalar()
+    if oldest is None:
+        return current
+    return min(current, oldest.astimezone(timezone.utc).date().replace(day=1))
+
+
+def upgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS outbox_notify_insert ON outbox")
+
+    # move the old tables aside and free their constraint/index names
+    for table in ('transactions', 'line_items', 'outbox'):
+        op.rename_table(table, f'{table}_unpartitioned')
+    op.drop_constraint('line_items_transaction_id_fkey', 'line_items_unpartitioned', type_='foreignkey')
+    op.drop_constraint('line_items_pkey', 'line_items_unpartitioned', type_='primary')
+    op.drop_index('ix_line_items_transaction_line', table_name='line_items_unpartitioned')
+    op.drop_index('ix_line_items_sku', table_name='line_items_unpartitioned')
+    op.drop_index('ix_line_items_barcode', table_name='line_items_unpartitioned')
+    op.drop_constraint('uq_transactions_store_receipt', 'transactions_unpartitioned', type_='unique')
+    op.drop_constraint('transactions_pkey', 'transactions_unpartitioned', type_='primary')
+    op.drop_index('ix_transactions_store_terminal_started', table_name='transactions_unpartitioned')
+    op.drop_constraint('outbox_pkey', 'outbox_unpartitioned', type_='primary')
+    op.drop_index('ix_outbox_event_id', table_name='outbox_unpartitioned')
+    op.drop_index('ix_outbox_published_id', table_name='outbox_unpartitioned')
+    op.execute("ALTER SEQUENCE outbox_id_seq OWNED BY NONE")
+
+    # primary keys must include the partition key; global uniqueness of
+    # receipt_number, (transaction_id, line_number) and event_id is left to
+    # their allocators (receipt_counters, last_line_number, uuid4)
+    op.create_table('transactions',
+    *_transactions_columns(),
+    sa.PrimaryKeyConstraint('id', 'started_at'),
+    postgresql_partition_by='RANGE (started_at)'
+    )
+    op.create_index('ix_transactions_store_receipt', 'transactions', ['store_id', 'receipt_number'], unique=False)
+    op.create_index('ix_transactions_store_terminal_started', 'transactions', ['store_id', 'terminal_id', 'started_at'], unique=False)
+    op.create_table('line_items',
+    *_line_items_columns(),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index(op.f('ix_line_items_barcode'), 'line_items', ['barcode'], unique=False)
+    op.create_index(op.f('ix_line_items_sku'), 'line_items', ['sku'], unique=False)
+    op.create_index('ix_line_items_transaction_line', 'line_items', ['transaction_id', 'line_number'], unique=False)
+    op.create_table('outbox',
+    *_outbox_columns(),
+    sa.PrimaryKeyConstraint('id', 'occurred_at'),
+    postgresql_partition_by='RANGE (occurred_at)'
+    )
+    op.create_index(op.f('ix_outbox_event_id'), 'outbox', ['event_id'], unique=False)
+    op.create_index('ix_outbox_published_id', 'outbox', ['published_at', 'id'], unique=False)
+    op.execute("ALTER SEQUENCE outbox_id_seq OWNED BY outbox.id")
+
+    current = datetime.now(timezone.utc).date().replace(day=1)
+    for table, columns in COLUMNS.items():
+        _create_month_partitions(table, _first_month(table, current), _add_months(current, MONTHS_AHEAD))
+        op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_unpartitioned")
+        op.drop_table(f'{table}_unpartitioned')
+
+    # statement-level trigger on the parent fires for inserts routed to any partition
+    op.execute("""
+        CREATE TRIGGER outbox_notify_insert
+        AFTER INSERT ON outbox
+        FOR EACH STATEMENT EXECUTE FUNCTION outbox_notify()
+    """)
+    op.execute("CREATE SCHEMA IF NOT EXISTS archive")
+
+
+def downgrade() -> None:
+    # partitions already detached into the archive schema are left there
+    op.execute("DROP TRIGGER IF EXISTS outbox_notify_insert ON outbox")
+    for table in ('transactions', 'line_items', 'outbox'):
+        op.rename_table(table, f'{table}_partitioned')
+    op.execute("ALTER SEQUENCE outbox_id_seq OWNED BY NONE")
+    op.drop_constraint('transactions_pkey', 'transactions_partitioned', type_='primary')
+    op.drop_index('ix_transactions_store_receipt', table_name='transactions_partitioned')
+    op.drop_index('ix_transactions_store_terminal_started', table_name='transactions_partitioned')
+    op.drop_constraint('line_items_pkey', 'line_items_partitioned', type_='primary')
+    op.drop_index('ix_line_items_transaction_line', table_name='line_items_partitioned')
+    op.drop_index('ix_line_items_sku', table_name='line_items_partitioned')
+    op.drop_index('ix_line_items_barcode', table_name='line_items_partitioned')
+    op.drop_constraint('outbox_pkey', 'outbox_partitioned', type_='primary')
+    op.drop_index('ix_outbox_event_id', table_name='outbox_partitioned')
+    op.drop_index('ix_outbox_published_id', table_name='outbox_partitioned')
+
+    op.create_table('transactions',
+    *_transactions_columns(),
+    sa.PrimaryKeyConstraint('id', name='transactions_pkey'),
+    sa.UniqueConstraint('store_id', 'receipt_number', name='uq_transactions_store_receipt')
+    )
+    op.create_index('ix_transactions_store_terminal_started', 'transactions', ['store_id', 'terminal_id', 'started_at'], unique=False)
+    op.create_table('line_items',
+    *_line_items_columns(),
+    sa.ForeignKeyConstraint(['transaction_id'], ['transactions.id'], name='line_items_transaction_id_fkey'),
+    sa.PrimaryKeyConstraint('id', name='line_items_pkey')
+    )
+    op.create_index(op.f('ix_line_items_barcode'), 'line_items', ['barcode'], unique=False)
+    op.create_index(op.f('ix_line_items_sku'), 'line_items', ['sku'], unique=False)
+    op.create_index('ix_line_items_transaction_line', 'line_items', ['transaction_id', 'line_number'], unique=True)
+    op.create_table('outbox',
+    *_outbox_columns(),
+    sa.PrimaryKeyConstraint('id', name='outbox_pkey')
+    )
+    op.create_index(op.f('ix_outbox_event_id'), 'outbox', ['event_id'], unique=True)
+    op.create_index('ix_outbox_published_id', 'outbox', ['published_at', 'id'], unique=False)
+    op.execute("ALTER SEQUENCE outbox_id_seq OWNED BY outbox.id")
+
+    for table, columns in COLUMNS.items():
+        op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_partitioned")
+        op.drop_table(f'{table}_partitioned')
+
+    op.execute("""
+        CREATE TRIGGER outbox_notify_insert
+        AFTER INSERT ON outbox
+        FOR EACH STATEMENT EXECUTE FUNCTION outbox_notify()
+    """)
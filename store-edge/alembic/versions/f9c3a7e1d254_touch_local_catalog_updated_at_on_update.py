@@ -0,0 +1,44 @@
+"""set local_catalog updated_at on every update
+
+Revision ID: f9c3a7e1d254
+Revises: e8b3d6f1a924
+Create Date: 2026-04-02 14:21:09.530417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f9c3a7e1d254'
+down_revision: Union[str, None] = 'e8b3d6f1a924'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The catalog index is keyed by (max version, count, max updated_at).
+    # version belongs to HQ and guards replays in catalog sync, so unlike
+    # local_promotions (d5f0a3c8e712) it is left alone here. Moving
+    # updated_at is enough to move the stamp on a direct edit of a row that
+    # is not the newest.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION local_catalog_touch_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at := clock_timestamp();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER local_catalog_touch_updated_at
+        BEFORE UPDATE ON local_catalog
+        FOR EACH ROW EXECUTE FUNCTION local_catalog_touch_updated_at()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS local_catalog_touch_updated_at ON local_catalog")
+    op.execute("DROP FUNCTION IF EXISTS local_catalog_touch_updated_at()")
@@ -0,0 +1,26 @@
+# app/api/v1/routes_catalog.py
+from fastapi import APIRouter, HTTPException
+from typing import Optional
+
+from app.core.config import settings
+from app.domain.catalog.schemas import CatalogItemOut
+from app.domain.catalog.service import lookup_catalog_item, to_catalog_item_out
+
+
+router = APIRouter(prefix="/api/v1/catalog", tags=["catalog"])
+
+
+@router.get("/items", response_model=CatalogItemOut)
+async def lookup_item_endpoint(
+    barcode: Optional[str] = None,
+    sku_id: Optional[str] = None,
+    store_id: Optional[str] = None,
+):
+    if barcode is None and sku_id is None:
+        raise HTTPException(status_code=422, detail="barcode or sku_id is required")
+
+    # served from the in-memory index, no DB round trip on the scan path
+    entry = lookup_catalog_item(store_id or settings.STORE_ID, barcode=barcode, sku=sku_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Item not found")
+    return to_catalog_item_out(entry)
@@ -1,12 +1,31 @@
 # app/api/v1/routes_checkout.py
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import JSONResponse
+from typing import Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
 from app.db.base import get_db 
-from app.domain.checkout.schemas import AddItem, LineItemOut, TransactionCreate, TransactionOut
-from app.domain.checkout.service import add_item_to_transaction, create_transaction
+from app.domain.checkout.schemas import (
+    AddItem,
+    BasketOut,
+    BasketUpdate,
+    LineItemOut,
+    TransactionCreate,
+    TransactionOut,
+    TransactionTotalsOut,
+    UpdateItemQuantity,
+)
+from app.domain.checkout.service import (
+    add_item_to_transaction,
+    create_transaction,
+    finalize_transaction,
+    remove_item_from_transaction,
+    submit_basket,
+    update_item_quantity,
+    void_transaction,
+)
 
 
 router = APIRouter(prefix="/api/v1/transactions", tags=["transactions"])
@@ -28,4 +47,51 @@ async def add_item_endpoint(
 ):
     # ở bước sau có thể thêm check txn thuộc store/terminal hiện tại
     line = await add_item_to_transaction(db, transaction_id, payload)
-    return line
\ No newline at end of file
+    return line
+
+@router.patch("/{transaction_id}/items/{line_item_id}", response_model=LineItemOut)
+async def update_item_quantity_endpoint(
+    transaction_id: UUID,
+    line_item_id: UUID,
+    payload: UpdateItemQuantity,
+    db: AsyncSession = Depends(get_db),
+):
+    line = await update_item_quantity(db, transaction_id, line_item_id, payload.quantity)
+    return line
+
+@router.delete("/{transaction_id}/items/{line_item_id}", response_model=TransactionTotalsOut)
+async def remove_item_endpoint(
+    transaction_id: UUID,
+    line_item_id: UUID,
+    db: AsyncSession = Depends(get_db),
+):
+    totals = await remove_item_from_transaction(db, transaction_id, line_item_id)
+    return totals
+
+@router.put("/{transaction_id}/basket", response_model=BasketOut)
+async def submit_basket_endpoint(
+    transaction_id: UUID,
+    payload: BasketUpdate,
+    idempotency_key: Optional[str] = Header(default=None, max_length=255),
+    db: AsyncSession = Depends(get_db),
+):
+    # one round trip per scanner burst; retries with the same Idempotency-Key replay the first result
+    basket, replayed = await submit_basket(db, transaction_id, payload, idempotency_key)
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return JSONResponse(content=basket, headers=headers)
+
+@router.post("/{transaction_id}/finalize", response_model=TransactionOut)
+async def finalize_transaction_endpoint(
+    transaction_id: UUID,
+    db: AsyncSession = Depends(get_db),
+):
+    txn = await finalize_transaction(db, transaction_id)
+    return txn
+
+@router.post("/{transaction_id}/void", response_model=TransactionOut)
+async def void_transaction_endpoint(
+    transaction_id: UUID,
+    db: AsyncSession = Depends(get_db),
+):
+    txn = await void_transaction(db, transaction_id)
+    return txn
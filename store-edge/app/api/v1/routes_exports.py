@@ -0,0 +1,43 @@
+# app/api/v1/routes_exports.py
+from datetime import date
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional
+
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+from app.domain.exports.service import MEDIA_TYPES, export_transactions
+from app.domain.reports.service import business_day_range
+
+
+router = APIRouter(prefix="/api/v1/exports", tags=["exports"])
+
+
+@router.get("/transactions")
+async def export_transactions_endpoint(
+    first: date = Query(alias="from"),
+    last: Optional[date] = Query(default=None, alias="to"),
+    format: Literal["ndjson", "csv"] = "ndjson",
+    status: Optional[str] = None,
+    store_id: Optional[str] = None,
+):
+    last = last or first
+    if last < first:
+        raise HTTPException(status_code=422, detail="'to' is before 'from'")
+    start, _ = business_day_range(first)
+    _, end = business_day_range(last)
+    store_id = store_id or settings.STORE_ID
+
+    # the stream opens its own sessions: a request-scoped one is closed before the body is sent
+    chunks = export_transactions(
+        AsyncSessionLocal, store_id, start, end, format, status,
+        page_size=settings.EXPORT_PAGE_SIZE,
+        fetch_size=settings.EXPORT_FETCH_SIZE,
+        chunk_bytes=settings.EXPORT_CHUNK_BYTES,
+    )
+    filename = f"transactions_{store_id}_{first}_{last}.{format}"
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
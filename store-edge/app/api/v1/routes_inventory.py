@@ -0,0 +1,32 @@
+# app/api/v1/routes_inventory.py
+from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.base import get_db
+from app.domain.inventory.schemas import StockAdjustment, StockLevelOut
+from app.domain.inventory.service import adjust_inventory, get_stock_level, to_stock_level_out
+
+
+router = APIRouter(prefix="/api/v1/inventory", tags=["inventory"])
+
+
+@router.get("/{sku_id}", response_model=StockLevelOut)
+async def get_stock_level_endpoint(
+    sku_id: str,
+    store_id: Optional[str] = None,
+):
+    store_id = store_id or settings.STORE_ID
+    level = get_stock_level(store_id, sku_id)
+    if level is None:
+        raise HTTPException(status_code=404, detail="No stock record for item")
+    return to_stock_level_out(store_id, sku_id, level)
+
+
+@router.post("/adjustments", response_model=StockLevelOut)
+async def adjust_inventory_endpoint(
+    payload: StockAdjustment,
+    db: AsyncSession = Depends(get_db),
+):
+    return await adjust_inventory(db, settings.STORE_ID, payload)
@@ -0,0 +1,42 @@
+# app/api/v1/routes_payments.py
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.base import get_db
+from app.db.models.payments import PaymentStatus
+from app.domain.payments.schemas import PaymentCreate, PaymentOut
+from app.domain.payments.service import cancel_payment, create_payment, wait_for_payment
+
+
+router = APIRouter(prefix="/api/v1/payments", tags=["payments"])
+
+
+@router.post("", response_model=PaymentOut)
+async def create_payment_endpoint(
+    payload: PaymentCreate,
+    db: AsyncSession = Depends(get_db),
+):
+    return await create_payment(db, payload)
+
+
+@router.get("/{payment_id}", response_model=PaymentOut)
+async def get_payment_endpoint(
+    payment_id: UUID,
+    status: Optional[PaymentStatus] = None,
+    wait: float = Query(default=0.0, ge=0),
+    db: AsyncSession = Depends(get_db),
+):
+    # long-poll: with status and wait set, answers as soon as the status moves on
+    timeout = min(wait, settings.PAYMENT_LONG_POLL_MAX_SECONDS)
+    return await wait_for_payment(db, payment_id, status, timeout)
+
+
+@router.post("/{payment_id}/cancel", response_model=PaymentOut)
+async def cancel_payment_endpoint(
+    payment_id: UUID,
+    db: AsyncSession = Depends(get_db),
+):
+    return await cancel_payment(db, payment_id)
@@ -0,0 +1,55 @@
+# app/api/v1/routes_reports.py
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.base import get_db
+from app.domain.reports.schemas import CashierTotalsReport, SalesByHourReport, TopSkusReport
+from app.domain.reports.service import (
+    get_cashier_totals,
+    get_sales_by_hour,
+    get_top_skus,
+    today_in_store,
+)
+
+
+router = APIRouter(prefix="/api/v1/reports", tags=["reports"])
+
+
+@router.get("/sales-by-hour", response_model=SalesByHourReport)
+async def sales_by_hour_endpoint(
+    business_date: Optional[date] = None,
+    store_id: Optional[str] = None,
+    terminal_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_sales_by_hour(
+        db, store_id or settings.STORE_ID, business_date or today_in_store(), terminal_id
+    )
+
+
+@router.get("/top-skus", response_model=TopSkusReport)
+async def top_skus_endpoint(
+    business_date: Optional[date] = None,
+    store_id: Optional[str] = None,
+    terminal_id: Optional[str] = None,
+    limit: int = Query(default=10, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_top_skus(
+        db, store_id or settings.STORE_ID, business_date or today_in_store(), limit, terminal_id
+    )
+
+
+@router.get("/cashiers", response_model=CashierTotalsReport)
+async def cashier_totals_endpoint(
+    business_date: Optional[date] = None,
+    store_id: Optional[str] = None,
+    terminal_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_cashier_totals(
+        db, store_id or settings.STORE_ID, business_date or today_in_store(), terminal_id
+    )
@@ -1,10 +1,120 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DB_URL: str
     DB_SYNC_URL: str
+
+    STORE_ID: str = "STORE_001"
+    # business days for reports; rollups are hourly, so whole-hour offsets only
+    STORE_TIMEZONE: str = "Asia/Ho_Chi_Minh"
+
+    # Connection pool, per worker process (sized for 5 terminals plus relay/sync
+    # background work); the LISTEN and leader lock connections come out of it
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT_SECONDS: float = 5.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # costs a round trip per checkout; only worth it if connections get cut silently
+    DB_POOL_PRE_PING: bool = False
+    # per-connection LRU of prepared statements kept by the asyncpg adapter
+    DB_STATEMENT_CACHE_SIZE: int = 256
+    # connections opened and primed with the hot checkout statements at startup
+    DB_WARMUP_CONNECTIONS: int = 5
+
+    # Multi-worker mode: relay, catalog sync, payment poller, sweepers and
+    # partition maintenance run only in the worker holding this advisory lock
+    # (per store); the others retry every LEADER_RETRY_SECONDS
+    LEADER_LOCK_NAME: str = "store-edge:background-jobs"
+    LEADER_RETRY_SECONDS: float = 5.0
+    # each worker LISTENs for catalog/inventory/payment changes made by the
+    # others; periodic refreshes remain the fallback while it reconnects
+    NOTIFY_RECONNECT_SECONDS: float = 5.0
+
+    # Log statements slower than this (ms) with a literal-free fingerprint; None disables
+    SLOW_QUERY_MS: Optional[float] = None
+
+    # Catalog index: seconds between version checks against local_catalog
+    CATALOG_INDEX_REFRESH_SECONDS: float = 5.0
+
+    # Checkout: re-aggregate line items at finalize and compare with running totals
+    CHECKOUT_VERIFY_TOTALS: bool = False
+
+    # Basket submissions: stored responses for Idempotency-Key replays
+    IDEMPOTENCY_KEY_TTL_SECONDS: float = 24 * 3600.0
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = 3600.0
+
+    # Inventory: DRAFT baskets hold soft reservations, released by the sweeper
+    # once the basket has been idle for the TTL; availability is served from
+    # an in-process cache refreshed with changes made by other processes
+    INVENTORY_RESERVATIONS_ENABLED: bool = True
+    RESERVATION_TTL_SECONDS: float = 1800.0
+    RESERVATION_SWEEP_INTERVAL_SECONDS: float = 60.0
+    AVAILABILITY_REFRESH_SECONDS: float = 5.0
+
+    # Receipt numbers: "block" caches per-terminal ranges in process (gaps after
+    # a restart), "gapless" bumps the terminal's counter inside the create statement
+    RECEIPT_ALLOCATION_MODE: str = "block"
+    RECEIPT_BLOCK_SIZE: int = 50
+
+    # Monthly partitions of transactions/line_items/outbox: created ahead of time,
+    # old sale partitions detached into the "archive" schema, published outbox
+    # partitions dropped
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 6 * 3600.0
+    PARTITION_MONTHS_AHEAD: int = 3
+    TRANSACTION_RETENTION_MONTHS: int = 24
+    OUTBOX_RETENTION_MONTHS: int = 1
+
+    # Transaction exports: transactions per keyset page, rows per cursor fetch, bytes per streamed chunk
+    EXPORT_PAGE_SIZE: int = 500
+    EXPORT_FETCH_SIZE: int = 100
+    EXPORT_CHUNK_BYTES: int = 64 * 1024
+
+    # Payments: one poller drives all active payments; providers listed here are registered
+    PAYMENT_PROVIDERS: str = "fake"
+    PAYMENT_POLL_INTERVAL_SECONDS: float = 1.0
+    PAYMENT_PROVIDER_TIMEOUT_SECONDS: float = 0.4
+    PAYMENT_LONG_POLL_MAX_SECONDS: float = 25.0
+    PAYMENT_PROVIDER_MAX_CONCURRENCY: int = 4
+    PAYMENT_STATUS_BATCH_SIZE: int = 50
+
+    # HQ connectivity; the outbox relay only starts when HQ_BASE_URL is set
+    HQ_BASE_URL: Optional[str] = None
+    HQ_TIMEOUT_SECONDS: float = 10.0
+    HQ_PING_TIMEOUT_SECONDS: float = 3.0
+    # batch upload encoding: "columnar" (msgpack) or "json"; compression "zstd", "gzip" or "none"
+    SYNC_WIRE_FORMAT: str = "columnar"
+    SYNC_WIRE_COMPRESSION: str = "zstd"
+
+    # Sync agent: HQ health pings and offline detection (design section 4.3)
+    SYNC_PING_INTERVAL_SECONDS: float = 10.0
+    SYNC_OFFLINE_AFTER_FAILURES: int = 3
+    SYNC_MAX_PING_BACKOFF_SECONDS: float = 300.0
+    # backlog drain after reconnect: parallel batches, capped so checkout keeps its DB share
+    SYNC_CATCHUP_MAX_IN_FLIGHT: int = 4
+    SYNC_CATCHUP_RATE_PER_SECOND: Optional[float] = 2000.0
+
+    # Catalog sync: delta pulls from HQ (design target: changes visible within 15 min)
+    CATALOG_SYNC_INTERVAL_SECONDS: float = 300.0
+
+    # Outbox relay
+    OUTBOX_BATCH_SIZE: int = 200
+    # >1 drains faster but batches may reach HQ out of outbox.id order
+    OUTBOX_MAX_IN_FLIGHT: int = 1
+    # relay wakes on NOTIFY from the outbox insert trigger; polling is only a safety net
+    OUTBOX_FALLBACK_POLL_SECONDS: float = 30.0
+    # used instead of the fallback when LISTEN could not be established
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    # wait this long after a wake-up so bursts of notifications share one batch fetch
+    OUTBOX_NOTIFY_COALESCE_SECONDS: float = 0.05
+    OUTBOX_MAX_BACKOFF_SECONDS: float = 300.0
+    # per-event retry schedule after a failed publish: base * 2^attempts, capped at the max backoff
+    OUTBOX_RETRY_BASE_SECONDS: float = 1.0
+    # claimed events are skipped by other relays this long; keep it well above HQ_TIMEOUT_SECONDS
+    OUTBOX_CLAIM_LEASE_SECONDS: float = 60.0
     
     class Config:
         env_file = ".env"
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
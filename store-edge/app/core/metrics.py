@@ -0,0 +1,192 @@
+# app/core/metrics.py
+import contextvars
+import hashlib
+import logging
+import re
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger("app.slow_query")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.5, 1.0, 2.5, 5.0)
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+    route: str = ""
+
+
+_request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "request_stats", default=None
+)
+
+
+class _RouteMetrics:
+    __slots__ = ("count", "buckets", "latency_sum", "statements", "db_seconds", "pool_wait_seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+
+
+class MetricsRegistry:
+    """Process-local request/DB metrics rendered in Prometheus text format."""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], _RouteMetrics] = defaultdict(_RouteMetrics)
+        self.responses: Dict[Tuple[str, str, int], int] = defaultdict(int)
+        self.slow_queries: Dict[str, int] = defaultdict(int)
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats) -> None:
+        m = self.routes[(method, route)]
+        m.count += 1
+        m.latency_sum += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                m.buckets[i] += 1
+        m.statements += stats.statements
+        m.db_seconds += stats.db_seconds
+        m.pool_wait_seconds += stats.pool_wait_seconds
+        self.responses[(method, route, status)] += 1
+
+    def render(self, gauges: Optional[Dict[str, float]] = None) -> str:
+        lines: List[str] = []
+
+        lines.append("# TYPE edge_http_requests_total counter")
+        for (method, route, status), n in sorted(self.responses.items()):
+            lines.append(f'edge_http_requests_total{{method="{method}",route="{route}",status="{status}"}} {n}')
+
+        lines.append("# TYPE edge_http_request_duration_seconds histogram")
+        for (method, route), m in sorted(self.routes.items()):
+            labels = f'method="{method}",route="{route}"'
+            for bound, n in zip(LATENCY_BUCKETS, m.buckets):
+                lines.append(f'edge_http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {n}')
+            lines.append(f'edge_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {m.count}')
+            lines.append(f"edge_http_request_duration_seconds_sum{{{labels}}} {m.latency_sum:.6f}")
+            lines.append(f"edge_http_request_duration_seconds_count{{{labels}}} {m.count}")
+
+        for name, attr in (
+            ("edge_http_request_db_statements_total", "statements"),
+            ("edge_http_request_db_seconds_total", "db_seconds"),
+            ("edge_http_request_pool_wait_seconds_total", "pool_wait_seconds"),
+        ):
+            lines.append(f"# TYPE {name} counter")
+            for (method, route), m in sorted(self.routes.items()):
+                lines.append(f'{name}{{method="{method}",route="{route}"}} {getattr(m, attr)}')
+
+        lines.append("# TYPE edge_slow_queries_total counter")
+        for fingerprint, n in sorted(self.slow_queries.items()):
+            lines.append(f'edge_slow_queries_total{{fingerprint="{fingerprint}"}} {n}')
+
+        for name, value in sorted((gauges or {}).items()):
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\$\d+|%\(\w+\)s|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint_statement(statement: str) -> Tuple[str, str]:
+    """Normalize literals/placeholders and whitespace; returns (fingerprint, normalized)."""
+    normalized = _WHITESPACE.sub(" ", _LITERALS.sub("?", statement)).strip()
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12], normalized
+
+
+def install_db_hooks(engine, slow_query_ms: Optional[float] = None) -> None:
+    """Attach cursor-execute timing to the engine; stats land on the current request."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    # the start time lives on the execution context, which is dropped with a
+    # failed statement; a per-connection stack would keep it and skew the
+    # next statement's timing
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_query_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_metrics_query_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+        if slow_query_ms is not None and elapsed * 1000 >= slow_query_ms:
+            fingerprint, normalized = fingerprint_statement(statement)
+            registry.slow_queries[fingerprint] += 1
+            logger.warning(
+                "slow query %s %.1fms route=%s: %s",
+                fingerprint, elapsed * 1000, stats.route if stats else "-", normalized[:300],
+            )
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that charges connection checkout wait to the current request."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            stats = _request_stats.get()
+            if stats is not None:
+                stats.pool_wait_seconds += time.perf_counter() - start
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, SQL count, DB time and pool wait per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(route=scope["path"])
+        token = _request_stats.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                total_ms = (time.perf_counter() - start) * 1000
+                message.setdefault("headers", []).append((
+                    b"server-timing",
+                    (f"db;dur={stats.db_seconds * 1000:.1f}, "
+                     f"pool;dur={stats.pool_wait_seconds * 1000:.1f}, "
+                     f"app;dur={total_ms:.1f}").encode(),
+                ))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            # route template (not the raw path) keeps label cardinality bounded
+            route = scope.get("route")
+            stats.route = getattr(route, "path", None) or "unmatched"
+            registry.observe(scope["method"], stats.route, status, time.perf_counter() - start, stats)
@@ -0,0 +1,55 @@
+# app/core/startup.py
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """Wall-clock time of each startup phase of this worker.
+
+    Created when app.main starts importing, so the "imports" phase covers
+    FastAPI and every app module. Logged as one line once the worker is
+    ready and exported as gauges on /metrics to track regressions.
+    """
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._last = self._started
+        self.phases: Dict[str, float] = {}
+        self.total: Optional[float] = None
+
+    def lap(self, name: str) -> None:
+        """Charge the time since the previous phase ended to ``name``."""
+        now = time.perf_counter()
+        self.phases[name] = now - self._last
+        self._last = now
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self._last = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.lap(name)
+
+    def ready(self) -> None:
+        self.total = time.perf_counter() - self._started
+        logger.info(
+            "worker %d ready in %.0f ms (%s)",
+            os.getpid(),
+            self.total * 1000,
+            ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items()),
+        )
+
+    def gauges(self) -> Dict[str, float]:
+        gauges = {f"edge_startup_{name}_seconds": round(seconds, 6) for name, seconds in self.phases.items()}
+        if self.total is not None:
+            gauges["edge_startup_total_seconds"] = round(self.total, 6)
+        return gauges
+
+
+startup_timer = StartupTimer()
@@ -1,6 +1,34 @@
+# Models are imported on first attribute access (PEP 562) rather than with the
+# package: importing app.db.base or a repository only loads the models it
+# uses. Alembic needs every table on Base.metadata and calls import_models().
+import importlib
 
-# ví dụ trong app/db/__init__.py hoặc sau khi định nghĩa engine
 from app.db.base import Base  # noqa
-from app.db.models.transactions import Transaction 
-from app.db.models.outbox import OutboxEvent
-from app.db.models.line_items import LineItem
\ No newline at end of file
+
+_MODEL_MODULES = {
+    "Transaction": "app.db.models.transactions",
+    "OutboxEvent": "app.db.models.outbox",
+    "LineItem": "app.db.models.line_items",
+    "LocalCatalog": "app.db.models.local_catalog",
+    "SyncCursor": "app.db.models.sync_cursors",
+    "LocalInventory": "app.db.models.local_inventory",
+    "ReceiptCounter": "app.db.models.receipt_counters",
+    "SalesHourly": "app.db.models.sales_rollups",
+    "SalesHourlySku": "app.db.models.sales_rollups",
+    "Payment": "app.db.models.payments",
+    "IdempotencyKey": "app.db.models.idempotency_keys",
+    "LocalPromotion": "app.db.models.local_promotions",
+    "InventoryReservation": "app.db.models.inventory_reservations",
+}
+
+
+def __getattr__(name: str):
+    module = _MODEL_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
+
+
+def import_models() -> None:
+    for module in dict.fromkeys(_MODEL_MODULES.values()):
+        importlib.import_module(module)
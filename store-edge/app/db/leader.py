@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import os
+import zlib
+from typing import Awaitable, Callable, List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.sql import text
+
+logger = logging.getLogger(__name__)
+
+TRY_LOCK_SQL = text("SELECT pg_try_advisory_lock(CAST(:key AS bigint))")
+UNLOCK_SQL = text("SELECT pg_advisory_unlock(CAST(:key AS bigint))")
+CHECK_SQL = text("SELECT 1")
+
+
+def leader_lock_key(name: str) -> int:
+    """Stable advisory lock key for ``name``, the same in every worker."""
+    return zlib.crc32(name.encode())
+
+
+class LeaderElection:
+    """Runs the store's singleton background jobs in exactly one worker.
+
+    Every worker tries to take a session-level advisory lock; the one that
+    gets it keeps that connection checked out, starts ``jobs`` and pings the
+    connection every ``interval`` seconds, the others retry on the same
+    schedule. A lost connection means Postgres has already released the
+    lock, so the jobs are cancelled as soon as that is noticed and another
+    worker takes over within one interval. Leadership decides where jobs
+    are scheduled, it is not a fence: the jobs already tolerate a second
+    copy (SKIP LOCKED claims, status-guarded updates) for that window.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        key: int,
+        jobs: Sequence[Callable[[], Awaitable[None]]],
+        interval: float,
+    ):
+        self._engine = engine
+        self.key = key
+        self._jobs = list(jobs)
+        self.interval = interval
+        self._conn: Optional[AsyncConnection] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def is_leader(self) -> bool:
+        return self._conn is not None
+
+    async def run(self) -> None:
+        try:
+            while True:
+                try:
+                    if self._conn is None:
+                        await self._try_acquire()
+                    else:
+                        await self._check()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    logger.warning("background job leadership check failed, stepping down: %s", exc)
+                    await self._step_down()
+                await asyncio.sleep(self.interval)
+        finally:
+            await self._step_down()
+
+    async def _try_acquire(self) -> None:
+        conn = await self._engine.connect()
+        try:
+            acquired = (await conn.execute(TRY_LOCK_SQL, {"key": self.key})).scalar()
+            await conn.commit()
+        except BaseException:
+            await conn.close()
+            raise
+        if not acquired:
+            await conn.close()
+            return
+        self._conn = conn
+        self._tasks = [asyncio.create_task(job()) for job in self._jobs]
+        logger.info("worker %d took the background job lock, started %d jobs", os.getpid(), len(self._tasks))
+
+    async def _check(self) -> None:
+        await self._conn.execute(CHECK_SQL)
+        await self._conn.commit()
+        # the job loops handle their own errors; one that still died is restarted
+        for i, task in enumerate(self._tasks):
+            if task.done():
+                exc = None if task.cancelled() else task.exception()
+                logger.error("background job %s stopped (%r), restarting", self._jobs[i], exc)
+                self._tasks[i] = asyncio.create_task(self._jobs[i]())
+
+    async def _step_down(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        # jobs are stopped before the lock is released so two copies never overlap here
+        try:
+            await conn.execute(UNLOCK_SQL, {"key": self.key})
+            await conn.commit()
+            await conn.close()
+        except Exception:
+            # a pooled connection must not go back still holding the lock
+            await conn.invalidate()
+        logger.info("worker %d released the background job lock", os.getpid())
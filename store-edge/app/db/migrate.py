@@ -0,0 +1,66 @@
+# app/db/migrate.py
+"""Run ``alembic upgrade head`` only when the database is behind.
+
+    python -m app.db.migrate [--config alembic.ini]
+
+The Alembic CLI loads env.py, the app settings and every model before it
+can tell there is nothing to do, which is most restarts. This reads the
+heads from the migration scripts and alembic_version from the database
+(one short connection) and only hands over to Alembic when they differ.
+"""
+import argparse
+import sys
+import time
+from typing import Set
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, pool
+from sqlalchemy.sql import text
+
+from app.core.config import settings
+
+VERSION_TABLE_EXISTS_SQL = text("SELECT to_regclass('alembic_version') IS NOT NULL")
+CURRENT_VERSIONS_SQL = text("SELECT version_num FROM alembic_version")
+
+
+def current_revisions(url: str) -> Set[str]:
+    engine = create_engine(url, poolclass=pool.NullPool)
+    try:
+        with engine.connect() as conn:
+            if not conn.execute(VERSION_TABLE_EXISTS_SQL).scalar():
+                return set()
+            return set(conn.execute(CURRENT_VERSIONS_SQL).scalars())
+    finally:
+        engine.dispose()
+
+
+def upgrade_if_needed(config_path: str) -> bool:
+    """Returns whether Alembic had to run."""
+    config = Config(config_path)
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    if current_revisions(settings.DB_SYNC_URL) == heads:
+        return False
+    command.upgrade(config, "head")
+    return True
+
+
+def main(args: argparse.Namespace) -> None:
+    started = time.perf_counter()
+    upgraded = upgrade_if_needed(args.config)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if upgraded:
+        print(f"schema upgraded to head in {elapsed_ms:.0f} ms", file=sys.stderr)
+    else:
+        print(f"schema already at head, checked in {elapsed_ms:.0f} ms", file=sys.stderr)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--config", default="alembic.ini")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,31 @@
+# app/db/models/idempotency_keys.py
+from sqlalchemy import Column, DateTime, Index, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    """Response of a completed basket submission, keyed by the client's Idempotency-Key.
+
+    The row is written in the same database transaction as the basket
+    changes, so a retry either finds the stored response or (if the first
+    attempt rolled back) runs the submission again. ``request_hash`` covers
+    the target transaction and the request body, so a key reused for a
+    different request is rejected instead of replayed.
+    """
+
+    key = Column(String, primary_key=True)
+    transaction_id = Column(UUID(as_uuid=True), nullable=False)
+    request_hash = Column(String, nullable=False)
+    response = Column(JSONB, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # expiry sweep deletes by age
+        Index("ix_idempotency_keys_created_at", "created_at"),
+    )
@@ -0,0 +1,28 @@
+# app/db/models/inventory_reservations.py
+from sqlalchemy import Column, DateTime, Numeric, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class InventoryReservation(Base):
+    __tablename__ = "inventory_reservations"
+
+    """Soft stock reservation held by a DRAFT basket for one SKU.
+
+    ``quantity`` is the basket's current total for the SKU; the sum over a
+    (store, sku) is mirrored into ``local_inventory.reserved``. Rows go away
+    when the basket is finalized or voided, or when the sweeper releases
+    baskets that have been idle longer than the reservation TTL.
+    """
+
+    # no FK: transactions is partitioned and its key includes started_at
+    transaction_id = Column(UUID(as_uuid=True), primary_key=True)
+    sku = Column(String, primary_key=True)
+    store_id = Column(String, nullable=False)
+
+    quantity = Column(Numeric(18, 3), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Index, String, DateTime, Numeric, Integer, ForeignKey
+from sqlalchemy import Column, ForeignKeyConstraint, Index, String, DateTime, Numeric, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -17,7 +17,9 @@ class LineItem(Base):
     """
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    transaction_id = Column(UUID(as_uuid=True), ForeignKey("transactions.id"), nullable=False)
+    transaction_id = Column(UUID(as_uuid=True), nullable=False)
+    # the header's started_at: partition key, so a line shares its header's month
+    transaction_started_at = Column(DateTime(timezone=True), primary_key=True)
     line_number = Column(Integer, nullable=False)
 
     sku = Column(String, nullable=False, index=True)
@@ -28,6 +30,8 @@ class LineItem(Base):
     quantity = Column(Numeric(18, 3), nullable=False, default=1)
     discount_amount = Column(Numeric(18, 2), nullable=False, default=0)
     tax_amount = Column(Numeric(18, 2), nullable=False, default=0)
+    # percent, copied from the catalog when the line was priced
+    tax_rate = Column(Numeric(5, 2), nullable=True)
     line_total = Column(Numeric(18, 2), nullable=False)
 
     uom = Column(String, nullable=True)
@@ -36,5 +40,15 @@ class LineItem(Base):
     updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
 
     __table_args__ = (
-        Index("ix_line_items_transaction_line", "transaction_id", "line_number", unique=True),
+        ForeignKeyConstraint(
+            ["transaction_id", "transaction_started_at"],
+            ["transactions.id", "transactions.started_at"],
+            name="fk_line_items_transaction",
+        ),
+        Index(
+            "ix_line_items_transaction_line",
+            "transaction_id", "transaction_started_at", "line_number",
+            unique=True,
+        ),
+        {"postgresql_partition_by": "RANGE (transaction_started_at)"},
     )
\ No newline at end of file
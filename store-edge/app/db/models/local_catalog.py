@@ -17,7 +17,7 @@ class LocalCatalog(Base):
     at the edge node, independent of the upstream HQ representation.
     """
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     store_id = Column(String, nullable=False, index=True)
 
     sku = Column(String, nullable=False)
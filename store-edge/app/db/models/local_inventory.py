@@ -1,7 +1,7 @@
 from sqlalchemy import Column, Index, Numeric, String, DateTime, BigInteger, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
-from uuid import UUID, uuid4
+import uuid
 
 from app.db.base import Base
 
@@ -16,7 +16,7 @@ class LocalInventory(Base):
     inventory movements back to sales transactions and sync operations.
     """
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     store_id = Column(String, nullable=False)
     sku = Column(String, nullable=False)
 
@@ -30,4 +30,6 @@ class LocalInventory(Base):
     __table_args__ = (
         UniqueConstraint("store_id", "sku", name="uq_local_inventory_store_sku"),
         Index("ix_local_inventory_store_sku", "store_id", "sku"),
+        # availability cache refresh reads rows changed since its last pass
+        Index("ix_local_inventory_updated_at", "updated_at"),
     )
\ No newline at end of file
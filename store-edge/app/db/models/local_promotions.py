@@ -0,0 +1,49 @@
+# app/db/models/local_promotions.py
+from sqlalchemy import Boolean, Column, DateTime, Integer, Numeric, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+
+from app.db.base import Base
+
+
+class LocalPromotion(Base):
+    __tablename__ = "local_promotions"
+
+    """A promotion rule in effect at this store.
+
+    MULTI_BUY rules sell ``buy_quantity`` units of a SKU (or of every SKU in
+    ``category``) for ``bundle_price``. BASKET_THRESHOLD rules take
+    ``discount_amount`` or ``discount_percent`` off baskets whose subtotal
+    reaches ``min_subtotal``. Rules are compiled into in-memory lookup
+    tables (app.domain.pricing) rather than evaluated row by row.
+    """
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    store_id = Column(String, nullable=False, index=True)
+    code = Column(String, nullable=False)
+    kind = Column(String, nullable=False)
+
+    # MULTI_BUY
+    sku = Column(String, nullable=True)
+    category = Column(String, nullable=True)
+    buy_quantity = Column(Numeric(18, 3), nullable=True)
+    bundle_price = Column(Numeric(18, 2), nullable=True)
+
+    # BASKET_THRESHOLD
+    min_subtotal = Column(Numeric(18, 2), nullable=True)
+    discount_amount = Column(Numeric(18, 2), nullable=True)
+    discount_percent = Column(Numeric(5, 2), nullable=True)
+
+    starts_at = Column(DateTime(timezone=True), nullable=True)
+    ends_at = Column(DateTime(timezone=True), nullable=True)
+
+    active = Column(Boolean, nullable=False, default=True)
+    version = Column(Integer, nullable=False, default=1)
+
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("store_id", "code", name="uq_local_promotions_store_code"),
+    )
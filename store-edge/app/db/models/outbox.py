@@ -1,5 +1,5 @@
 # app/db/models/outbox.py
-from sqlalchemy import Column, Index, String, DateTime, BigInteger, Text
+from sqlalchemy import Column, Index, String, DateTime, BigInteger, Text, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 import uuid
@@ -18,7 +18,8 @@ class OutboxEvent(Base):
     """
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    event_id = Column(UUID(as_uuid=True), unique=True, nullable=False, default=uuid.uuid4, index=True)
+    # unique together with the partition key (ix_outbox_event_id); HQ dedups on event_id too
+    event_id = Column(UUID(as_uuid=True), nullable=False, default=uuid.uuid4)
     event_type = Column(String, nullable=False) # "SaleRecorded"
     aggregate_type = Column(String, nullable=False) # "Transaction"
     aggregate_id = Column(String, nullable=False)
@@ -28,13 +29,22 @@ class OutboxEvent(Base):
 
     payload = Column(JSONB, nullable=False)
 
-    occurred_at = Column(DateTime(timezone=True), nullable=False)
+    # partition key (monthly RANGE partitions), hence part of the primary key
+    occurred_at = Column(DateTime(timezone=True), primary_key=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     published_at = Column(DateTime(timezone=True), nullable=True)
     publish_attempts = Column(BigInteger, nullable=False, default=0)
     last_error = Column(Text, nullable=True)
+    # retry schedule; pushed back with exponential backoff when a publish fails
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
     __table_args__ = (
-        Index("ix_outbox_published_id", "published_at", "id"),
+        Index("ix_outbox_event_id", "event_id", "occurred_at", unique=True),
+        # queue index: only unpublished rows, ordered the way the relay claims them
+        Index(
+            "ix_outbox_pending", "next_attempt_at", "id",
+            postgresql_where=text("published_at IS NULL"),
+        ),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
     )
\ No newline at end of file
@@ -1,6 +1,6 @@
 
 import enum
-from sqlalchemy import Column, Enum, ForeignKey, Numeric, String, DateTime, BigInteger, Text
+from sqlalchemy import Column, Enum, Index, Numeric, String, DateTime, BigInteger, Text, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 import uuid
@@ -17,7 +17,7 @@ class PaymentStatus(str, enum.Enum):
 
 
 class Payment(Base):
-    __tablename__ = "paymemts"
+    __tablename__ = "payments"
 
     """Represents the payment attached to a transaction.
 
@@ -28,7 +28,8 @@ class Payment(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
-    transaction_id = Column(UUID(as_uuid=True), ForeignKey("transactions.id"), unique=True)
+    # no FK: transactions is partitioned and its key includes started_at
+    transaction_id = Column(UUID(as_uuid=True), nullable=False)
     provider = Column(Text)
     
     amount = Column(Numeric(18, 2), nullable=False)
@@ -37,6 +38,8 @@ class Payment(Base):
 
     provider_ref = Column(String, nullable=True, index=True)
     qr_payload = Column(JSONB, nullable=True)
+    # QR validity reported by the provider; the poller fails PENDING payments past it
+    expires_at = Column(DateTime(timezone=True), nullable=True)
 
     requested_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     authorized_at = Column(DateTime(timezone=True), nullable=True)
@@ -47,4 +50,21 @@ class Payment(Base):
     error_message = Column(Text, nullable=True)
 
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # a failed or cancelled attempt may be retried, but only one payment
+        # per transaction can be in progress or captured
+        Index(
+            "ux_payments_transaction_open", "transaction_id",
+            unique=True,
+            postgresql_where=text("status IN ('PENDING', 'AUTHORIZED', 'CAPTURED')"),
+        ),
+        # what the poller scans every tick
+        Index(
+            "ix_payments_active", "requested_at",
+            postgresql_where=text("status IN ('PENDING', 'AUTHORIZED')"),
+        ),
+        # every attempt of a transaction, for exports
+        Index("ix_payments_transaction_id", "transaction_id", "requested_at"),
+    )
@@ -0,0 +1,23 @@
+# app/db/models/receipt_counters.py
+from sqlalchemy import BigInteger, Column, DateTime, String
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ReceiptCounter(Base):
+    __tablename__ = "receipt_counters"
+
+    """Last receipt number handed out for a (store, terminal) pair.
+
+    Keeping one counter row per terminal means receipt allocation never
+    contends across terminals; the terminal id also prefixes the printed
+    receipt number, which keeps numbers unique per store.
+    """
+
+    store_id = Column(String, primary_key=True)
+    terminal_id = Column(String, primary_key=True)
+
+    last_number = Column(BigInteger, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,45 @@
+# app/db/models/sales_rollups.py
+from sqlalchemy import BigInteger, Column, DateTime, Numeric, String
+
+from app.db.base import Base
+
+
+class SalesHourly(Base):
+    __tablename__ = "sales_hourly"
+
+    """Completed-sale totals per store, terminal, cashier and UTC hour.
+
+    Maintained incrementally by finalize_transaction in the same DB
+    transaction as the sale, so reports never aggregate raw transactions.
+    cashier_id is '' for sales without a cashier.
+    """
+
+    store_id = Column(String, primary_key=True)
+    hour = Column(DateTime(timezone=True), primary_key=True)
+    terminal_id = Column(String, primary_key=True)
+    cashier_id = Column(String, primary_key=True)
+
+    txn_count = Column(BigInteger, nullable=False, default=0)
+    subtotal = Column(Numeric(18, 2), nullable=False, default=0)
+    tax_amount = Column(Numeric(18, 2), nullable=False, default=0)
+    total = Column(Numeric(18, 2), nullable=False, default=0)
+
+
+class SalesHourlySku(Base):
+    __tablename__ = "sales_hourly_sku"
+
+    """Completed-sale line totals per store, terminal, UTC hour and SKU.
+
+    txn_count is the number of sales containing the SKU, so it adds up
+    across hours and terminals but not across SKUs.
+    """
+
+    store_id = Column(String, primary_key=True)
+    hour = Column(DateTime(timezone=True), primary_key=True)
+    terminal_id = Column(String, primary_key=True)
+    sku = Column(String, primary_key=True)
+
+    quantity = Column(Numeric(18, 3), nullable=False, default=0)
+    revenue = Column(Numeric(18, 2), nullable=False, default=0)
+    tax_amount = Column(Numeric(18, 2), nullable=False, default=0)
+    txn_count = Column(BigInteger, nullable=False, default=0)
@@ -23,7 +23,8 @@ class SyncCursor(Base):
     last_outbox_id = Column(BigInteger, nullable=True)
     last_synced_at = Column(DateTime(timezone=True), nullable=True)
 
-    metadata = Column(JSONB, nullable=True)
+    # "metadata" is reserved on declarative classes, so the attribute is renamed
+    meta = Column("metadata", JSONB, nullable=True)
 
     created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
\ No newline at end of file
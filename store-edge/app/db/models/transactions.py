@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Index, String, DateTime, Numeric, Text, UniqueConstraint
+from sqlalchemy import Column, Index, Integer, String, DateTime, Numeric, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -29,7 +29,13 @@ class Transaction(Base):
     total = Column(Numeric(18, 2), nullable=False, default=0)
     currency = Column(String, nullable=False, default="VND")
 
-    started_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    # monotonic line_number allocator, bumped in the same statement that inserts the line
+    last_line_number = Column(Integer, nullable=False, default=0, server_default="0")
+    # number of live lines, maintained incrementally alongside the totals
+    line_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # partition key (monthly RANGE partitions), hence part of the primary key
+    started_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
     cancelled_at = Column(DateTime(timezone=True), nullable=True)
     client_created_at = Column(DateTime(timezone=True), nullable=True)
@@ -40,6 +46,9 @@ class Transaction(Base):
     updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
 
     __table_args__ = (
-        UniqueConstraint("store_id", "receipt_number", name="uq_transactions_store_receipt"),
+        # not unique: a unique key must include started_at, which would make it
+        # per-instant; receipt_counters alone hands out each number once per store
+        Index("ix_transactions_store_receipt", "store_id", "receipt_number"),
         Index("ix_transactions_store_terminal_started", "store_id", "terminal_id", "started_at"),
+        {"postgresql_partition_by": "RANGE (started_at)"},
     )
\ No newline at end of file
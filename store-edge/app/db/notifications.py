@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationHub:
+    """One LISTEN connection per worker, fanning notifications out to handlers.
+
+    Handlers get the payload and run on the event loop inside the driver's
+    callback, so they must only do in-memory work (update a cache, set an
+    Event). Nothing is delivered while the connection is down; the periodic
+    refresh behind every cache covers that gap, and ``run`` reconnects every
+    ``reconnect_interval`` seconds.
+    """
+
+    def __init__(self, engine: AsyncEngine, reconnect_interval: float):
+        self._engine = engine
+        self.reconnect_interval = reconnect_interval
+        self._handlers: Dict[str, List[Callable[[str], None]]] = defaultdict(list)
+        self._listen_conn = None
+
+    def subscribe(self, channel: str, handler: Callable[[str], None]) -> None:
+        """Register before ``listen``; channels added later wait for a reconnect."""
+        self._handlers[channel].append(handler)
+
+    def is_listening(self) -> bool:
+        if self._listen_conn is None:
+            return False
+        driver = self._listen_conn[1]
+        return not driver.is_closed()
+
+    async def listen(self) -> bool:
+        await self.close()
+        conn = None
+        try:
+            conn = await self._engine.connect()
+            raw = await conn.get_raw_connection()
+            driver = raw.driver_connection
+            for channel in self._handlers:
+                await driver.add_listener(channel, self._dispatch)
+        except Exception as exc:
+            logger.warning("LISTEN unavailable, caches fall back to periodic refresh: %s", exc)
+            if conn is not None:
+                await conn.invalidate()
+            return False
+        self._listen_conn = (conn, driver)
+        logger.info("listening on %s", ", ".join(self._handlers))
+        return True
+
+    async def run(self) -> None:
+        try:
+            while True:
+                if not self.is_listening():
+                    await self.listen()
+                await asyncio.sleep(self.reconnect_interval)
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self._listen_conn is None:
+            return
+        conn, driver = self._listen_conn
+        self._listen_conn = None
+        try:
+            if not driver.is_closed():
+                for channel in self._handlers:
+                    await driver.remove_listener(channel, self._dispatch)
+            await conn.close()
+        except Exception:
+            logger.debug("error closing LISTEN connection", exc_info=True)
+
+    def _dispatch(self, connection, pid, channel, payload) -> None:
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("handler for %s notification failed", channel)
@@ -0,0 +1,191 @@
+# app/db/partitions.py
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlalchemy.sql import text
+
+logger = logging.getLogger(__name__)
+
+# monthly RANGE-partitioned tables and their partition key (see migrations
+# f4c82a1d6b37 and e8b3d6f1a924); lines share their transaction's month
+PARTITIONED_TABLES: Dict[str, str] = {
+    "transactions": "started_at",
+    "line_items": "transaction_started_at",
+    "outbox": "occurred_at",
+}
+# a detached partition keeps the FKs it inherited; archived lines must not
+# pin the transactions partition that is archived right after them
+ARCHIVE_DROP_CONSTRAINTS: Dict[str, List[str]] = {
+    "line_items": ["fk_line_items_transaction"],
+}
+# detached transaction/line_item partitions are moved here for export, not dropped
+ARCHIVE_SCHEMA = "archive"
+
+PARTITION_NAME_RE = re.compile(r"^(?P<table>\w+)_p(?P<year>\d{4})_(?P<month>\d{2})$")
+
+LIST_PARTITIONS_SQL = text("""
+    SELECT c.relname
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = CAST(CAST(:parent AS text) AS regclass)
+""")
+
+# keeps DETACH from queueing checkout writes behind it for long
+LOCK_TIMEOUT_SQL = text("SET LOCAL lock_timeout = '2s'")
+
+
+def month_start(d: date) -> date:
+    return d.replace(day=1)
+
+
+def add_months(d: date, months: int) -> date:
+    index = d.year * 12 + (d.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def _bound(month: date) -> str:
+    # month boundaries are UTC so they don't shift with the session TimeZone
+    return f"{month.isoformat()} 00:00:00+00"
+
+
+async def list_month_partitions(conn: AsyncConnection, table: str) -> List[date]:
+    """Months that currently have an attached partition, oldest first."""
+    rows = await conn.execute(LIST_PARTITIONS_SQL, {"parent": table})
+    months = []
+    for (relname,) in rows:
+        match = PARTITION_NAME_RE.match(relname)
+        if match and match["table"] == table:
+            months.append(date(int(match["year"]), int(match["month"]), 1))
+    return sorted(months)
+
+
+async def create_month_partition(conn: AsyncConnection, table: str, month: date) -> None:
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(f"{table} is not a partitioned table")
+    await conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+        f"PARTITION OF {table} "
+        f"FOR VALUES FROM ('{_bound(month)}') TO ('{_bound(add_months(month, 1))}')"
+    ))
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    table: str,
+    today: date,
+    months_ahead: int,
+) -> List[str]:
+    """Create partitions for the current month and ``months_ahead`` after it.
+
+    Creating them ahead of time keeps rows out of the default partition,
+    which would otherwise block creating the matching month later.
+    """
+    existing = set(await list_month_partitions(conn, table))
+    created = []
+    current = month_start(today)
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if month not in existing:
+            await create_month_partition(conn, table, month)
+            created.append(partition_name(table, month))
+    return created
+
+
+async def archive_partitions(conn: AsyncConnection, table: str, cutoff: date) -> List[str]:
+    """Detach partitions that end on or before ``cutoff`` into the archive schema."""
+    archived = []
+    for month in await list_month_partitions(conn, table):
+        if add_months(month, 1) > cutoff:
+            break
+        name = partition_name(table, month)
+        await conn.execute(LOCK_TIMEOUT_SQL)
+        await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        for constraint in ARCHIVE_DROP_CONSTRAINTS.get(table, []):
+            await conn.execute(text(f"ALTER TABLE {name} DROP CONSTRAINT IF EXISTS {constraint}"))
+        await conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+        archived.append(name)
+    return archived
+
+
+async def drop_published_outbox_partitions(conn: AsyncConnection, cutoff: date) -> List[str]:
+    """Drop outbox partitions that end on or before ``cutoff`` once fully published.
+
+    A partition still holding unpublished events (HQ unreachable for weeks)
+    is kept, and so is everything after it, until the relay catches up.
+    """
+    dropped = []
+    for month in await list_month_partitions(conn, "outbox"):
+        if add_months(month, 1) > cutoff:
+            break
+        name = partition_name("outbox", month)
+        pending = await conn.scalar(
+            text(f"SELECT EXISTS (SELECT 1 FROM {name} WHERE published_at IS NULL)")
+        )
+        if pending:
+            logger.warning("outbox partition %s still has unpublished events, keeping it", name)
+            break
+        await conn.execute(LOCK_TIMEOUT_SQL)
+        await conn.execute(text(f"ALTER TABLE outbox DETACH PARTITION {name}"))
+        await conn.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
+
+
+async def run_partition_maintenance(
+    engine: AsyncEngine,
+    months_ahead: int,
+    retention_months: int,
+    outbox_retention_months: int,
+    today: Optional[date] = None,
+) -> Dict[str, List[str]]:
+    """One maintenance pass; each step commits on its own so a lock timeout
+    on one table does not undo the others."""
+    today = today or datetime.now(timezone.utc).date()
+    current = month_start(today)
+    report: Dict[str, List[str]] = {"created": [], "archived": [], "dropped": []}
+
+    for table in PARTITIONED_TABLES:
+        async with engine.begin() as conn:
+            report["created"] += await ensure_partitions(conn, table, today, months_ahead)
+
+    retention_cutoff = add_months(current, -retention_months)
+    for table in ("line_items", "transactions"):
+        async with engine.begin() as conn:
+            report["archived"] += await archive_partitions(conn, table, retention_cutoff)
+
+    async with engine.begin() as conn:
+        report["dropped"] += await drop_published_outbox_partitions(
+            conn, add_months(current, -outbox_retention_months)
+        )
+
+    if any(report.values()):
+        logger.info("partition maintenance: %s", report)
+    return report
+
+
+async def run_partition_maintainer(
+    engine: AsyncEngine,
+    interval: float,
+    months_ahead: int,
+    retention_months: int,
+    outbox_retention_months: int,
+) -> None:
+    """Background loop; runs a pass at startup and then every ``interval`` seconds."""
+    while True:
+        try:
+            await run_partition_maintenance(
+                engine, months_ahead, retention_months, outbox_retention_months
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("partition maintenance failed")
+        await asyncio.sleep(interval)
@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func, select
+
+from app.db.models.local_catalog import LocalCatalog
+
+async def get_catalog_version_stamp(
+    db: AsyncSession,
+) -> Tuple[int, int, Optional[datetime]]:
+    # (max version, row count, max updated_at): an edit that doesn't raise
+    # the max version, e.g. a direct price fix, still moves updated_at via
+    # the local_catalog_touch_updated_at trigger
+    result = await db.execute(
+        select(
+            func.coalesce(func.max(LocalCatalog.version), 0),
+            func.count(LocalCatalog.id),
+            func.max(LocalCatalog.updated_at),
+        )
+    )
+    max_version, row_count, last_updated = result.one()
+    return int(max_version), int(row_count), last_updated
+
+async def list_active_catalog_items(
+    db: AsyncSession,
+) -> List[LocalCatalog]:
+    result = await db.execute(
+        select(LocalCatalog).where(LocalCatalog.active.is_(True))
+    )
+    return result.scalars().all()
+
+async def get_active_catalog_item(
+    db: AsyncSession,
+    store_id: str,
+    barcode: Optional[str] = None,
+    sku: Optional[str] = None,
+) -> Optional[LocalCatalog]:
+    stmt = select(LocalCatalog).where(
+        LocalCatalog.store_id == store_id,
+        LocalCatalog.active.is_(True),
+    )
+    if barcode is not None:
+        stmt = stmt.where(LocalCatalog.barcode == barcode)
+    else:
+        stmt = stmt.where(LocalCatalog.sku == sku)
+    result = await db.execute(stmt.limit(1))
+    return result.scalar_one_or_none()
@@ -0,0 +1,133 @@
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
+from uuid import UUID
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+# Keyset page over transactions in (started_at, id) order; started_at is the
+# partition key, so a date range only touches the months it covers.
+PAGE_WHERE = """
+    t.store_id = :store_id
+    AND t.started_at >= :start AND t.started_at < :end
+    AND (t.started_at, t.id) > (CAST(:after_started_at AS timestamptz), CAST(:after_id AS uuid))
+    AND (CAST(:status AS varchar) IS NULL OR t.status = :status)
+"""
+
+# One row per transaction with its lines and payments nested, rendered to
+# JSON text by Postgres. Lines are partitioned on transaction_started_at, so
+# the line_items lookup goes to the transaction's own month only.
+TRANSACTIONS_NDJSON_SQL = text(f"""
+    SELECT t.started_at, t.id,
+        CAST(jsonb_build_object(
+            'transaction_id', t.id,
+            'store_id', t.store_id,
+            'terminal_id', t.terminal_id,
+            'cashier_id', t.cashier_id,
+            'receipt_number', t.receipt_number,
+            'status', t.status,
+            'currency', t.currency,
+            'subtotal', t.subtotal,
+            'tax_amount', t.tax_amount,
+            'total_amount', t.total,
+            'line_count', t.line_count,
+            'started_at', t.started_at,
+            'completed_at', t.completed_at,
+            'cancelled_at', t.cancelled_at,
+            'line_items', COALESCE(li.items, CAST('[]' AS jsonb)),
+            'payments', COALESCE(p.items, CAST('[]' AS jsonb))
+        ) AS text) AS doc
+    FROM transactions t
+    LEFT JOIN LATERAL (
+        SELECT jsonb_agg(jsonb_build_object(
+            'line_number', li.line_number,
+            'sku_id', li.sku,
+            'barcode', li.barcode,
+            'product_name', li.name,
+            'quantity', li.quantity,
+            'unit_price', li.unit_price,
+            'discount_amount', li.discount_amount,
+            'tax_rate', li.tax_rate,
+            'tax_amount', li.tax_amount,
+            'line_total', li.line_total
+        ) ORDER BY li.line_number) AS items
+        FROM line_items li
+        WHERE li.transaction_id = t.id AND li.transaction_started_at = t.started_at
+    ) li ON true
+    LEFT JOIN LATERAL (
+        SELECT jsonb_agg(jsonb_build_object(
+            'payment_id', p.id,
+            'provider', p.provider,
+            'provider_ref', p.provider_ref,
+            'amount', p.amount,
+            'currency', p.currency,
+            'status', p.status,
+            'requested_at', p.requested_at,
+            'captured_at', p.captured_at,
+            'failed_at', p.failed_at,
+            'error_code', p.error_code
+        ) ORDER BY p.requested_at) AS items
+        FROM payments p
+        WHERE p.transaction_id = t.id
+    ) p ON true
+    WHERE {PAGE_WHERE}
+    ORDER BY t.started_at, t.id
+    LIMIT :limit
+""")
+
+# Flat form for spreadsheets: one row per line item (one row with empty line
+# columns for an empty basket), each carrying its header and the
+# transaction's deciding payment (captured, else the latest attempt).
+LINE_ROWS_SQL = text(f"""
+    WITH page AS (
+        SELECT t.*
+        FROM transactions t
+        WHERE {PAGE_WHERE}
+        ORDER BY t.started_at, t.id
+        LIMIT :limit
+    )
+    SELECT t.started_at, t.id, t.store_id, t.terminal_id, t.cashier_id, t.receipt_number,
+           t.status, t.currency, t.subtotal, t.tax_amount AS transaction_tax_amount,
+           t.total, t.completed_at,
+           pay.provider AS payment_provider, pay.status AS payment_status,
+           pay.amount AS payment_amount,
+           li.line_number, li.sku, li.barcode, li.name, li.quantity, li.unit_price,
+           li.discount_amount, li.tax_rate, li.tax_amount, li.line_total
+    FROM page t
+    LEFT JOIN LATERAL (
+        SELECT p.provider, p.status, p.amount
+        FROM payments p
+        WHERE p.transaction_id = t.id
+        ORDER BY p.status = 'CAPTURED' DESC, p.requested_at DESC
+        LIMIT 1
+    ) pay ON true
+    LEFT JOIN line_items li ON li.transaction_id = t.id AND li.transaction_started_at = t.started_at
+    ORDER BY t.started_at, t.id, li.line_number
+""")
+
+
+async def stream_export_page(
+    db: AsyncSession,
+    stmt,
+    store_id: str,
+    start: datetime,
+    end: datetime,
+    after_started_at: datetime,
+    after_id: UUID,
+    limit: int,
+    fetch_size: int,
+    status: Optional[str] = None,
+) -> AsyncIterator[List[Row]]:
+    """Rows of one keyset page, fetched through a server-side cursor
+    ``fetch_size`` rows at a time. Needs an open transaction on ``db``."""
+    result = await db.stream(
+        stmt,
+        {
+            "store_id": store_id, "start": start, "end": end,
+            "after_started_at": after_started_at, "after_id": after_id,
+            "status": status, "limit": limit,
+        },
+        execution_options={"yield_per": fetch_size},
+    )
+    async for rows in result.partitions():
+        yield rows
@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import delete, select
+
+from app.db.models.idempotency_keys import IdempotencyKey
+
+
+async def get_idempotency_key(
+    db: AsyncSession,
+    key: str,
+) -> Optional[IdempotencyKey]:
+    result = await db.execute(
+        select(IdempotencyKey)
+        .where(IdempotencyKey.key == key)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+async def save_idempotency_key(
+    db: AsyncSession,
+    key: str,
+    transaction_id: UUID,
+    request_hash: str,
+    response: Any,
+) -> bool:
+    """Record the response in the caller's transaction.
+
+    Returns False when another request committed the same key first; the
+    insert waits on that request's row lock, so it never sees it half done.
+    """
+    result = await db.execute(
+        pg_insert(IdempotencyKey)
+        .values(
+            key=key,
+            transaction_id=transaction_id,
+            request_hash=request_hash,
+            response=response,
+        )
+        .on_conflict_do_nothing(index_elements=[IdempotencyKey.key])
+        .returning(IdempotencyKey.key)
+    )
+    return result.scalar_one_or_none() is not None
+
+async def delete_idempotency_keys_before(
+    db: AsyncSession,
+    cutoff: datetime,
+) -> int:
+    result = await db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.created_at < cutoff)
+    )
+    return result.rowcount
@@ -0,0 +1,242 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+# Every statement that changes local_inventory returns the row in this shape
+# so the availability cache can be written through. updated_at is taken
+# with clock_timestamp() after the row lock, so it orders writes to a row.
+INVENTORY_RETURNING = "inv.store_id, inv.sku, inv.on_hand, inv.reserved, inv.updated_at"
+
+# Finalize: the basket's reservations are released and its lines taken off
+# on_hand in one statement over one lock set, the union of reserved and
+# sold SKUs, locked in sku order. Two statements (release, then decrement)
+# would lock different sets whenever the sweeper left a basket reserving
+# only some of its SKUs, and two tills could then deadlock. SKUs without an
+# inventory row are skipped.
+SETTLE_STOCK_FOR_TRANSACTION_SQL = text(f"""
+    WITH released AS (
+        DELETE FROM inventory_reservations r
+        WHERE r.transaction_id = :transaction_id
+        RETURNING r.store_id, r.sku, r.quantity
+    ), unreserved AS (
+        SELECT sku, SUM(quantity) AS qty
+        FROM released
+        WHERE store_id = :store_id
+        GROUP BY sku
+    ), sold AS (
+        SELECT sku, SUM(quantity) AS qty
+        FROM line_items
+        WHERE transaction_id = :transaction_id
+          AND transaction_started_at = CAST(:started_at AS timestamptz)
+        GROUP BY sku
+    ), changes AS (
+        SELECT COALESCE(u.sku, s.sku) AS sku,
+               COALESCE(u.qty, 0) AS unreserved,
+               COALESCE(s.qty, 0) AS sold
+        FROM unreserved u
+        FULL JOIN sold s ON s.sku = u.sku
+    ), locked AS (
+        SELECT inv.id, changes.unreserved, changes.sold
+        FROM local_inventory inv
+        JOIN changes ON changes.sku = inv.sku
+        WHERE inv.store_id = :store_id
+        ORDER BY inv.sku
+        FOR UPDATE OF inv
+    )
+    UPDATE local_inventory inv
+    SET reserved = GREATEST(inv.reserved - locked.unreserved, 0),
+        on_hand = inv.on_hand - locked.sold,
+        updated_at = clock_timestamp(),
+        last_txn_at = CASE WHEN locked.sold <> 0 THEN now() ELSE inv.last_txn_at END
+    FROM locked
+    WHERE inv.id = locked.id
+    RETURNING {INVENTORY_RETURNING}
+""")
+
+# Sets the basket's reservation for each of :skus to its current line
+# quantity and moves local_inventory.reserved by the difference. Absolute
+# rather than incremental, so a basket resumed after the sweeper released
+# it reserves again on its next change instead of going negative.
+SYNC_RESERVATIONS_SQL = text(f"""
+    WITH wanted AS (
+        SELECT s.sku, COALESCE(SUM(li.quantity), 0) AS qty
+        FROM unnest(CAST(:skus AS varchar[])) AS s(sku)
+        LEFT JOIN line_items li
+            ON li.transaction_id = :transaction_id
+           AND li.transaction_started_at = CAST(:started_at AS timestamptz)
+           AND li.sku = s.sku
+        GROUP BY s.sku
+    ), old AS (
+        SELECT r.sku, r.quantity
+        FROM inventory_reservations r
+        WHERE r.transaction_id = :transaction_id AND r.sku = ANY(CAST(:skus AS varchar[]))
+        FOR UPDATE
+    ), upserted AS (
+        INSERT INTO inventory_reservations (transaction_id, store_id, sku, quantity)
+        SELECT CAST(:transaction_id AS uuid), CAST(:store_id AS varchar), w.sku, w.qty
+        FROM wanted w
+        WHERE w.qty > 0
+        ON CONFLICT (transaction_id, sku) DO UPDATE
+        SET quantity = EXCLUDED.quantity,
+            updated_at = now()
+    ), dropped AS (
+        DELETE FROM inventory_reservations r
+        USING wanted w
+        WHERE r.transaction_id = :transaction_id AND r.sku = w.sku AND w.qty = 0
+    ), delta AS (
+        SELECT w.sku, w.qty - COALESCE(o.quantity, 0) AS qty
+        FROM wanted w
+        LEFT JOIN old o ON o.sku = w.sku
+        WHERE w.qty <> COALESCE(o.quantity, 0)
+    ), locked AS (
+        SELECT inv.id, delta.qty
+        FROM local_inventory inv
+        JOIN delta ON delta.sku = inv.sku
+        WHERE inv.store_id = :store_id
+        ORDER BY inv.sku
+        FOR UPDATE OF inv
+    )
+    UPDATE local_inventory inv
+    SET reserved = GREATEST(inv.reserved + locked.qty, 0),
+        updated_at = clock_timestamp()
+    FROM locked
+    WHERE inv.id = locked.id
+    RETURNING {INVENTORY_RETURNING}
+""")
+
+# Shared tail for giving reservations back: the DELETE in the "released" CTE
+# picks which ones, the rest subtracts them per SKU in lock order.
+RELEASE_RESERVATIONS_TEMPLATE = """
+    WITH released AS (
+        {delete}
+        RETURNING r.store_id, r.sku, r.quantity
+    ), per_sku AS (
+        SELECT store_id, sku, SUM(quantity) AS qty
+        FROM released
+        GROUP BY store_id, sku
+    ), locked AS (
+        SELECT inv.id, per_sku.qty
+        FROM local_inventory inv
+        JOIN per_sku ON per_sku.store_id = inv.store_id AND per_sku.sku = inv.sku
+        ORDER BY inv.store_id, inv.sku
+        FOR UPDATE OF inv
+    )
+    UPDATE local_inventory inv
+    SET reserved = GREATEST(inv.reserved - locked.qty, 0),
+        updated_at = clock_timestamp()
+    FROM locked
+    WHERE inv.id = locked.id
+    RETURNING {returning}
+"""
+
+RELEASE_TRANSACTION_RESERVATIONS_SQL = text(RELEASE_RESERVATIONS_TEMPLATE.format(
+    delete="DELETE FROM inventory_reservations r WHERE r.transaction_id = :transaction_id",
+    returning=INVENTORY_RETURNING,
+))
+
+# Sweeper: one statement releases every reservation whose basket is no
+# longer a DRAFT touched within the TTL (abandoned, or finished without
+# releasing). The reservation's own updated_at is checked first so busy
+# baskets never reach the transactions lookup.
+RELEASE_ABANDONED_RESERVATIONS_SQL = text(RELEASE_RESERVATIONS_TEMPLATE.format(
+    delete="""DELETE FROM inventory_reservations r
+        WHERE r.updated_at < now() - make_interval(secs => CAST(:ttl AS float8))
+          AND NOT EXISTS (
+              SELECT 1 FROM transactions t
+              WHERE t.id = r.transaction_id
+                AND t.status = 'DRAFT'
+                AND t.updated_at >= now() - make_interval(secs => CAST(:ttl AS float8))
+          )""",
+    returning=INVENTORY_RETURNING,
+))
+
+ADJUST_STOCK_SQL = text(f"""
+    INSERT INTO local_inventory AS inv (id, store_id, sku, on_hand, reserved, updated_at)
+    VALUES (gen_random_uuid(), CAST(:store_id AS varchar), CAST(:sku AS varchar),
+            CAST(:quantity_delta AS numeric), 0, clock_timestamp())
+    ON CONFLICT (store_id, sku) DO UPDATE
+    SET on_hand = inv.on_hand + EXCLUDED.on_hand,
+        updated_at = clock_timestamp()
+    RETURNING {INVENTORY_RETURNING}
+""")
+
+# the lookback overlap catches rows stamped before, but committed after,
+# the previous pass; re-applying a row is harmless
+LIST_INVENTORY_CHANGED_SQL = text(f"""
+    SELECT {INVENTORY_RETURNING}
+    FROM local_inventory inv
+    WHERE CAST(:since AS timestamptz) IS NULL
+       OR inv.updated_at > CAST(:since AS timestamptz) - make_interval(secs => CAST(:lookback AS float8))
+""")
+
+async def settle_stock_for_transaction(
+    db: AsyncSession,
+    store_id: str,
+    transaction_id: UUID,
+    started_at: datetime,
+) -> List[Row]:
+    """Release the basket's reservations and decrement its sold stock."""
+    result = await db.execute(
+        SETTLE_STOCK_FOR_TRANSACTION_SQL,
+        {"store_id": store_id, "transaction_id": transaction_id, "started_at": started_at},
+    )
+    return result.all()
+
+async def sync_reservations(
+    db: AsyncSession,
+    store_id: str,
+    transaction_id: UUID,
+    started_at: datetime,
+    skus: List[str],
+) -> List[Row]:
+    result = await db.execute(SYNC_RESERVATIONS_SQL, {
+        "store_id": store_id,
+        "transaction_id": transaction_id,
+        "started_at": started_at,
+        "skus": sorted(set(skus)),
+    })
+    return result.all()
+
+async def release_transaction_reservations(
+    db: AsyncSession,
+    transaction_id: UUID,
+) -> List[Row]:
+    result = await db.execute(
+        RELEASE_TRANSACTION_RESERVATIONS_SQL,
+        {"transaction_id": transaction_id},
+    )
+    return result.all()
+
+async def release_abandoned_reservations(
+    db: AsyncSession,
+    ttl_seconds: float,
+) -> List[Row]:
+    result = await db.execute(RELEASE_ABANDONED_RESERVATIONS_SQL, {"ttl": ttl_seconds})
+    return result.all()
+
+async def adjust_stock(
+    db: AsyncSession,
+    store_id: str,
+    sku: str,
+    quantity_delta: Decimal,
+) -> Row:
+    result = await db.execute(
+        ADJUST_STOCK_SQL,
+        {"store_id": store_id, "sku": sku, "quantity_delta": quantity_delta},
+    )
+    return result.one()
+
+async def list_inventory_changed_since(
+    db: AsyncSession,
+    since: Optional[datetime],
+    lookback_seconds: float,
+) -> List[Row]:
+    result = await db.execute(
+        LIST_INVENTORY_CHANGED_SQL,
+        {"since": since, "lookback": lookback_seconds},
+    )
+    return result.all()
@@ -0,0 +1,193 @@
+
+from datetime import datetime
+from typing import List, Optional, Sequence
+from uuid import UUID, uuid4
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+# The event payload is assembled server-side from the header and its lines,
+# so recording the sale costs one statement and no line fetch.
+INSERT_SALE_RECORDED_SQL = text("""
+    INSERT INTO outbox (
+        event_id, event_type, aggregate_type, aggregate_id, store_id,
+        payload, occurred_at, publish_attempts
+    )
+    SELECT CAST(:event_id AS uuid), 'SaleRecorded', 'Transaction', CAST(t.id AS text), t.store_id,
+        jsonb_build_object(
+            'transaction_id', t.id,
+            'terminal_id', t.terminal_id,
+            'cashier_id', t.cashier_id,
+            'receipt_number', t.receipt_number,
+            'currency', t.currency,
+            'subtotal', t.subtotal,
+            'tax_amount', t.tax_amount,
+            'total_amount', t.total,
+            'completed_at', t.completed_at,
+            'line_items', COALESCE((
+                SELECT jsonb_agg(jsonb_build_object(
+                    'line_number', li.line_number,
+                    'sku_id', li.sku,
+                    'barcode', li.barcode,
+                    'product_name', li.name,
+                    'quantity', li.quantity,
+                    'unit_price', li.unit_price,
+                    'discount_amount', li.discount_amount,
+                    'tax_amount', li.tax_amount,
+                    'line_total', li.line_total
+                ) ORDER BY li.line_number)
+                FROM line_items li
+                WHERE li.transaction_id = t.id AND li.transaction_started_at = t.started_at
+            ), CAST('[]' AS jsonb))
+        ),
+        COALESCE(t.completed_at, now()),
+        0
+    FROM transactions t
+    WHERE t.id = :transaction_id AND t.started_at = CAST(:started_at AS timestamptz)
+""")
+
+async def insert_sale_recorded(
+    db: AsyncSession,
+    transaction_id: UUID,
+    started_at: datetime,
+) -> UUID:
+    event_id = uuid4()
+    await db.execute(
+        INSERT_SALE_RECORDED_SQL,
+        {"event_id": event_id, "transaction_id": transaction_id, "started_at": started_at},
+    )
+    return event_id
+
+
+INSERT_INVENTORY_ADJUSTED_SQL = text("""
+    INSERT INTO outbox (
+        event_id, event_type, aggregate_type, aggregate_id, store_id,
+        payload, occurred_at, publish_attempts
+    )
+    VALUES (
+        CAST(:event_id AS uuid), 'InventoryAdjusted', 'Inventory', CAST(:sku AS varchar),
+        CAST(:store_id AS varchar),
+        jsonb_build_object(
+            'sku_id', CAST(:sku AS varchar),
+            'adjustment_type', CAST(:adjustment_type AS varchar),
+            'quantity_delta', CAST(:quantity_delta AS numeric),
+            'reason', CAST(:reason AS varchar),
+            'reference_id', CAST(:reference_id AS varchar)
+        ),
+        now(),
+        0
+    )
+""")
+
+# Queue access path: everything below only touches unpublished rows through
+# the partial index ix_outbox_pending (next_attempt_at, id) WHERE published_at
+# IS NULL, so its cost follows the backlog, not the size of the table.
+# Ordering by next_attempt_at first lets backed-off events be skipped by the
+# index range instead of being read and filtered.
+# Claiming leases the rows instead of holding their locks: next_attempt_at is
+# pushed past the lease so other relays skip them, and the claim commits at
+# once. A relay that dies mid-publish leaves them due again when it expires.
+CLAIM_OUTBOX_SQL = text("""
+    WITH due AS (
+        SELECT id, occurred_at
+        FROM outbox
+        WHERE published_at IS NULL
+          AND next_attempt_at <= now()
+        ORDER BY next_attempt_at, id
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE outbox o
+    SET next_attempt_at = now() + make_interval(secs => CAST(:lease AS float8))
+    FROM due
+    WHERE o.id = due.id
+      AND o.occurred_at = due.occurred_at
+    RETURNING o.id, o.event_id, o.event_type, o.aggregate_type, o.aggregate_id,
+              o.store_id, o.payload, o.occurred_at, o.publish_attempts
+""").columns(payload=JSONB)
+
+ACK_OUTBOX_SQL = text("""
+    UPDATE outbox
+    SET published_at = now(),
+        publish_attempts = publish_attempts + 1,
+        last_error = NULL
+    WHERE id = ANY(:ids)
+      AND published_at IS NULL
+""")
+
+# exponential per-event backoff: base * 2^attempts, capped at max_delay seconds
+NACK_OUTBOX_SQL = text("""
+    UPDATE outbox
+    SET publish_attempts = publish_attempts + 1,
+        last_error = :error,
+        next_attempt_at = now() + make_interval(
+            secs => LEAST(CAST(:max_delay AS float8),
+                          CAST(:base_delay AS float8) * power(2, LEAST(publish_attempts, 30)))
+        )
+    WHERE id = ANY(:ids)
+      AND published_at IS NULL
+""")
+
+NEXT_OUTBOX_ATTEMPT_SQL = text("""
+    SELECT min(next_attempt_at)
+    FROM outbox
+    WHERE published_at IS NULL
+""")
+
+
+async def insert_inventory_adjusted(
+    db: AsyncSession,
+    store_id: str,
+    sku: str,
+    adjustment_type: str,
+    quantity_delta,
+    reason: Optional[str] = None,
+    reference_id: Optional[str] = None,
+) -> UUID:
+    event_id = uuid4()
+    await db.execute(INSERT_INVENTORY_ADJUSTED_SQL, {
+        "event_id": event_id,
+        "store_id": store_id,
+        "sku": sku,
+        "adjustment_type": adjustment_type,
+        "quantity_delta": quantity_delta,
+        "reason": reason,
+        "reference_id": reference_id,
+    })
+    return event_id
+
+
+async def claim_outbox_batch(db: AsyncSession, limit: int, lease: float) -> List[Row]:
+    """Lease up to ``limit`` due events for ``lease`` seconds, in id order.
+
+    The lease takes effect when the caller's transaction commits; ack or
+    nack the events from a later transaction.
+    """
+    rows = (await db.execute(CLAIM_OUTBOX_SQL, {"limit": limit, "lease": lease})).all()
+    return sorted(rows, key=lambda row: row.id)
+
+
+async def ack_outbox_events(db: AsyncSession, ids: Sequence[int]) -> None:
+    await db.execute(ACK_OUTBOX_SQL, {"ids": list(ids)})
+
+
+async def nack_outbox_events(
+    db: AsyncSession,
+    ids: Sequence[int],
+    error: str,
+    base_delay: float,
+    max_delay: float,
+) -> None:
+    """Record a failed attempt and push the events' next attempt back."""
+    await db.execute(NACK_OUTBOX_SQL, {
+        "ids": list(ids),
+        "error": error[:1000],
+        "base_delay": base_delay,
+        "max_delay": max_delay,
+    })
+
+
+async def next_outbox_attempt_at(db: AsyncSession) -> Optional[datetime]:
+    """Earliest scheduled attempt among unpublished events, None when drained."""
+    return await db.scalar(NEXT_OUTBOX_ATTEMPT_SQL)
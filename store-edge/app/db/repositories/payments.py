@@ -0,0 +1,167 @@
+from decimal import Decimal
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+from uuid import UUID
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import select, text, update
+
+from app.db.models.payments import Payment, PaymentStatus
+
+ACTIVE_STATUSES = (PaymentStatus.PENDING, PaymentStatus.AUTHORIZED)
+# at most one per transaction (ux_payments_transaction_open); its amount was
+# taken from the basket totals, so the basket is frozen while one exists
+OPEN_STATUSES = ACTIVE_STATUSES + (PaymentStatus.CAPTURED,)
+
+
+class PaymentStatusUpdate(NamedTuple):
+    payment_id: UUID
+    status: PaymentStatus
+    error_code: Optional[str] = None
+    error_message: Optional[str] = None
+
+
+# Bulk state transition for everything one poller tick learned. Only legal
+# moves are applied (PENDING -> anything, AUTHORIZED -> CAPTURED/FAILED), so
+# a late provider answer can't resurrect a cancelled or captured payment.
+APPLY_STATUS_UPDATES_SQL = text("""
+    UPDATE payments p
+    SET status = u.status,
+        authorized_at = CASE WHEN u.status IN ('AUTHORIZED', 'CAPTURED')
+                             THEN COALESCE(p.authorized_at, now()) ELSE p.authorized_at END,
+        captured_at = CASE WHEN u.status = 'CAPTURED' THEN now() ELSE p.captured_at END,
+        failed_at = CASE WHEN u.status = 'FAILED' THEN now() ELSE p.failed_at END,
+        error_code = u.error_code,
+        error_message = u.error_message,
+        updated_at = now()
+    FROM unnest(
+        CAST(:ids AS uuid[]),
+        CAST(:statuses AS payment_status_enum[]),
+        CAST(:error_codes AS text[]),
+        CAST(:error_messages AS text[])
+    ) AS u(id, status, error_code, error_message)
+    WHERE p.id = u.id
+      AND p.status <> u.status
+      AND (p.status = 'PENDING'
+           OR (p.status = 'AUTHORIZED' AND u.status IN ('CAPTURED', 'FAILED')))
+    RETURNING p.id, p.status
+""")
+
+async def get_payment(
+    db: AsyncSession,
+    payment_id: UUID,
+) -> Optional[Payment]:
+    # populate_existing: status is also changed by text() bulk updates the
+    # identity map doesn't see
+    result = await db.execute(
+        select(Payment)
+        .where(Payment.id == payment_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+async def insert_open_payment(
+    db: AsyncSession,
+    transaction_id: UUID,
+    provider: str,
+    amount: Decimal,
+    currency: str,
+) -> Optional[Payment]:
+    """Insert a PENDING payment; None if the transaction already has an open one."""
+    stmt = (
+        pg_insert(Payment)
+        .values(
+            transaction_id=transaction_id,
+            provider=provider,
+            amount=amount,
+            currency=currency,
+            status=PaymentStatus.PENDING,
+        )
+        .on_conflict_do_nothing(
+            index_elements=[Payment.transaction_id],
+            # must match the ux_payments_transaction_open predicate
+            index_where=text("status IN ('PENDING', 'AUTHORIZED', 'CAPTURED')"),
+        )
+        .returning(Payment)
+    )
+    result = await db.scalars(stmt)
+    return result.one_or_none()
+
+async def set_provider_details(
+    db: AsyncSession,
+    payment_id: UUID,
+    provider_ref: str,
+    qr_payload: Dict[str, Any],
+    expires_at: Optional[datetime],
+) -> Optional[Payment]:
+    result = await db.scalars(
+        update(Payment)
+        .where(Payment.id == payment_id, Payment.status == PaymentStatus.PENDING)
+        .values(provider_ref=provider_ref, qr_payload=qr_payload, expires_at=expires_at)
+        .returning(Payment)
+    )
+    return result.one_or_none()
+
+async def list_active_payments(
+    db: AsyncSession,
+    limit: int,
+) -> List[Row]:
+    result = await db.execute(
+        select(
+            Payment.id,
+            Payment.provider,
+            Payment.provider_ref,
+            Payment.status,
+            Payment.expires_at,
+        )
+        .where(Payment.status.in_(ACTIVE_STATUSES))
+        .order_by(Payment.requested_at)
+        .limit(limit)
+    )
+    return result.all()
+
+async def cancel_pending_payments(
+    db: AsyncSession,
+    transaction_id: UUID,
+    reason: str,
+) -> List[Row]:
+    """PENDING -> CANCELLED for a transaction's payments; the row locks keep
+    the poller from authorizing them until the caller commits."""
+    result = await db.execute(
+        update(Payment)
+        .where(Payment.transaction_id == transaction_id, Payment.status == PaymentStatus.PENDING)
+        .values(status=PaymentStatus.CANCELLED, error_code="CANCELLED", error_message=reason)
+        .returning(Payment.id, Payment.provider, Payment.provider_ref)
+    )
+    return result.all()
+
+async def get_open_payment(
+    db: AsyncSession,
+    transaction_id: UUID,
+) -> Optional[Row]:
+    """(status, amount) of the transaction's PENDING/AUTHORIZED/CAPTURED payment, if any."""
+    result = await db.execute(
+        select(Payment.status, Payment.amount)
+        .where(
+            Payment.transaction_id == transaction_id,
+            Payment.status.in_(OPEN_STATUSES),
+        )
+        .limit(1)
+    )
+    return result.one_or_none()
+
+async def apply_status_updates(
+    db: AsyncSession,
+    updates: Sequence[PaymentStatusUpdate],
+) -> List[Row]:
+    """Apply legal transitions in one statement; returns (id, status) of changed rows."""
+    if not updates:
+        return []
+    result = await db.execute(APPLY_STATUS_UPDATES_SQL, {
+        "ids": [u.payment_id for u in updates],
+        "statuses": [u.status.value for u in updates],
+        "error_codes": [u.error_code for u in updates],
+        "error_messages": [u.error_message for u in updates],
+    })
+    return result.all()
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func, select
+
+from app.db.models.local_promotions import LocalPromotion
+
+async def get_promotion_version_stamp(
+    db: AsyncSession,
+) -> Tuple[int, int, Optional[datetime]]:
+    # the catalog's (max version, row count) plus max(updated_at): the
+    # bump-version trigger moves both on any edit or deactivation, and a new
+    # row with version 1 still moves updated_at
+    result = await db.execute(
+        select(
+            func.coalesce(func.max(LocalPromotion.version), 0),
+            func.count(LocalPromotion.id),
+            func.max(LocalPromotion.updated_at),
+        )
+    )
+    max_version, row_count, last_updated = result.one()
+    return int(max_version), int(row_count), last_updated
+
+async def list_active_promotions(
+    db: AsyncSession,
+) -> List[LocalPromotion]:
+    result = await db.execute(
+        select(LocalPromotion).where(LocalPromotion.active.is_(True))
+    )
+    return result.scalars().all()
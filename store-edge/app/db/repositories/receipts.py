@@ -0,0 +1,54 @@
+
+from sqlalchemy import String
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import cast, func, select
+
+from app.db.models.receipt_counters import ReceiptCounter
+
+RECEIPT_NUMBER_DIGITS = 8
+
+def format_receipt_number(terminal_id: str, number: int) -> str:
+    return f"{terminal_id}-{number:0{RECEIPT_NUMBER_DIGITS}d}"
+
+def bump_counter_stmt(store_id: str, terminal_id: str, count: int):
+    """Upsert that advances the terminal's counter by ``count`` and returns the new value."""
+    stmt = pg_insert(ReceiptCounter).values(
+        store_id=store_id,
+        terminal_id=terminal_id,
+        last_number=count,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[ReceiptCounter.store_id, ReceiptCounter.terminal_id],
+        set_={
+            "last_number": ReceiptCounter.last_number + count,
+            "updated_at": func.now(),
+        },
+    ).returning(ReceiptCounter.last_number)
+
+def next_receipt_number_expr(store_id: str, terminal_id: str):
+    """Scalar subquery over a counter-bump CTE, for use inside the transaction INSERT.
+
+    Returns (cte, expression); attach the CTE to the outer statement with add_cte().
+    """
+    counter = bump_counter_stmt(store_id, terminal_id, 1).cte("receipt_counter")
+    number = cast(counter.c.last_number, String)
+    # lpad truncates to its length; widen it like format_receipt_number does
+    expr = select(
+        func.concat(
+            terminal_id,
+            "-",
+            func.lpad(number, func.greatest(RECEIPT_NUMBER_DIGITS, func.length(number)), "0"),
+        )
+    ).scalar_subquery()
+    return counter, expr
+
+async def reserve_receipt_block(
+    db: AsyncSession,
+    store_id: str,
+    terminal_id: str,
+    block_size: int,
+) -> int:
+    """Reserve ``block_size`` numbers; returns the last number of the block."""
+    result = await db.execute(bump_counter_stmt(store_id, terminal_id, block_size))
+    return result.scalar_one()
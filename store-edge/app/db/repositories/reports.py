@@ -0,0 +1,217 @@
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+# rollup buckets are UTC hours regardless of the session TimeZone
+HOUR_BUCKET = "date_trunc('hour', {} AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'"
+
+# Adds one completed sale to both rollups. Header figures come from the
+# finalize UPDATE ... RETURNING; only the lines are read, grouped per SKU
+# and upserted in sku order so concurrent sales lock rollup rows in the
+# same order.
+APPLY_SALE_SQL = text(f"""
+    WITH header AS (
+        INSERT INTO sales_hourly (
+            store_id, hour, terminal_id, cashier_id,
+            txn_count, subtotal, tax_amount, total
+        )
+        VALUES (
+            CAST(:store_id AS varchar),
+            {HOUR_BUCKET.format("CAST(:completed_at AS timestamptz)")},
+            CAST(:terminal_id AS varchar), CAST(:cashier_id AS varchar),
+            1, CAST(:subtotal AS numeric), CAST(:tax_amount AS numeric), CAST(:total AS numeric)
+        )
+        ON CONFLICT (store_id, hour, terminal_id, cashier_id) DO UPDATE
+        SET txn_count = sales_hourly.txn_count + 1,
+            subtotal = sales_hourly.subtotal + EXCLUDED.subtotal,
+            tax_amount = sales_hourly.tax_amount + EXCLUDED.tax_amount,
+            total = sales_hourly.total + EXCLUDED.total
+    )
+    INSERT INTO sales_hourly_sku (
+        store_id, hour, terminal_id, sku,
+        quantity, revenue, tax_amount, txn_count
+    )
+    SELECT CAST(:store_id AS varchar),
+           {HOUR_BUCKET.format("CAST(:completed_at AS timestamptz)")},
+           CAST(:terminal_id AS varchar), li.sku,
+           sum(li.quantity), sum(li.line_total), sum(li.tax_amount), 1
+    FROM line_items li
+    WHERE li.transaction_id = :transaction_id
+      AND li.transaction_started_at = CAST(:started_at AS timestamptz)
+    GROUP BY li.sku
+    ORDER BY li.sku
+    ON CONFLICT (store_id, hour, terminal_id, sku) DO UPDATE
+    SET quantity = sales_hourly_sku.quantity + EXCLUDED.quantity,
+        revenue = sales_hourly_sku.revenue + EXCLUDED.revenue,
+        tax_amount = sales_hourly_sku.tax_amount + EXCLUDED.tax_amount,
+        txn_count = sales_hourly_sku.txn_count + 1
+""")
+
+# Rebuild: EXCLUSIVE locks make live finalizes wait for the rebuild to
+# commit, so a sale is counted either by the rebuild or by its own upsert.
+LOCK_ROLLUPS_SQL = text("LOCK TABLE sales_hourly, sales_hourly_sku IN EXCLUSIVE MODE")
+
+DELETE_HOURLY_RANGE_SQL = text("""
+    DELETE FROM sales_hourly
+    WHERE store_id = :store_id AND hour >= :start AND hour < :end
+""")
+
+DELETE_HOURLY_SKU_RANGE_SQL = text("""
+    DELETE FROM sales_hourly_sku
+    WHERE store_id = :store_id AND hour >= :start AND hour < :end
+""")
+
+# the started_at bounds only let the planner skip later partitions
+REBUILD_HOURLY_SQL = text(f"""
+    INSERT INTO sales_hourly (
+        store_id, hour, terminal_id, cashier_id,
+        txn_count, subtotal, tax_amount, total
+    )
+    SELECT t.store_id, {HOUR_BUCKET.format("t.completed_at")} AS hour,
+           t.terminal_id, COALESCE(t.cashier_id, ''),
+           count(*), sum(t.subtotal), sum(t.tax_amount), sum(t.total)
+    FROM transactions t
+    WHERE t.store_id = :store_id
+      AND t.status = 'PAID'
+      AND t.completed_at >= :start AND t.completed_at < :end
+      AND t.started_at < :end
+    GROUP BY 1, 2, 3, 4
+""")
+
+REBUILD_HOURLY_SKU_SQL = text(f"""
+    INSERT INTO sales_hourly_sku (
+        store_id, hour, terminal_id, sku,
+        quantity, revenue, tax_amount, txn_count
+    )
+    SELECT t.store_id, {HOUR_BUCKET.format("t.completed_at")} AS hour,
+           t.terminal_id, li.sku,
+           sum(li.quantity), sum(li.line_total), sum(li.tax_amount),
+           count(DISTINCT t.id)
+    FROM transactions t
+    JOIN line_items li ON li.transaction_id = t.id AND li.transaction_started_at = t.started_at
+    WHERE t.store_id = :store_id
+      AND t.status = 'PAID'
+      AND t.completed_at >= :start AND t.completed_at < :end
+      AND t.started_at < :end
+      AND li.transaction_started_at < :end
+    GROUP BY 1, 2, 3, 4
+""")
+
+SALES_BY_HOUR_SQL = text("""
+    SELECT hour,
+           sum(txn_count) AS txn_count,
+           sum(subtotal) AS subtotal,
+           sum(tax_amount) AS tax_amount,
+           sum(total) AS total
+    FROM sales_hourly
+    WHERE store_id = :store_id
+      AND hour >= :start AND hour < :end
+      AND (CAST(:terminal_id AS varchar) IS NULL OR terminal_id = :terminal_id)
+    GROUP BY hour
+    ORDER BY hour
+""")
+
+TOP_SKUS_SQL = text("""
+    SELECT sku,
+           sum(quantity) AS quantity,
+           sum(revenue) AS revenue,
+           sum(tax_amount) AS tax_amount,
+           sum(txn_count) AS txn_count
+    FROM sales_hourly_sku
+    WHERE store_id = :store_id
+      AND hour >= :start AND hour < :end
+      AND (CAST(:terminal_id AS varchar) IS NULL OR terminal_id = :terminal_id)
+    GROUP BY sku
+    ORDER BY revenue DESC, sku
+    LIMIT :limit
+""")
+
+CASHIER_TOTALS_SQL = text("""
+    SELECT cashier_id,
+           sum(txn_count) AS txn_count,
+           sum(subtotal) AS subtotal,
+           sum(tax_amount) AS tax_amount,
+           sum(total) AS total
+    FROM sales_hourly
+    WHERE store_id = :store_id
+      AND hour >= :start AND hour < :end
+      AND (CAST(:terminal_id AS varchar) IS NULL OR terminal_id = :terminal_id)
+    GROUP BY cashier_id
+    ORDER BY total DESC, cashier_id
+""")
+
+
+async def apply_sale_to_rollups(db: AsyncSession, txn) -> None:
+    """Add a just-finalized transaction (the RETURNING row) to the rollups."""
+    await db.execute(APPLY_SALE_SQL, {
+        "transaction_id": txn.id,
+        "started_at": txn.started_at,
+        "store_id": txn.store_id,
+        "terminal_id": txn.terminal_id,
+        "cashier_id": txn.cashier_id or "",
+        "completed_at": txn.completed_at,
+        "subtotal": txn.subtotal,
+        "tax_amount": txn.tax_amount,
+        "total": txn.total,
+    })
+
+
+async def rebuild_rollups(
+    db: AsyncSession,
+    store_id: str,
+    start: datetime,
+    end: datetime,
+) -> None:
+    """Recompute both rollups for [start, end) from transactions/line_items.
+
+    Runs in the caller's transaction; the caller commits.
+    """
+    params = {"store_id": store_id, "start": start, "end": end}
+    await db.execute(LOCK_ROLLUPS_SQL)
+    await db.execute(DELETE_HOURLY_RANGE_SQL, params)
+    await db.execute(DELETE_HOURLY_SKU_RANGE_SQL, params)
+    await db.execute(REBUILD_HOURLY_SQL, params)
+    await db.execute(REBUILD_HOURLY_SKU_SQL, params)
+
+
+async def sales_by_hour(
+    db: AsyncSession,
+    store_id: str,
+    start: datetime,
+    end: datetime,
+    terminal_id: Optional[str] = None,
+) -> List[Row]:
+    result = await db.execute(SALES_BY_HOUR_SQL, {
+        "store_id": store_id, "start": start, "end": end, "terminal_id": terminal_id,
+    })
+    return result.all()
+
+
+async def top_skus(
+    db: AsyncSession,
+    store_id: str,
+    start: datetime,
+    end: datetime,
+    limit: int,
+    terminal_id: Optional[str] = None,
+) -> List[Row]:
+    result = await db.execute(TOP_SKUS_SQL, {
+        "store_id": store_id, "start": start, "end": end,
+        "terminal_id": terminal_id, "limit": limit,
+    })
+    return result.all()
+
+
+async def cashier_totals(
+    db: AsyncSession,
+    store_id: str,
+    start: datetime,
+    end: datetime,
+    terminal_id: Optional[str] = None,
+) -> List[Row]:
+    result = await db.execute(CASHIER_TOTALS_SQL, {
+        "store_id": store_id, "start": start, "end": end, "terminal_id": terminal_id,
+    })
+    return result.all()
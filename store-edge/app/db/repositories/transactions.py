@@ -1,28 +1,442 @@
 
-from typing import List
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import select
+from sqlalchemy.sql import func, select, text
 
 from app.db.models.transactions import Transaction
 from app.db.models.line_items import LineItem
 
+# Lines are partitioned on their header's started_at (transaction_started_at),
+# so every line lookup below matches it too: the header row supplies it in
+# the single-statement edits, callers that hold the header pass :started_at.
+LINE_ITEM_RETURNING = """
+    id, transaction_id, line_number, sku, barcode, name,
+    unit_price, quantity, discount_amount, tax_amount, line_total, uom,
+    transaction_started_at
+"""
+
+# A basket with an open or captured payment (OPEN_STATUSES, one per
+# transaction) is frozen: that payment's amount was taken from its total.
+# Every edit below matches nothing while one exists.
+NO_OPEN_PAYMENT = """
+    NOT EXISTS (
+        SELECT 1 FROM payments p
+        WHERE p.transaction_id = :transaction_id
+          AND p.status IN ('PENDING', 'AUTHORIZED', 'CAPTURED')
+    )
+"""
+
+# Validates DRAFT status, allocates line_number, bumps header totals and
+# inserts the line in a single statement. Returns no row when the
+# transaction is missing or no longer DRAFT.
+ADD_LINE_ITEM_SQL = text(f"""
+    WITH txn AS (
+        UPDATE transactions
+        SET last_line_number = last_line_number + 1,
+            subtotal = subtotal + :line_total,
+            tax_amount = tax_amount + :tax_amount,
+            total = total + :line_total + :tax_amount,
+            line_count = line_count + 1,
+            updated_at = now()
+        WHERE id = :transaction_id AND status = 'DRAFT' AND {NO_OPEN_PAYMENT}
+        RETURNING id, last_line_number, started_at
+    )
+    INSERT INTO line_items (
+        id, transaction_id, transaction_started_at, line_number, sku, barcode, name,
+        unit_price, quantity, discount_amount, tax_amount, tax_rate, line_total, uom
+    )
+    SELECT CAST(:id AS uuid), txn.id, txn.started_at, txn.last_line_number,
+           CAST(:sku AS varchar), CAST(:barcode AS varchar), CAST(:name AS varchar),
+           CAST(:unit_price AS numeric), CAST(:quantity AS numeric),
+           CAST(:discount_amount AS numeric), CAST(:tax_amount AS numeric),
+           CAST(:tax_rate AS numeric), CAST(:line_total AS numeric), CAST(:uom AS varchar)
+    FROM txn
+    RETURNING {LINE_ITEM_RETURNING}
+""")
+
+# Running totals are adjusted by the line's delta; the DRAFT header row is
+# locked first so concurrent edits of the same basket serialize on it.
+REMOVE_LINE_ITEM_SQL = text(f"""
+    WITH txn AS (
+        SELECT id, started_at FROM transactions
+        WHERE id = :transaction_id AND status = 'DRAFT' AND {NO_OPEN_PAYMENT}
+        FOR UPDATE
+    ), removed AS (
+        DELETE FROM line_items li
+        USING txn
+        WHERE li.transaction_id = txn.id
+          AND li.transaction_started_at = txn.started_at
+          AND li.id = :line_item_id
+        RETURNING li.sku, li.line_total, li.tax_amount, li.transaction_started_at
+    )
+    UPDATE transactions t
+    SET subtotal = t.subtotal - removed.line_total,
+        tax_amount = t.tax_amount - removed.tax_amount,
+        total = t.total - removed.line_total - removed.tax_amount,
+        line_count = t.line_count - 1,
+        updated_at = now()
+    FROM removed
+    WHERE t.id = :transaction_id AND t.started_at = removed.transaction_started_at
+    RETURNING t.id, t.subtotal, t.tax_amount, t.total, t.line_count, removed.sku, t.started_at
+""")
+
+# Tax follows the line's catalog tax_rate; lines priced before tax_rate was
+# stored keep scaling their tax with the quantity.
+UPDATE_LINE_QUANTITY_SQL = text(f"""
+    WITH txn AS (
+        SELECT id, started_at FROM transactions
+        WHERE id = :transaction_id AND status = 'DRAFT' AND {NO_OPEN_PAYMENT}
+        FOR UPDATE
+    ), old AS (
+        SELECT li.id, li.transaction_started_at, li.quantity, li.line_total, li.tax_amount
+        FROM line_items li
+        JOIN txn ON li.transaction_id = txn.id AND li.transaction_started_at = txn.started_at
+        WHERE li.id = :line_item_id
+    ), changed AS (
+        UPDATE line_items li
+        SET quantity = CAST(:quantity AS numeric),
+            line_total = li.unit_price * CAST(:quantity AS numeric) - li.discount_amount,
+            tax_amount = CASE
+                WHEN li.tax_rate IS NOT NULL
+                    THEN ROUND((li.unit_price * CAST(:quantity AS numeric) - li.discount_amount) * li.tax_rate / 100, 2)
+                WHEN old.quantity = 0 THEN 0
+                ELSE ROUND(old.tax_amount * CAST(:quantity AS numeric) / old.quantity, 2)
+            END,
+            updated_at = now()
+        FROM old
+        WHERE li.id = old.id AND li.transaction_started_at = old.transaction_started_at
+        RETURNING li.id, li.transaction_id, li.line_number, li.sku, li.barcode, li.name,
+            li.unit_price, li.quantity, li.discount_amount, li.tax_amount, li.line_total, li.uom,
+            li.transaction_started_at,
+            li.line_total - old.line_total AS delta_total,
+            li.tax_amount - old.tax_amount AS delta_tax
+    ), hdr AS (
+        UPDATE transactions t
+        SET subtotal = t.subtotal + changed.delta_total,
+            tax_amount = t.tax_amount + changed.delta_tax,
+            total = t.total + changed.delta_total + changed.delta_tax,
+            updated_at = now()
+        FROM changed
+        WHERE t.id = :transaction_id AND t.started_at = changed.transaction_started_at
+    )
+    SELECT {LINE_ITEM_RETURNING} FROM changed
+""")
+
+# Basket submission: the header row is locked once, then removes, quantity
+# changes and adds each run as one set-based statement, and the totals are
+# recomputed from the lines at the end.
+LOCK_DRAFT_TRANSACTION_SQL = text(f"""
+    SELECT id, last_line_number, started_at FROM transactions
+    WHERE id = :transaction_id AND status = 'DRAFT' AND {NO_OPEN_PAYMENT}
+    FOR UPDATE
+""")
+
+REMOVE_LINE_ITEMS_SQL = text("""
+    DELETE FROM line_items
+    WHERE transaction_id = :transaction_id
+      AND transaction_started_at = CAST(:started_at AS timestamptz)
+      AND id = ANY(CAST(:ids AS uuid[]))
+    RETURNING sku
+""")
+
+# tax scales with quantity the same way as UPDATE_LINE_QUANTITY_SQL
+SET_LINE_QUANTITIES_SQL = text("""
+    UPDATE line_items li
+    SET quantity = v.quantity,
+        line_total = li.unit_price * v.quantity - li.discount_amount,
+        tax_amount = CASE
+            WHEN li.tax_rate IS NOT NULL
+                THEN ROUND((li.unit_price * v.quantity - li.discount_amount) * li.tax_rate / 100, 2)
+            WHEN li.quantity = 0 THEN 0
+            ELSE ROUND(li.tax_amount * v.quantity / li.quantity, 2)
+        END,
+        updated_at = now()
+    FROM unnest(CAST(:ids AS uuid[]), CAST(:quantities AS numeric[])) AS v(id, quantity)
+    WHERE li.transaction_id = :transaction_id
+      AND li.transaction_started_at = CAST(:started_at AS timestamptz)
+      AND li.id = v.id
+    RETURNING li.sku
+""")
+
+# line numbers continue from the locked header's last_line_number in array order
+ADD_LINE_ITEMS_SQL = text("""
+    INSERT INTO line_items (
+        id, transaction_id, transaction_started_at, line_number, sku, barcode, name,
+        unit_price, quantity, discount_amount, tax_amount, tax_rate, line_total, uom
+    )
+    SELECT v.id, CAST(:transaction_id AS uuid), CAST(:started_at AS timestamptz),
+           CAST(:last_line_number AS integer) + v.ord,
+           v.sku, v.barcode, v.name,
+           v.unit_price, v.quantity, v.discount_amount, v.tax_amount, v.tax_rate, v.line_total, v.uom
+    FROM unnest(
+        CAST(:ids AS uuid[]), CAST(:skus AS varchar[]), CAST(:barcodes AS varchar[]),
+        CAST(:names AS varchar[]), CAST(:unit_prices AS numeric[]), CAST(:quantities AS numeric[]),
+        CAST(:discount_amounts AS numeric[]), CAST(:tax_amounts AS numeric[]),
+        CAST(:tax_rates AS numeric[]), CAST(:line_totals AS numeric[]), CAST(:uoms AS varchar[])
+    ) WITH ORDINALITY AS v(
+        id, sku, barcode, name, unit_price, quantity,
+        discount_amount, tax_amount, tax_rate, line_total, uom, ord
+    )
+""")
+
+RECOMPUTE_TOTALS_SQL = text("""
+    UPDATE transactions t
+    SET subtotal = agg.subtotal,
+        tax_amount = agg.tax_amount,
+        total = agg.subtotal + agg.tax_amount,
+        line_count = agg.line_count,
+        last_line_number = t.last_line_number + CAST(:added AS integer),
+        updated_at = now()
+    FROM (
+        SELECT COALESCE(sum(line_total), 0) AS subtotal,
+               COALESCE(sum(tax_amount), 0) AS tax_amount,
+               count(*) AS line_count
+        FROM line_items
+        WHERE transaction_id = :transaction_id
+          AND transaction_started_at = CAST(:started_at AS timestamptz)
+    ) AS agg
+    WHERE t.id = :transaction_id AND t.started_at = CAST(:started_at AS timestamptz)
+    RETURNING t.id, t.status, t.subtotal, t.tax_amount, t.total, t.line_count
+""")
+
+BASKET_LINES_SQL = text(f"""
+    SELECT {LINE_ITEM_RETURNING}
+    FROM line_items
+    WHERE transaction_id = :transaction_id
+      AND transaction_started_at = CAST(:started_at AS timestamptz)
+    ORDER BY line_number
+""")
+
+# Promotion evaluation input: everything pricing needs for the basket in one read
+PRICING_LINES_SQL = text("""
+    SELECT id, sku, quantity, unit_price, tax_rate, discount_amount, tax_amount, line_total
+    FROM line_items
+    WHERE transaction_id = :transaction_id
+      AND transaction_started_at = CAST(:started_at AS timestamptz)
+    ORDER BY line_number
+""")
+
+# A discount left by a promotion that has since ended or been removed must
+# still be repriced away, even when no live rule matches the basket
+HAS_DISCOUNTED_LINES_SQL = text("""
+    SELECT EXISTS (
+        SELECT 1 FROM line_items
+        WHERE transaction_id = :transaction_id
+          AND transaction_started_at = CAST(:started_at AS timestamptz)
+          AND discount_amount <> 0
+    )
+""")
+
+APPLY_LINE_PRICING_SQL = text("""
+    UPDATE line_items li
+    SET discount_amount = v.discount_amount,
+        tax_amount = v.tax_amount,
+        line_total = v.line_total,
+        updated_at = now()
+    FROM unnest(
+        CAST(:ids AS uuid[]), CAST(:discount_amounts AS numeric[]),
+        CAST(:tax_amounts AS numeric[]), CAST(:line_totals AS numeric[])
+    ) AS v(id, discount_amount, tax_amount, line_total)
+    WHERE li.transaction_id = :transaction_id
+      AND li.transaction_started_at = CAST(:started_at AS timestamptz)
+      AND li.id = v.id
+    RETURNING li.id, li.transaction_id, li.line_number, li.sku, li.barcode, li.name,
+        li.unit_price, li.quantity, li.discount_amount, li.tax_amount, li.line_total, li.uom,
+        li.transaction_started_at
+""")
+
 async def get_transaction_by_id(
     db: AsyncSession,
-    transaction_id: UUID
+    transaction_id: UUID,
+    for_update: bool = False,
 ) -> Transaction:
-    result = await db.execute(
-        select(Transaction).where(Transaction.id == transaction_id)
-    )
+    stmt = select(Transaction).where(Transaction.id == transaction_id)
+    if for_update:
+        stmt = stmt.with_for_update()
+    result = await db.execute(stmt)
     txn = result.scalar_one_or_none()
     return txn
 
 async def get_line_items_for_transaction(
     db: AsyncSession,
-    transaction_id: UUID
+    transaction_id: UUID,
+    started_at: datetime,
 ) -> List[LineItem]:
     result = await db.execute(
-        select(LineItem).where(LineItem.transaction_id == transaction_id)
+        select(LineItem).where(
+            LineItem.transaction_id == transaction_id,
+            LineItem.transaction_started_at == started_at,
+        )
+    )
+    line_items = result.scalars().all()
+    return line_items
+
+async def aggregate_line_items(
+    db: AsyncSession,
+    transaction_id: UUID,
+    started_at: datetime,
+) -> Row:
+    result = await db.execute(
+        select(
+            func.coalesce(func.sum(LineItem.line_total), 0).label("subtotal"),
+            func.coalesce(func.sum(LineItem.tax_amount), 0).label("tax_amount"),
+            func.count(LineItem.id).label("line_count"),
+        ).where(
+            LineItem.transaction_id == transaction_id,
+            LineItem.transaction_started_at == started_at,
+        )
+    )
+    return result.one()
+
+async def insert_line_item_returning(
+    db: AsyncSession,
+    params: dict,
+) -> Optional[Row]:
+    result = await db.execute(ADD_LINE_ITEM_SQL, params)
+    return result.one_or_none()
+
+async def delete_line_item_returning_totals(
+    db: AsyncSession,
+    transaction_id: UUID,
+    line_item_id: UUID,
+) -> Optional[Row]:
+    result = await db.execute(
+        REMOVE_LINE_ITEM_SQL,
+        {"transaction_id": transaction_id, "line_item_id": line_item_id},
+    )
+    return result.one_or_none()
+
+async def update_line_quantity_returning(
+    db: AsyncSession,
+    transaction_id: UUID,
+    line_item_id: UUID,
+    quantity,
+) -> Optional[Row]:
+    result = await db.execute(
+        UPDATE_LINE_QUANTITY_SQL,
+        {"transaction_id": transaction_id, "line_item_id": line_item_id, "quantity": quantity},
     )
-    line_items = result.scalars.all()
-    return line_items
\ No newline at end of file
+    return result.one_or_none()
+
+async def lock_draft_transaction(
+    db: AsyncSession,
+    transaction_id: UUID,
+) -> Optional[Row]:
+    result = await db.execute(LOCK_DRAFT_TRANSACTION_SQL, {"transaction_id": transaction_id})
+    return result.one_or_none()
+
+async def remove_line_items(
+    db: AsyncSession,
+    transaction_id: UUID,
+    started_at: datetime,
+    line_item_ids: List[UUID],
+) -> List[str]:
+    """Returns the SKUs of the removed lines."""
+    result = await db.execute(
+        REMOVE_LINE_ITEMS_SQL,
+        {"transaction_id": transaction_id, "started_at": started_at, "ids": line_item_ids},
+    )
+    return list(result.scalars())
+
+async def set_line_quantities(
+    db: AsyncSession,
+    transaction_id: UUID,
+    started_at: datetime,
+    quantities: Dict[UUID, Decimal],
+) -> List[str]:
+    """Returns the SKUs of the updated lines."""
+    result = await db.execute(SET_LINE_QUANTITIES_SQL, {
+        "transaction_id": transaction_id,
+        "started_at": started_at,
+        "ids": list(quantities),
+        "quantities": list(quantities.values()),
+    })
+    return list(result.scalars())
+
+async def add_line_items(
+    db: AsyncSession,
+    transaction_id: UUID,
+    started_at: datetime,
+    last_line_number: int,
+    lines: List[dict],
+) -> None:
+    """Multi-row insert of ``lines`` (LineItem column dicts) numbered after ``last_line_number``."""
+    await db.execute(ADD_LINE_ITEMS_SQL, {
+        "transaction_id": transaction_id,
+        "started_at": started_at,
+        "last_line_number": last_line_number,
+        "ids": [line["id"] for line in lines],
+        "skus": [line["sku"] for line in lines],
+        "barcodes": [line["barcode"] for line in lines],
+        "names": [line["name"] for line in lines],
+        "unit_prices": [line["unit_price"] for line in lines],
+        "quantities": [line["quantity"] for line in lines],
+        "discount_amounts": [line["discount_amount"] for line in lines],
+        "tax_amounts": [line["tax_amount"] for line in lines],
+        "tax_rates": [line["tax_rate"] for line in lines],
+        "line_totals": [line["line_total"] for line in lines],
+        "uoms": [line["uom"] for line in lines],
+    })
+
+async def recompute_totals_returning(
+    db: AsyncSession,
+    transaction_id: UUID,
+    started_at: datetime,
+    added: int,
+) -> Row:
+    result = await db.execute(
+        RECOMPUTE_TOTALS_SQL,
+        {"transaction_id": transaction_id, "started_at": started_at, "added": added},
+    )
+    return result.one()
+
+async def get_basket_lines(
+    db: AsyncSession,
+    transaction_id: UUID,
+    started_at: datetime,
+) -> List[Row]:
+    result = await db.execute(
+        BASKET_LINES_SQL, {"transaction_id": transaction_id, "started_at": started_at}
+    )
+    return result.all()
+
+async def get_pricing_lines(
+    db: AsyncSession,
+    transaction_id: UUID,
+    started_at: datetime,
+) -> List[Row]:
+    result = await db.execute(
+        PRICING_LINES_SQL, {"transaction_id": transaction_id, "started_at": started_at}
+    )
+    return result.all()
+
+async def has_discounted_lines(
+    db: AsyncSession,
+    transaction_id: UUID,
+    started_at: datetime,
+) -> bool:
+    result = await db.execute(
+        HAS_DISCOUNTED_LINES_SQL, {"transaction_id": transaction_id, "started_at": started_at}
+    )
+    return result.scalar_one()
+
+async def apply_line_pricing(
+    db: AsyncSession,
+    transaction_id: UUID,
+    started_at: datetime,
+    priced: List[Tuple[UUID, Any]],
+) -> List[Row]:
+    """Bulk-write (line id, LinePricing) pairs; returns the updated lines."""
+    result = await db.execute(APPLY_LINE_PRICING_SQL, {
+        "transaction_id": transaction_id,
+        "started_at": started_at,
+        "ids": [line_id for line_id, _ in priced],
+        "discount_amounts": [p.discount_amount for _, p in priced],
+        "tax_amounts": [p.tax_amount for _, p in priced],
+        "line_totals": [p.line_total for _, p in priced],
+    })
+    return result.all()
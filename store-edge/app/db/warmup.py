@@ -0,0 +1,109 @@
+# app/db/warmup.py
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.orm import configure_mappers
+
+from app.db.repositories.catalog import get_active_catalog_item
+from app.db.repositories.idempotency import get_idempotency_key
+from app.db.repositories.inventory import (
+    RELEASE_TRANSACTION_RESERVATIONS_SQL,
+    SETTLE_STOCK_FOR_TRANSACTION_SQL,
+    SYNC_RESERVATIONS_SQL,
+)
+from app.db.repositories.outbox import INSERT_SALE_RECORDED_SQL
+from app.db.repositories.payments import get_payment
+from app.db.repositories.reports import APPLY_SALE_SQL
+from app.db.repositories.transactions import (
+    ADD_LINE_ITEM_SQL,
+    HAS_DISCOUNTED_LINES_SQL,
+    REMOVE_LINE_ITEM_SQL,
+    UPDATE_LINE_QUANTITY_SQL,
+    get_line_items_for_transaction,
+    get_transaction_by_id,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def hot_statements() -> List[Tuple]:
+    """Checkout statements with parameters that match no rows.
+
+    Executing them (inside a rolled-back transaction, which also discards
+    the rollup header row the sale upsert writes) goes through the normal
+    execution path, so both SQLAlchemy's compiled cache and the
+    connection's prepared-statement cache end up populated.
+    """
+    missing = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    return [
+        (ADD_LINE_ITEM_SQL, {
+            "id": uuid.uuid4(), "transaction_id": missing, "sku": "", "barcode": None,
+            "name": "", "unit_price": Decimal(0), "quantity": Decimal(1),
+            "discount_amount": Decimal(0), "tax_amount": Decimal(0), "tax_rate": None,
+            "line_total": Decimal(0), "uom": None,
+        }),
+        (UPDATE_LINE_QUANTITY_SQL, {
+            "transaction_id": missing, "line_item_id": missing, "quantity": Decimal(1),
+        }),
+        (REMOVE_LINE_ITEM_SQL, {"transaction_id": missing, "line_item_id": missing}),
+        (HAS_DISCOUNTED_LINES_SQL, {"transaction_id": missing, "started_at": now}),
+        (SYNC_RESERVATIONS_SQL, {
+            "store_id": "", "transaction_id": missing, "started_at": now, "skus": [""],
+        }),
+        (RELEASE_TRANSACTION_RESERVATIONS_SQL, {"transaction_id": missing}),
+        (SETTLE_STOCK_FOR_TRANSACTION_SQL, {"store_id": "", "transaction_id": missing, "started_at": now}),
+        (APPLY_SALE_SQL, {
+            "transaction_id": missing, "started_at": now, "store_id": "", "terminal_id": "",
+            "cashier_id": "", "completed_at": now, "subtotal": Decimal(0),
+            "tax_amount": Decimal(0), "total": Decimal(0),
+        }),
+        (INSERT_SALE_RECORDED_SQL, {
+            "event_id": uuid.uuid4(), "transaction_id": missing, "started_at": now,
+        }),
+    ]
+
+
+async def _prime_lookups(db: AsyncSession) -> None:
+    """ORM lookups of the request path; their select() constructs are
+    compiled on first use, so run each once with a key that matches nothing."""
+    missing = uuid.uuid4()
+    await get_transaction_by_id(db, missing)
+    await get_line_items_for_transaction(db, missing, datetime.now(timezone.utc))
+    await get_payment(db, missing)
+    await get_idempotency_key(db, "")
+    await get_active_catalog_item(db, "", barcode="")
+    await get_active_catalog_item(db, "", sku="")
+
+
+async def _prime(conn: AsyncConnection) -> None:
+    async with conn.begin() as txn:
+        for stmt, params in hot_statements():
+            await conn.execute(stmt, params)
+        # the session joins the connection's transaction and is discarded with it
+        async with AsyncSession(bind=conn) as db:
+            await _prime_lookups(db)
+        await txn.rollback()
+
+
+def prepare_orm() -> None:
+    """Configure mappers now rather than inside the first request's query."""
+    configure_mappers()
+
+
+async def warm_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open ``connections`` pool connections concurrently and prime each one."""
+    if connections <= 0:
+        return
+    conns = await asyncio.gather(*(engine.connect() for _ in range(connections)))
+    try:
+        await asyncio.gather(*(_prime(conn) for conn in conns))
+    finally:
+        # closing returns them to the pool, still connected and prepared
+        await asyncio.gather(*(conn.close() for conn in conns), return_exceptions=True)
+    logger.info("db pool warmed: %d connections primed", connections)
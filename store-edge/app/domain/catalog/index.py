@@ -0,0 +1,116 @@
+# app/domain/catalog/index.py
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.repositories.catalog import get_catalog_version_stamp, list_active_catalog_items
+
+logger = logging.getLogger(__name__)
+
+# must match the channel used by the catalog_notify() trigger function; fired
+# for local_catalog and local_promotions changes
+CATALOG_NOTIFY_CHANNEL = "edge_catalog"
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogEntry:
+    """Immutable, process-local copy of one active LocalCatalog row."""
+
+    store_id: str
+    sku: str
+    barcode: Optional[str]
+    name: str
+    category: Optional[str]
+    price: Decimal
+    tax_rate: Optional[Decimal]
+    uom: str
+    version: int
+
+
+class CatalogIndex:
+    """Read-only lookup tables keyed by (store_id, barcode) and (store_id, sku).
+
+    An index is never mutated after construction; a refresh builds a new one
+    and swaps the module-level reference, so readers never see a half-built
+    index and never need a lock.
+    """
+
+    __slots__ = ("stamp", "_by_barcode", "_by_sku")
+
+    def __init__(self, entries: Iterable[CatalogEntry], stamp: Tuple[int, int, Optional[datetime]]):
+        self.stamp = stamp
+        self._by_barcode: Dict[Tuple[str, str], CatalogEntry] = {}
+        self._by_sku: Dict[Tuple[str, str], CatalogEntry] = {}
+        for entry in entries:
+            self._by_sku[(entry.store_id, entry.sku)] = entry
+            if entry.barcode:
+                self._by_barcode[(entry.store_id, entry.barcode)] = entry
+
+    def __len__(self) -> int:
+        return len(self._by_sku)
+
+    def __iter__(self) -> Iterator[CatalogEntry]:
+        return iter(self._by_sku.values())
+
+    def by_barcode(self, store_id: str, barcode: str) -> Optional[CatalogEntry]:
+        return self._by_barcode.get((store_id, barcode))
+
+    def by_sku(self, store_id: str, sku: str) -> Optional[CatalogEntry]:
+        return self._by_sku.get((store_id, sku))
+
+
+_index = CatalogIndex((), stamp=(-1, -1, None))
+
+
+def entry_from_row(row) -> CatalogEntry:
+    return CatalogEntry(
+        store_id=row.store_id,
+        sku=row.sku,
+        barcode=row.barcode,
+        name=row.name,
+        category=row.category,
+        price=row.price,
+        tax_rate=row.tax_rate,
+        uom=row.uom,
+        version=row.version,
+    )
+
+
+def get_catalog_index() -> CatalogIndex:
+    return _index
+
+
+async def refresh_catalog_index(
+    db: AsyncSession,
+    force: bool = False,
+) -> CatalogIndex:
+    """Rebuild the index if local_catalog changed since the last build."""
+    global _index
+
+    stamp = await get_catalog_version_stamp(db)
+    if not force and stamp == _index.stamp:
+        return _index
+
+    rows = await list_active_catalog_items(db)
+    entries = [entry_from_row(row) for row in rows]
+    _index = CatalogIndex(entries, stamp=stamp)
+    logger.info("catalog index rebuilt: %d items, stamp=%s", len(_index), stamp)
+    return _index
+
+
+async def run_catalog_index_refresher(session_factory, interval: float) -> None:
+    """Background loop that picks up catalog changes made by sync or admin tools."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as db:
+                await refresh_catalog_index(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("catalog index refresh failed")
@@ -0,0 +1,16 @@
+# app/domain/catalog/schemas.py
+from decimal import Decimal
+from pydantic import BaseModel
+from typing import Optional
+
+class CatalogItemOut(BaseModel):
+    sku_id: str
+    barcode: Optional[str]
+    product_name: str
+    category: Optional[str]
+    base_price: Decimal
+    tax_rate: Optional[Decimal]
+    uom: str
+    # None when the store keeps no stock record for the SKU
+    in_stock: Optional[bool] = None
+    available_quantity: Optional[Decimal] = None
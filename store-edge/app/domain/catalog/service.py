@@ -0,0 +1,65 @@
+# app/domain/catalog/service.py
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.repositories.catalog import get_active_catalog_item
+from app.domain.inventory.availability import availability
+from .index import CatalogEntry, entry_from_row, get_catalog_index
+from .schemas import CatalogItemOut
+
+# index misses answered from the DB, valid for one index stamp; a catalog
+# change moves the stamp, so neither hits nor "not found" answers go stale
+_READ_THROUGH_MAX = 10_000
+_read_through_stamp: Tuple[int, int] = (-1, -1)
+_read_through: Dict[Tuple[str, Optional[str], Optional[str]], Optional[CatalogEntry]] = {}
+
+def lookup_catalog_item(
+    store_id: str,
+    barcode: Optional[str] = None,
+    sku: Optional[str] = None,
+) -> Optional[CatalogEntry]:
+    index = get_catalog_index()
+    if barcode is not None:
+        return index.by_barcode(store_id, barcode)
+    if sku is not None:
+        return index.by_sku(store_id, sku)
+    return None
+
+async def resolve_catalog_item(
+    db: AsyncSession,
+    store_id: str,
+    barcode: Optional[str] = None,
+    sku: Optional[str] = None,
+) -> Optional[CatalogEntry]:
+    """Index lookup that falls back to local_catalog for items the index
+    hasn't picked up yet (synced since the last refresh)."""
+    global _read_through_stamp
+
+    entry = lookup_catalog_item(store_id, barcode=barcode, sku=sku)
+    if entry is not None or (barcode is None and sku is None):
+        return entry
+
+    stamp = get_catalog_index().stamp
+    if stamp != _read_through_stamp or len(_read_through) >= _READ_THROUGH_MAX:
+        _read_through.clear()
+        _read_through_stamp = stamp
+    key = (store_id, barcode, None if barcode is not None else sku)
+    if key not in _read_through:
+        row = await get_active_catalog_item(db, store_id, barcode=barcode, sku=sku)
+        _read_through[key] = entry_from_row(row) if row is not None else None
+    return _read_through[key]
+
+def to_catalog_item_out(entry: CatalogEntry) -> CatalogItemOut:
+    level = availability.get(entry.store_id, entry.sku)
+    return CatalogItemOut(
+        sku_id=entry.sku,
+        barcode=entry.barcode,
+        product_name=entry.name,
+        category=entry.category,
+        base_price=entry.price,
+        tax_rate=entry.tax_rate,
+        uom=entry.uom,
+        in_stock=None if level is None else level.available > 0,
+        available_quantity=None if level is None else level.available,
+    )
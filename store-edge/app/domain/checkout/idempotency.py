@@ -0,0 +1,40 @@
+# app/domain/checkout/idempotency.py
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.db.repositories.idempotency import delete_idempotency_keys_before
+
+logger = logging.getLogger(__name__)
+
+
+def request_hash(transaction_id: UUID, payload: BaseModel) -> str:
+    """Stable fingerprint of a request, used to refuse replays of a reused key."""
+    body = json.dumps(
+        {"transaction_id": str(transaction_id), "payload": payload.model_dump(mode="json")},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+async def run_idempotency_key_purger(session_factory, interval: float, ttl: float) -> None:
+    """Background loop deleting stored responses older than ``ttl`` seconds."""
+    while True:
+        try:
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=ttl)
+            async with session_factory() as db:
+                async with db.begin():
+                    deleted = await delete_idempotency_keys_before(db, cutoff)
+            if deleted:
+                logger.info("purged %d expired idempotency keys", deleted)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("idempotency key purge failed")
+        await asyncio.sleep(interval)
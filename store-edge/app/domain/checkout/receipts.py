@@ -0,0 +1,47 @@
+# app/domain/checkout/receipts.py
+import asyncio
+from typing import Dict, Tuple
+
+from app.db.repositories.receipts import format_receipt_number, reserve_receipt_block
+
+
+class ReceiptNumberAllocator:
+    """Hands out receipt numbers from per-terminal blocks cached in process.
+
+    A block is reserved with one committed counter bump (in its own session,
+    so a rolled-back checkout can never return numbers to the pool), then
+    served from memory. Numbers left in a block when the process stops are
+    skipped, which is the accepted trade-off of the "block" mode.
+    """
+
+    def __init__(self, session_factory, block_size: int):
+        self._session_factory = session_factory
+        self.block_size = block_size
+        # (store_id, terminal_id) -> (next number, last number in block)
+        self._blocks: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+    async def next_receipt_number(self, store_id: str, terminal_id: str) -> str:
+        key = (store_id, terminal_id)
+        number = self._take(key)
+        if number is None:
+            lock = self._locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                number = self._take(key)
+                if number is None:
+                    await self._refill(key)
+                    number = self._take(key)
+        return format_receipt_number(terminal_id, number)
+
+    def _take(self, key: Tuple[str, str]):
+        block = self._blocks.get(key)
+        if block is None or block[0] > block[1]:
+            return None
+        self._blocks[key] = (block[0] + 1, block[1])
+        return block[0]
+
+    async def _refill(self, key: Tuple[str, str]) -> None:
+        async with self._session_factory() as db:
+            last = await reserve_receipt_block(db, key[0], key[1], self.block_size)
+            await db.commit()
+        self._blocks[key] = (last - self.block_size + 1, last)
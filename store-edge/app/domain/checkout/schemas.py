@@ -1,8 +1,8 @@
 # app/domain/checkout/schemas.py
 from decimal import Decimal
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from uuid import UUID
-from typing import Optional
+from typing import Annotated, List, Literal, Optional, Union
 
 class TransactionCreate(BaseModel):
     store_id: str
@@ -10,19 +10,48 @@ class TransactionCreate(BaseModel):
     cashier_id: Optional[str] = None
 
 class AddItem(BaseModel):
-    sku_id: str
-    barcode: str
-    product_name: str
-    quantity: int
-    unit_price: float
+    # scanned barcode or keyed-in sku; price, name and tax come from the catalog
+    barcode: Optional[str] = None
+    sku_id: Optional[str] = None
+    quantity: Decimal = Field(default=Decimal(1), gt=0)
+
+    @model_validator(mode="after")
+    def _barcode_or_sku(self):
+        if self.barcode is None and self.sku_id is None:
+            raise ValueError("barcode or sku_id is required")
+        return self
+
+class UpdateItemQuantity(BaseModel):
+    quantity: Decimal = Field(gt=0)
+
+class AddLine(AddItem):
+    op: Literal["add"]
+
+class SetLineQuantity(UpdateItemQuantity):
+    op: Literal["set_quantity"]
+    line_item_id: UUID
+
+class RemoveLine(BaseModel):
+    op: Literal["remove"]
+    line_item_id: UUID
+
+BasketOperation = Annotated[Union[AddLine, SetLineQuantity, RemoveLine], Field(discriminator="op")]
+
+class BasketUpdate(BaseModel):
+    # applied as removes, then quantity changes, then adds (in list order)
+    operations: List[BasketOperation] = Field(min_length=1, max_length=500)
 
 class LineItemOut(BaseModel):
     id: UUID
-    sku_id: str
-    barcode: str
-    product_name: str
-    quantity: int
+    line_number: int
+    # DB columns are sku/name, API keeps the sku_id/product_name naming
+    sku_id: str = Field(validation_alias="sku")
+    barcode: Optional[str]
+    product_name: str = Field(validation_alias="name")
+    quantity: Decimal
     unit_price: Decimal
+    discount_amount: Decimal
+    tax_amount: Decimal
     line_total: Decimal
 
     class Config:
@@ -33,8 +62,31 @@ class TransactionOut(BaseModel):
     store_id: str
     terminal_id: str
     cashier_id: Optional[str]
+    receipt_number: str
     status: str
+    subtotal: Decimal
+    tax_amount: Decimal
+    total: Decimal
+    line_count: int
 
     class Config:
         from_attributes = True  # hoặc orm_mode = True tùy version Pydantic
 
+class TransactionTotalsOut(BaseModel):
+    id: UUID
+    subtotal: Decimal
+    tax_amount: Decimal
+    total: Decimal
+    line_count: int
+
+    class Config:
+        from_attributes = True
+
+class BasketOut(BaseModel):
+    id: UUID
+    status: str
+    subtotal: Decimal
+    tax_amount: Decimal
+    total: Decimal
+    line_count: int
+    lines: List[LineItemOut]
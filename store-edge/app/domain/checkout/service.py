@@ -1,101 +1,443 @@
 # app/domain/checkout/service.py
+import logging
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import func, select
+from sqlalchemy.sql import exists, func, insert, update
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
+from app.db.models.payments import Payment, PaymentStatus
 from app.db.models.transactions import Transaction
-from app.db.models.line_items import LineItem
-from app.db.repositories.transactions import get_line_items_for_transaction, get_transaction_by_id
-from .schemas import AddItem, TransactionCreate
+from app.db.repositories.idempotency import get_idempotency_key, save_idempotency_key
+from app.db.repositories.inventory import (
+    release_transaction_reservations,
+    settle_stock_for_transaction,
+    sync_reservations,
+)
+from app.db.repositories.outbox import insert_sale_recorded
+from app.db.repositories.payments import (
+    ACTIVE_STATUSES,
+    cancel_pending_payments,
+    get_open_payment,
+)
+from app.db.repositories.receipts import next_receipt_number_expr
+from app.db.repositories.reports import apply_sale_to_rollups
+from app.db.repositories.transactions import (
+    add_line_items,
+    aggregate_line_items,
+    delete_line_item_returning_totals,
+    get_basket_lines,
+    get_transaction_by_id,
+    has_discounted_lines,
+    insert_line_item_returning,
+    lock_draft_transaction,
+    recompute_totals_returning,
+    remove_line_items,
+    set_line_quantities,
+    update_line_quantity_returning,
+)
+from app.domain.catalog.index import CatalogEntry
+from app.domain.catalog.service import resolve_catalog_item
+from app.domain.errors import BusinessError, NotFoundError
+from app.domain.inventory.availability import availability
+from app.domain.payments.providers import get_provider
+from app.domain.payments.service import payment_watchers
+from app.domain.pricing.engine import get_pricing_rules, price_new_line, reprice_basket
+from .idempotency import request_hash
+from .receipts import ReceiptNumberAllocator
+from .schemas import (
+    AddItem,
+    AddLine,
+    BasketOut,
+    BasketUpdate,
+    LineItemOut,
+    RemoveLine,
+    SetLineQuantity,
+    TransactionCreate,
+)
+
+logger = logging.getLogger(__name__)
+
+receipt_allocator = ReceiptNumberAllocator(AsyncSessionLocal, settings.RECEIPT_BLOCK_SIZE)
 
 async def create_transaction(
     db: AsyncSession,
     data: TransactionCreate
 ) -> Transaction:
-    txn = Transaction(
-        store_id=data.store_id,
-        terminal_id=data.terminal_id,
-        cashier_id=data.cashier_id,
-        status="DRAFT"
-    )
+    # pricing, reservations and stock all key on this edge's store, so a
+    # transaction for any other store would reserve and decrement different rows
+    if data.store_id != settings.STORE_ID:
+        raise BusinessError(f"This edge serves store {settings.STORE_ID}, not {data.store_id}")
+
+    stmt = insert(Transaction)
+    if settings.RECEIPT_ALLOCATION_MODE == "gapless":
+        # counter bump rides in the same statement and rolls back with it
+        counter, receipt_number = next_receipt_number_expr(data.store_id, data.terminal_id)
+        stmt = stmt.add_cte(counter)
+    else:
+        receipt_number = await receipt_allocator.next_receipt_number(data.store_id, data.terminal_id)
 
-    db.add(txn)
+    # INSERT ... RETURNING hydrates server defaults without a refresh round trip
+    result = await db.scalars(
+        stmt.values(
+            store_id=data.store_id,
+            terminal_id=data.terminal_id,
+            cashier_id=data.cashier_id,
+            receipt_number=receipt_number,
+            status="DRAFT",
+        )
+        .returning(Transaction)
+    )
+    txn = result.one()
     await db.commit()
-    await db.refresh(txn)
     return txn
 
-async def add_item_to_transaction(
+async def _resolve_item(
     db: AsyncSession,
-    transaction_id,
     item: AddItem,
-) -> LineItem:
-    # Có thể thêm check transaction tồn tại, status = DRAFT
+) -> CatalogEntry:
+    # the edge serves one store; local_catalog only holds its items
+    entry = await resolve_catalog_item(db, settings.STORE_ID, barcode=item.barcode, sku=item.sku_id)
+    if entry is None:
+        raise NotFoundError(f"Item not found: {item.barcode or item.sku_id}")
+    return entry
 
-    txn = get_transaction_by_id(db, transaction_id)
-    if txn is None:
-        # với domain đúng, nên raise HTTPException ở layer API
-        raise ValueError("Transaction not found")  # hoặc trả None cho route xử lý
+async def _needs_reprice(
+    db: AsyncSession,
+    transaction_id: UUID,
+    started_at: datetime,
+    skus: List[str],
+) -> bool:
+    # a live rule can match the change, or an ended one left discounts behind
+    if get_pricing_rules().affects(settings.STORE_ID, skus):
+        return True
+    return await has_discounted_lines(db, transaction_id, started_at)
 
+async def _reprice(
+    db: AsyncSession,
+    transaction_id: UUID,
+    started_at: datetime,
+    skus: List[str],
+) -> Tuple[List[Row], Optional[Row]]:
+    """Re-apply promotions after a change touching ``skus``.
+
+    Returns the lines whose pricing moved and the recomputed totals, or
+    nothing when no promotion can be affected (the common scan path).
+    """
+    if not await _needs_reprice(db, transaction_id, started_at, skus):
+        return [], None
+    changed = await reprice_basket(db, transaction_id, started_at, settings.STORE_ID)
+    if not changed:
+        return [], None
+    return changed, await recompute_totals_returning(db, transaction_id, started_at, 0)
+
+async def _reserve(
+    db: AsyncSession,
+    transaction_id: UUID,
+    started_at: datetime,
+    skus: List[str],
+) -> List[Row]:
+    """Bring the basket's soft reservations for ``skus`` in line with its lines.
 
-    line_total = item.unit_price * item.quantity
+    The returned inventory rows go to the availability cache once the
+    caller has committed.
+    """
+    if not settings.INVENTORY_RESERVATIONS_ENABLED or not skus:
+        return []
+    return await sync_reservations(db, settings.STORE_ID, transaction_id, started_at, skus)
 
-    line = LineItem(
-        transaction_id=transaction_id,
-        sku_id=item.sku_id,
-        barcode=item.barcode,
-        product_name=item.product_name,
-        quantity=item.quantity,
-        unit_price=item.unit_price,
-        line_total=line_total,
+def _pick(changed: List[Row], line: Row) -> Row:
+    return next((c for c in changed if c.id == line.id), line)
+
+async def add_item_to_transaction(
+    db: AsyncSession,
+    transaction_id: UUID,
+    item: AddItem,
+) -> Row:
+    entry = await _resolve_item(db, item)
+    line = await insert_line_item_returning(
+        db, price_new_line(transaction_id, uuid.uuid4(), entry, item.quantity),
     )
-    db.add(line)
+
+    if line is None:
+        await _raise_for_frozen_basket(db, transaction_id)
+        raise BusinessError("Transaction is not open for changes")
+
+    changed, _ = await _reprice(db, transaction_id, line.transaction_started_at, [line.sku])
+    stock = await _reserve(db, transaction_id, line.transaction_started_at, [line.sku])
+    await db.commit()
+    availability.apply(stock)
+    return _pick(changed, line)
+
+async def update_item_quantity(
+    db: AsyncSession,
+    transaction_id: UUID,
+    line_item_id: UUID,
+    quantity: Decimal,
+) -> Row:
+    line = await update_line_quantity_returning(db, transaction_id, line_item_id, quantity)
+    if line is None:
+        await _raise_for_frozen_basket(db, transaction_id)
+        raise NotFoundError("Line item not found")
+
+    changed, _ = await _reprice(db, transaction_id, line.transaction_started_at, [line.sku])
+    stock = await _reserve(db, transaction_id, line.transaction_started_at, [line.sku])
+    await db.commit()
+    availability.apply(stock)
+    return _pick(changed, line)
+
+async def remove_item_from_transaction(
+    db: AsyncSession,
+    transaction_id: UUID,
+    line_item_id: UUID,
+) -> Row:
+    totals = await delete_line_item_returning_totals(db, transaction_id, line_item_id)
+    if totals is None:
+        await _raise_for_frozen_basket(db, transaction_id)
+        raise NotFoundError("Line item not found")
+
+    _, repriced = await _reprice(db, transaction_id, totals.started_at, [totals.sku])
+    stock = await _reserve(db, transaction_id, totals.started_at, [totals.sku])
     await db.commit()
-    await db.refresh(line)
-    return line
+    availability.apply(stock)
+    return repriced or totals
+
+async def submit_basket(
+    db: AsyncSession,
+    transaction_id: UUID,
+    basket: BasketUpdate,
+    idempotency_key: Optional[str] = None,
+) -> Tuple[Dict[str, Any], bool]:
+    """Apply a batch of line operations in one DB transaction.
+
+    Returns the resulting basket (JSON-ready) and whether it was replayed
+    from an earlier request with the same idempotency key. Only successful
+    submissions are recorded, so a retry after an error runs again.
+    """
+    fingerprint = None
+    if idempotency_key is not None:
+        fingerprint = request_hash(transaction_id, basket)
+        stored = await get_idempotency_key(db, idempotency_key)
+        if stored is not None:
+            return _replay(stored, transaction_id, fingerprint), True
+
+    removes: List[UUID] = []
+    quantities: Dict[UUID, Decimal] = {}
+    adds: List[Dict[str, Any]] = []
+    seen = set()
+    for op in basket.operations:
+        if isinstance(op, AddLine):
+            entry = await _resolve_item(db, op)
+            adds.append(price_new_line(transaction_id, uuid.uuid4(), entry, op.quantity))
+            continue
+        if op.line_item_id in seen:
+            raise BusinessError(f"Line item {op.line_item_id} appears in more than one operation")
+        seen.add(op.line_item_id)
+        if isinstance(op, RemoveLine):
+            removes.append(op.line_item_id)
+        elif isinstance(op, SetLineQuantity):
+            quantities[op.line_item_id] = op.quantity
+
+    header = await lock_draft_transaction(db, transaction_id)
+    if header is None:
+        await _raise_for_frozen_basket(db, transaction_id)
+        raise BusinessError("Transaction is not open for changes")
+
+    touched = [line["sku"] for line in adds]
+    if removes:
+        skus = await remove_line_items(db, transaction_id, header.started_at, removes)
+        if len(skus) != len(removes):
+            await db.rollback()
+            raise NotFoundError("Line item not found")
+        touched += skus
+    if quantities:
+        skus = await set_line_quantities(db, transaction_id, header.started_at, quantities)
+        if len(skus) != len(quantities):
+            await db.rollback()
+            raise NotFoundError("Line item not found")
+        touched += skus
+    if adds:
+        await add_line_items(db, transaction_id, header.started_at, header.last_line_number, adds)
+    if await _needs_reprice(db, transaction_id, header.started_at, touched):
+        await reprice_basket(db, transaction_id, header.started_at, settings.STORE_ID)
+
+    # one recompute for the whole batch instead of a delta per operation
+    totals = await recompute_totals_returning(db, transaction_id, header.started_at, len(adds))
+    lines = await get_basket_lines(db, transaction_id, header.started_at)
+    response = BasketOut(
+        id=totals.id,
+        status=totals.status,
+        subtotal=totals.subtotal,
+        tax_amount=totals.tax_amount,
+        total=totals.total,
+        line_count=totals.line_count,
+        lines=[LineItemOut.model_validate(line) for line in lines],
+    ).model_dump(mode="json")
+    stock = await _reserve(db, transaction_id, header.started_at, touched)
+
+    if idempotency_key is not None:
+        saved = await save_idempotency_key(db, idempotency_key, transaction_id, fingerprint, response)
+        if not saved:
+            # a concurrent retry with the same key committed first; its result wins
+            await db.rollback()
+            stored = await get_idempotency_key(db, idempotency_key)
+            return _replay(stored, transaction_id, fingerprint), True
+
+    await db.commit()
+    availability.apply(stock)
+    return response, False
+
+def _replay(stored, transaction_id: UUID, fingerprint: str) -> Dict[str, Any]:
+    if stored.transaction_id != transaction_id or stored.request_hash != fingerprint:
+        raise BusinessError("Idempotency key was already used for a different request")
+    return stored.response
 
 async def recalculate_totals(
     db: AsyncSession,
     transaction_id: UUID
 ) -> Transaction:
-    # Get transaction
-    txn = get_transaction_by_id(db, transaction_id)
+    """Full recompute of the running totals from line_items (O(lines))."""
+    txn = await get_transaction_by_id(db, transaction_id)
 
     if txn is None:
-        raise ValueError("Transaction not found")
-    
-    # Get subtotal by SUM
-    result_sum = await db.execute(
-        select(func.coalesce(func.sum(LineItem.line_total), 0)).where(LineItem.transaction_id == transaction_id)
-    )
-    subtotal = result_sum.scalar()
-    txn.subtotal = subtotal
-    txn.total_amount = subtotal
+        raise NotFoundError("Transaction not found")
 
-    await db.commit()
-    await db.refresh(txn)
+    agg = await aggregate_line_items(db, transaction_id, txn.started_at)
+    if (txn.subtotal, txn.tax_amount, txn.line_count) != (agg.subtotal, agg.tax_amount, agg.line_count):
+        logger.warning(
+            "running totals drifted for transaction %s: cached=(%s, %s, %s) actual=(%s, %s, %s)",
+            transaction_id, txn.subtotal, txn.tax_amount, txn.line_count,
+            agg.subtotal, agg.tax_amount, agg.line_count,
+        )
+        txn.subtotal = agg.subtotal
+        txn.tax_amount = agg.tax_amount
+        txn.total = agg.subtotal + agg.tax_amount
+        txn.line_count = agg.line_count
+        await db.flush()
     return txn
 
 async def finalize_transaction(
     db: AsyncSession,
-    transaction_id: UUID
+    transaction_id: UUID,
+    verify_totals: Optional[bool] = None,
 ) -> Transaction:
-    txn = get_transaction_by_id(db, transaction_id)
+    if verify_totals is None:
+        verify_totals = settings.CHECKOUT_VERIFY_TOTALS
+    if verify_totals:
+        await recalculate_totals(db, transaction_id)
 
-    if txn is None:
-        raise NotFoundError("Transaction not found")
+    # the cached line_count replaces loading every line just to reject empty
+    # baskets; a QR payment still in flight must finish or be cancelled first,
+    # and a captured one must have collected exactly the basket total
+    result = await db.scalars(
+        update(Transaction)
+        .where(
+            Transaction.id == transaction_id,
+            Transaction.status == "DRAFT",
+            Transaction.line_count > 0,
+            ~exists().where(
+                Payment.transaction_id == transaction_id,
+                Payment.status.in_(ACTIVE_STATUSES),
+            ),
+            ~exists().where(
+                Payment.transaction_id == transaction_id,
+                Payment.status == PaymentStatus.CAPTURED,
+                Payment.amount != Transaction.total,
+            ),
+        )
+        .values(status="PAID", completed_at=func.now())
+        .returning(Transaction)
+    )
+    txn = result.one_or_none()
 
-    if txn.status != "DRAFT":
-        raise BusinessError("Only DRAFT transactions can be finalized")
-    
-    items = await get_line_items_for_transaction(db, transaction_id)
-    if not items:
+    if txn is None:
+        await _raise_for_missing_draft(db, transaction_id)
+        payment = await get_open_payment(db, transaction_id)
+        if payment is not None and payment.status in ACTIVE_STATUSES:
+            raise BusinessError(f"Payment is {payment.status.value}, wait for it to complete or cancel it")
+        if payment is not None:
+            txn = await get_transaction_by_id(db, transaction_id)
+            if payment.amount != txn.total:
+                raise BusinessError(
+                    f"Captured payment of {payment.amount} does not match the total {txn.total}"
+                )
         raise BusinessError("Cannot finalize empty transaction")
 
-    # Recalculate totals
-    txn = await recalculate_totals(db, transaction_id)
+    # stock, report rollups and the SaleRecorded event commit atomically with the status change
+    stock = await settle_stock_for_transaction(db, settings.STORE_ID, transaction_id, txn.started_at)
+    await apply_sale_to_rollups(db, txn)
+    await insert_sale_recorded(db, transaction_id, txn.started_at)
 
-    txn.status = "PAID"
+    await db.commit()
+    availability.apply(stock)
+    return txn
 
+async def void_transaction(
+    db: AsyncSession,
+    transaction_id: UUID,
+) -> Transaction:
+    """Cancel a DRAFT basket, its pending QR payment and its reservations.
+
+    Pending payments are cancelled first: their row locks keep the poller
+    from authorizing them until this commits, so a payment is either
+    cancelled here or was already AUTHORIZED/CAPTURED, which refuses the void.
+    """
+    cancelled = await cancel_pending_payments(db, transaction_id, "transaction voided")
+    payment = await get_open_payment(db, transaction_id)
+    if payment is not None:
+        await db.rollback()
+        raise BusinessError(f"Payment is {payment.status.value}, it must be refunded instead")
+
+    result = await db.scalars(
+        update(Transaction)
+        .where(Transaction.id == transaction_id, Transaction.status == "DRAFT")
+        .values(status="CANCELLED", cancelled_at=func.now())
+        .returning(Transaction)
+    )
+    txn = result.one_or_none()
+    if txn is None:
+        await _raise_for_missing_draft(db, transaction_id)
+        raise BusinessError("Transaction is not open for changes")
+
+    released = await release_transaction_reservations(db, transaction_id)
     await db.commit()
-    await db.refresh(txn)
+    availability.apply(released)
 
-    return txn
\ No newline at end of file
+    payment_watchers.notify(row.id for row in cancelled)
+    for row in cancelled:
+        provider = get_provider(row.provider)
+        if provider is None or row.provider_ref is None:
+            continue
+        try:
+            await provider.cancel(row.provider_ref)
+        except Exception as exc:
+            # the QR expires on its own; a late authorization can't move CANCELLED
+            logger.warning("provider cancel of payment %s failed: %s", row.id, exc)
+    return txn
+
+async def _raise_for_missing_draft(
+    db: AsyncSession,
+    transaction_id: UUID,
+) -> None:
+    # only failure paths pay for a second query to explain why a write matched nothing
+    await db.rollback()
+    txn = await get_transaction_by_id(db, transaction_id)
+    if txn is None:
+        raise NotFoundError("Transaction not found")
+    if txn.status != "DRAFT":
+        raise BusinessError(f"Transaction is {txn.status}, expected DRAFT")
+
+async def _raise_for_frozen_basket(
+    db: AsyncSession,
+    transaction_id: UUID,
+) -> None:
+    """Explain a line edit that matched nothing: a missing or closed
+    transaction, or a payment whose amount was taken from the basket total."""
+    await _raise_for_missing_draft(db, transaction_id)
+    payment = await get_open_payment(db, transaction_id)
+    if payment is not None:
+        raise BusinessError(f"Payment is {payment.status.value}, cancel it before changing the basket")
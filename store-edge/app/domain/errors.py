@@ -0,0 +1,12 @@
+# app/domain/errors.py
+
+class DomainError(Exception):
+    """Base class for errors raised by domain services."""
+
+
+class NotFoundError(DomainError):
+    pass
+
+
+class BusinessError(DomainError):
+    pass
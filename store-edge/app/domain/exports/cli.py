@@ -0,0 +1,54 @@
+# app/domain/exports/cli.py
+"""Export transactions with their lines and payments for a range of business days.
+
+    python -m app.domain.exports.cli --from 2026-02-01 --to 2026-02-28 --format ndjson --out feb.ndjson
+
+Same stream as GET /api/v1/exports/transactions, written to a file (or
+stdout) chunk by chunk.
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date
+
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal, engine
+from app.domain.reports.service import business_day_range
+from .service import CSV, NDJSON, export_transactions
+
+
+async def main(args: argparse.Namespace) -> None:
+    start, _ = business_day_range(args.first)
+    _, end = business_day_range(args.last or args.first)
+    out = open(args.out, "wb") if args.out else sys.stdout.buffer
+    written = 0
+    try:
+        async for chunk in export_transactions(
+            AsyncSessionLocal, args.store_id, start, end, args.format, args.status,
+            page_size=settings.EXPORT_PAGE_SIZE,
+            fetch_size=settings.EXPORT_FETCH_SIZE,
+            chunk_bytes=settings.EXPORT_CHUNK_BYTES,
+        ):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if args.out:
+            out.close()
+        await engine.dispose()
+    print(f"exported {written} bytes for {args.store_id}", file=sys.stderr)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--from", dest="first", type=date.fromisoformat, required=True)
+    parser.add_argument("--to", dest="last", type=date.fromisoformat,
+                        help="last day, inclusive (default: same as --from)")
+    parser.add_argument("--format", choices=(NDJSON, CSV), default=NDJSON)
+    parser.add_argument("--status", help="only transactions in this status, e.g. PAID")
+    parser.add_argument("--store-id", default=settings.STORE_ID)
+    parser.add_argument("--out", help="output file (default: stdout)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,125 @@
+# app/domain/inventory/availability.py
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.repositories.inventory import list_inventory_changed_since, release_abandoned_reservations
+
+logger = logging.getLogger(__name__)
+
+# overlap between refresh passes, see LIST_INVENTORY_CHANGED_SQL
+REFRESH_LOOKBACK_SECONDS = 60.0
+# must match the channel used by the local_inventory_notify() trigger function
+INVENTORY_NOTIFY_CHANNEL = "edge_inventory"
+
+
+@dataclass(frozen=True, slots=True)
+class StockLevel:
+    on_hand: Decimal
+    reserved: Decimal
+    updated_at: datetime
+
+    @property
+    def available(self) -> Decimal:
+        return self.on_hand - self.reserved
+
+
+class InventoryChange(NamedTuple):
+    store_id: str
+    sku: str
+    on_hand: Decimal
+    reserved: Decimal
+    updated_at: datetime
+
+
+class AvailabilityCache:
+    """Process-local copy of local_inventory's on_hand/reserved per (store, sku).
+
+    Written through with the rows returned by every inventory statement
+    (after its transaction commits) and topped up by a periodic delta read
+    for changes made elsewhere. Other workers' changes also arrive as
+    NOTIFY payloads from the local_inventory trigger. A row only replaces
+    the cached level if it is at least as new, so a slow refresh can't undo
+    a write-through.
+    """
+
+    def __init__(self):
+        self._levels: Dict[Tuple[str, str], StockLevel] = {}
+        self._high_water: Optional[datetime] = None
+        self._refresh_requested = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def get(self, store_id: str, sku: str) -> Optional[StockLevel]:
+        return self._levels.get((store_id, sku))
+
+    def apply(self, rows: Iterable) -> None:
+        for row in rows:
+            key = (row.store_id, row.sku)
+            current = self._levels.get(key)
+            if current is None or current.updated_at <= row.updated_at:
+                self._levels[key] = StockLevel(row.on_hand, row.reserved, row.updated_at)
+            if self._high_water is None or row.updated_at > self._high_water:
+                self._high_water = row.updated_at
+
+    def apply_notification(self, payload: str) -> None:
+        """Handler for INVENTORY_NOTIFY_CHANNEL: the changed rows as JSON, or
+        an empty payload when they didn't fit and a refresh is needed."""
+        if not payload:
+            self._refresh_requested.set()
+            return
+        self.apply(
+            InventoryChange(store_id, sku, on_hand, reserved, datetime.fromisoformat(updated_at))
+            for store_id, sku, on_hand, reserved, updated_at
+            in json.loads(payload, parse_float=Decimal, parse_int=Decimal)
+        )
+
+    async def refresh(self, db: AsyncSession) -> int:
+        rows = await list_inventory_changed_since(db, self._high_water, REFRESH_LOOKBACK_SECONDS)
+        self.apply(rows)
+        return len(rows)
+
+
+availability = AvailabilityCache()
+
+
+async def run_availability_refresher(session_factory, interval: float) -> None:
+    """Background loop picking up inventory changes made outside this process;
+    runs early when a notification was too large to carry the rows."""
+    while True:
+        try:
+            await asyncio.wait_for(availability._refresh_requested.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+        availability._refresh_requested.clear()
+        try:
+            async with session_factory() as db:
+                await availability.refresh(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("availability cache refresh failed")
+
+
+async def run_reservation_sweeper(session_factory, interval: float, ttl: float) -> None:
+    """Background loop releasing reservations of baskets idle for ``ttl`` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as db:
+                async with db.begin():
+                    rows = await release_abandoned_reservations(db, ttl)
+            availability.apply(rows)
+            if rows:
+                logger.info("released abandoned reservations on %d SKUs", len(rows))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("reservation sweep failed")
@@ -0,0 +1,19 @@
+# app/domain/inventory/schemas.py
+from decimal import Decimal
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
+
+class StockAdjustment(BaseModel):
+    sku_id: str
+    quantity_delta: Decimal
+    adjustment_type: Literal["RECEIVING", "SHRINKAGE", "MANUAL"] = "MANUAL"
+    reason: Optional[str] = Field(default=None, max_length=500)
+    reference_id: Optional[str] = None
+
+class StockLevelOut(BaseModel):
+    store_id: str
+    sku_id: str
+    on_hand: Decimal
+    reserved: Decimal
+    available_quantity: Decimal
+    in_stock: bool
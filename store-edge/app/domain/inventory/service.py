@@ -0,0 +1,42 @@
+# app/domain/inventory/service.py
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.repositories.inventory import adjust_stock
+from app.db.repositories.outbox import insert_inventory_adjusted
+from app.domain.errors import BusinessError
+from .availability import StockLevel, availability
+from .schemas import StockAdjustment, StockLevelOut
+
+def get_stock_level(store_id: str, sku: str) -> Optional[StockLevel]:
+    # cache only: the scan path never queries local_inventory
+    return availability.get(store_id, sku)
+
+def to_stock_level_out(store_id: str, sku: str, level: StockLevel) -> StockLevelOut:
+    return StockLevelOut(
+        store_id=store_id,
+        sku_id=sku,
+        on_hand=level.on_hand,
+        reserved=level.reserved,
+        available_quantity=level.available,
+        in_stock=level.available > 0,
+    )
+
+async def adjust_inventory(
+    db: AsyncSession,
+    store_id: str,
+    data: StockAdjustment,
+) -> StockLevelOut:
+    if data.quantity_delta == 0:
+        raise BusinessError("quantity_delta must not be zero")
+
+    row = await adjust_stock(db, store_id, data.sku_id, data.quantity_delta)
+    await insert_inventory_adjusted(
+        db, store_id, data.sku_id, data.adjustment_type, data.quantity_delta,
+        reason=data.reason, reference_id=data.reference_id,
+    )
+    await db.commit()
+
+    availability.apply([row])
+    return to_stock_level_out(store_id, data.sku_id, availability.get(store_id, data.sku_id))
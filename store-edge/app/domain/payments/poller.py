@@ -0,0 +1,174 @@
+# app/domain/payments/poller.py
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from app.db.models.payments import PaymentStatus
+from app.db.repositories.payments import (
+    PaymentStatusUpdate,
+    apply_status_updates,
+    list_active_payments,
+)
+from .providers import PaymentProvider, get_provider
+from .watchers import PaymentWatchers
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentPoller:
+    """Single background loop that drives every active payment forward.
+
+    Each tick reads all PENDING/AUTHORIZED payments in one query, asks each
+    provider for their statuses in batches (bounded by the provider's
+    concurrency limit), expires stale QR codes and writes every transition
+    in one UPDATE. Only payments that UPDATE moved to AUTHORIZED (or that
+    were already AUTHORIZED) are then captured, and the captures are
+    written in a second UPDATE before the long-poll requests waiting on
+    the changed payments are woken. Request handlers never talk to a
+    provider after the QR is issued.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        watchers: PaymentWatchers,
+        interval: float,
+        max_active: int = 1000,
+    ):
+        self._session_factory = session_factory
+        self._watchers = watchers
+        self.interval = interval
+        self.max_active = max_active
+        self._wakeup = asyncio.Event()
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("payment poll failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def poll_once(self) -> int:
+        """One tick; returns the number of payments whose status changed."""
+        async with self._session_factory() as db:
+            rows = await list_active_payments(db, self.max_active)
+        if not rows:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        updates: List[PaymentStatusUpdate] = []
+        by_provider: Dict[str, list] = defaultdict(list)
+        for row in rows:
+            if row.status == PaymentStatus.PENDING and row.expires_at is not None and row.expires_at <= now:
+                updates.append(PaymentStatusUpdate(row.id, PaymentStatus.FAILED, "EXPIRED", "QR code expired"))
+            elif row.provider_ref is not None:
+                by_provider[row.provider].append(row)
+            # no provider_ref yet: the create request is still waiting on the provider
+
+        results = await asyncio.gather(*(
+            self._check_provider(name, provider_rows) for name, provider_rows in by_provider.items()
+        ))
+        capture_ids = set()
+        for provider_updates, provider_captures in results:
+            updates.extend(provider_updates)
+            capture_ids.update(provider_captures)
+
+        # Authorizations are claimed in the DB before anything is captured:
+        # PENDING -> AUTHORIZED only applies to rows still PENDING, and a
+        # cancel only moves PENDING rows, so once the row says AUTHORIZED no
+        # cancel can land, and a row cancelled first is never captured.
+        changed = await self._apply(updates)
+        capture_ids.update(row.id for row in changed if row.status == PaymentStatus.AUTHORIZED)
+
+        captures = await asyncio.gather(*(
+            self._capture_all(name, [row for row in provider_rows if row.id in capture_ids])
+            for name, provider_rows in by_provider.items()
+        ))
+        captured = await self._apply([update for chunk in captures for update in chunk])
+
+        changed_ids = {row.id for row in changed} | {row.id for row in captured}
+        self._watchers.notify(changed_ids)
+        return len(changed_ids)
+
+    async def _apply(self, updates: List[PaymentStatusUpdate]) -> list:
+        if not updates:
+            return []
+        async with self._session_factory() as db:
+            async with db.begin():
+                return await apply_status_updates(db, updates)
+
+    async def _check_provider(self, name: str, rows: list) -> Tuple[List[PaymentStatusUpdate], List]:
+        """Status updates to write, and ids of already-AUTHORIZED rows to capture."""
+        provider = get_provider(name)
+        if provider is None:
+            logger.warning("no payment provider registered as %r, %d payments waiting", name, len(rows))
+            return [], []
+
+        limit = asyncio.Semaphore(max(1, provider.max_concurrency))
+        chunks = [rows[i:i + provider.max_batch] for i in range(0, len(rows), provider.max_batch)]
+        results = await asyncio.gather(*(self._check_chunk(provider, limit, chunk) for chunk in chunks))
+        updates = [update for chunk_updates, _ in results for update in chunk_updates]
+        captures = [payment_id for _, chunk_captures in results for payment_id in chunk_captures]
+        return updates, captures
+
+    async def _check_chunk(
+        self,
+        provider: PaymentProvider,
+        limit: asyncio.Semaphore,
+        rows: list,
+    ) -> Tuple[List[PaymentStatusUpdate], List]:
+        try:
+            async with limit:
+                statuses = await provider.get_statuses([row.provider_ref for row in rows])
+        except Exception:
+            logger.exception("status check against %s failed for %d payments", provider.name, len(rows))
+            return [], []
+
+        updates = []
+        captures = []
+        for row in rows:
+            reported = statuses.get(row.provider_ref)
+            if reported is None or reported.status == PaymentStatus.PENDING:
+                continue
+            if reported.status == PaymentStatus.AUTHORIZED and row.status == PaymentStatus.AUTHORIZED:
+                # claimed on an earlier tick whose capture failed
+                captures.append(row.id)
+            elif reported.status != row.status:
+                updates.append(PaymentStatusUpdate(
+                    row.id, reported.status, reported.error_code, reported.error_message,
+                ))
+        return updates, captures
+
+    async def _capture_all(self, name: str, rows: list) -> List[PaymentStatusUpdate]:
+        provider = get_provider(name)
+        if provider is None or not rows:
+            return []
+        limit = asyncio.Semaphore(max(1, provider.max_concurrency))
+        return list(await asyncio.gather(*(self._capture(provider, limit, row) for row in rows)))
+
+    async def _capture(
+        self,
+        provider: PaymentProvider,
+        limit: asyncio.Semaphore,
+        row,
+    ) -> PaymentStatusUpdate:
+        try:
+            async with limit:
+                await provider.capture(row.provider_ref)
+        except Exception as exc:
+            # stays AUTHORIZED; the next tick retries the capture
+            logger.warning("capture of payment %s via %s failed: %s", row.id, provider.name, exc)
+            return PaymentStatusUpdate(row.id, PaymentStatus.AUTHORIZED, "CAPTURE_FAILED", str(exc)[:500])
+        return PaymentStatusUpdate(row.id, PaymentStatus.CAPTURED)
@@ -0,0 +1,118 @@
+# app/domain/payments/providers.py
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+from app.db.models.payments import PaymentStatus
+
+
+@dataclass
+class QRCode:
+    provider_ref: str
+    payload: Dict[str, Any]
+    expires_at: Optional[datetime] = None
+
+
+@dataclass
+class ProviderStatus:
+    status: PaymentStatus
+    error_code: Optional[str] = None
+    error_message: Optional[str] = None
+
+
+class PaymentProvider(Protocol):
+    """QR payment provider as seen by the payment service and poller.
+
+    Status checks are batched: the poller hands over up to ``max_batch``
+    references per call and runs at most ``max_concurrency`` calls against
+    one provider at a time.
+    """
+
+    name: str
+    max_batch: int
+    max_concurrency: int
+
+    async def create_qr(self, payment_id: uuid.UUID, amount: Decimal, currency: str) -> QRCode: ...
+
+    async def get_statuses(self, provider_refs: List[str]) -> Dict[str, ProviderStatus]: ...
+
+    async def capture(self, provider_ref: str) -> None: ...
+
+    async def cancel(self, provider_ref: str) -> None: ...
+
+
+_providers: Dict[str, PaymentProvider] = {}
+
+
+def register_provider(provider: PaymentProvider) -> None:
+    _providers[provider.name] = provider
+
+
+def get_provider(name: Optional[str]) -> Optional[PaymentProvider]:
+    return _providers.get(name) if name else None
+
+
+@dataclass
+class FakePaymentProvider:
+    """Stateless provider for local runs and load tests.
+
+    Everything a status check needs is encoded in the reference: the issue
+    time (wall clock, so any worker of the edge reads it the same way) and
+    whether the payment is to be declined. A QR is "paid" ``approve_after``
+    seconds after it was issued; amounts whose cents equal
+    ``decline_cents`` (e.g. 25000.13) fail instead. Capture and cancel
+    always succeed and leave nothing to remember, the payments table is the
+    record of both.
+    """
+
+    name: str = "fake"
+    max_batch: int = 50
+    max_concurrency: int = 4
+    approve_after: float = 3.0
+    qr_ttl: float = 300.0
+    decline_cents: Optional[int] = 13
+
+    async def create_qr(self, payment_id: uuid.UUID, amount: Decimal, currency: str) -> QRCode:
+        outcome = "D" if self.decline_cents is not None and int(amount * 100) % 100 == self.decline_cents else "A"
+        ref = f"FAKE-{payment_id.hex[:16].upper()}-{int(time.time() * 1000):X}-{outcome}"
+        return QRCode(
+            provider_ref=ref,
+            payload={"qr": f"fakepay://{ref}?amount={amount}&ccy={currency}"},
+            expires_at=datetime.now(timezone.utc) + timedelta(seconds=self.qr_ttl),
+        )
+
+    async def get_statuses(self, provider_refs: List[str]) -> Dict[str, ProviderStatus]:
+        now = time.time()
+        statuses = {}
+        for ref in provider_refs:
+            parsed = _parse_fake_ref(ref)
+            if parsed is None:
+                statuses[ref] = ProviderStatus(PaymentStatus.FAILED, "UNKNOWN_REF", "unknown reference")
+                continue
+            issued_at, outcome = parsed
+            if now - issued_at < self.approve_after:
+                statuses[ref] = ProviderStatus(PaymentStatus.PENDING)
+            elif outcome == "D":
+                statuses[ref] = ProviderStatus(PaymentStatus.FAILED, "DECLINED", "payment declined")
+            else:
+                statuses[ref] = ProviderStatus(PaymentStatus.AUTHORIZED)
+        return statuses
+
+    async def capture(self, provider_ref: str) -> None:
+        pass
+
+    async def cancel(self, provider_ref: str) -> None:
+        pass
+
+
+def _parse_fake_ref(ref: str) -> Optional[Tuple[float, str]]:
+    parts = ref.split("-")
+    if len(parts) != 4 or parts[0] != "FAKE" or parts[3] not in ("A", "D"):
+        return None
+    try:
+        return int(parts[2], 16) / 1000, parts[3]
+    except ValueError:
+        return None
@@ -0,0 +1,32 @@
+# app/domain/payments/schemas.py
+from datetime import datetime
+from decimal import Decimal
+from pydantic import BaseModel
+from uuid import UUID
+from typing import Any, Dict, Optional
+
+from app.db.models.payments import PaymentStatus
+
+class PaymentCreate(BaseModel):
+    transaction_id: UUID
+    provider: str = "fake"
+
+class PaymentOut(BaseModel):
+    id: UUID
+    transaction_id: UUID
+    provider: Optional[str]
+    amount: Decimal
+    currency: str
+    status: PaymentStatus
+    provider_ref: Optional[str]
+    qr_payload: Optional[Dict[str, Any]]
+    expires_at: Optional[datetime]
+    requested_at: datetime
+    authorized_at: Optional[datetime]
+    captured_at: Optional[datetime]
+    failed_at: Optional[datetime]
+    error_code: Optional[str]
+    error_message: Optional[str]
+
+    class Config:
+        from_attributes = True
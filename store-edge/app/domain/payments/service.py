@@ -0,0 +1,131 @@
+# app/domain/payments/service.py
+import asyncio
+import logging
+from typing import Optional
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.models.payments import Payment, PaymentStatus
+from app.db.repositories.payments import (
+    PaymentStatusUpdate,
+    apply_status_updates,
+    get_payment,
+    insert_open_payment,
+    set_provider_details,
+)
+from app.db.repositories.transactions import get_transaction_by_id
+from app.domain.errors import BusinessError, NotFoundError
+from .providers import get_provider
+from .schemas import PaymentCreate
+from .watchers import PaymentWatchers
+
+logger = logging.getLogger(__name__)
+
+payment_watchers = PaymentWatchers()
+
+# must match the channel used by the payments_status_notify() trigger function
+PAYMENT_STATUS_NOTIFY_CHANNEL = "edge_payments"
+
+def on_payment_status_notify(payload: str) -> None:
+    """Handler for PAYMENT_STATUS_NOTIFY_CHANNEL: wakes this worker's long
+    polls on payments whose status changed in any process, usually the
+    poller running in the leader worker."""
+    payment_watchers.notify(UUID(payment_id) for payment_id in payload.split(",") if payment_id)
+
+async def create_payment(
+    db: AsyncSession,
+    data: PaymentCreate,
+) -> Payment:
+    provider = get_provider(data.provider)
+    if provider is None:
+        raise BusinessError(f"Unknown payment provider {data.provider}")
+
+    # line edits lock the header too, so the amount below is the total of
+    # the basket this payment freezes
+    txn = await get_transaction_by_id(db, data.transaction_id, for_update=True)
+    if txn is None:
+        raise NotFoundError("Transaction not found")
+    if txn.status != "DRAFT":
+        raise BusinessError(f"Transaction is {txn.status}, expected DRAFT")
+    if txn.line_count == 0:
+        raise BusinessError("Cannot pay for an empty transaction")
+
+    payment = await insert_open_payment(db, txn.id, provider.name, txn.total, txn.currency)
+    if payment is None:
+        raise BusinessError("Transaction already has a payment in progress")
+    # commit before calling out, so no pooled connection waits on the provider
+    await db.commit()
+
+    try:
+        qr = await asyncio.wait_for(
+            provider.create_qr(payment.id, payment.amount, payment.currency),
+            settings.PAYMENT_PROVIDER_TIMEOUT_SECONDS,
+        )
+    except Exception as exc:
+        logger.warning("QR creation via %s failed for payment %s: %r", provider.name, payment.id, exc)
+        await apply_status_updates(db, [PaymentStatusUpdate(
+            payment.id, PaymentStatus.FAILED, "PROVIDER_ERROR", str(exc)[:500] or type(exc).__name__,
+        )])
+        await db.commit()
+        return await get_payment(db, payment.id)
+
+    updated = await set_provider_details(db, payment.id, qr.provider_ref, qr.payload, qr.expires_at)
+    await db.commit()
+    # None only if the payment was cancelled while the QR was being issued
+    return updated or await get_payment(db, payment.id)
+
+async def get_payment_or_404(
+    db: AsyncSession,
+    payment_id: UUID,
+) -> Payment:
+    payment = await get_payment(db, payment_id)
+    if payment is None:
+        raise NotFoundError("Payment not found")
+    return payment
+
+async def wait_for_payment(
+    db: AsyncSession,
+    payment_id: UUID,
+    known_status: Optional[PaymentStatus],
+    timeout: float,
+) -> Payment:
+    """Long-poll: return once the status differs from ``known_status`` or on timeout.
+
+    The poller's notification wakes the request; no DB connection is held
+    while it waits.
+    """
+    with payment_watchers.watch(payment_id) as changed:
+        payment = await get_payment_or_404(db, payment_id)
+        if known_status is None or payment.status != known_status or timeout <= 0:
+            return payment
+        # closing returns the connection to the pool and detaches ``payment``
+        # with its loaded state, so it can still be returned on timeout
+        await db.close()
+        try:
+            await asyncio.wait_for(changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return payment
+    return await get_payment_or_404(db, payment_id)
+
+async def cancel_payment(
+    db: AsyncSession,
+    payment_id: UUID,
+) -> Payment:
+    payment = await get_payment_or_404(db, payment_id)
+    changed = await apply_status_updates(db, [PaymentStatusUpdate(
+        payment.id, PaymentStatus.CANCELLED, "CANCELLED", "cancelled at the terminal",
+    )])
+    await db.commit()
+    if not changed:
+        raise BusinessError(f"Payment is {payment.status.value}, only PENDING can be cancelled")
+
+    payment_watchers.notify([payment.id])
+    provider = get_provider(payment.provider)
+    if provider is not None and payment.provider_ref is not None:
+        try:
+            await provider.cancel(payment.provider_ref)
+        except Exception as exc:
+            # the QR expires on its own; a late authorization can't move CANCELLED
+            logger.warning("provider cancel of payment %s failed: %s", payment.id, exc)
+    return await get_payment_or_404(db, payment_id)
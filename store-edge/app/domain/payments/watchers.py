@@ -0,0 +1,43 @@
+# app/domain/payments/watchers.py
+import asyncio
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List
+from uuid import UUID
+
+
+class PaymentWatchers:
+    """Wakes long-poll requests waiting on a payment's status.
+
+    A request registers before reading the payment, so a change that lands
+    between the read and the wait still wakes it. All waiters of a payment
+    share one Event, replaced after each notification.
+    """
+
+    def __init__(self):
+        self._events: Dict[UUID, asyncio.Event] = {}
+        self._waiters: Dict[UUID, int] = {}
+
+    def __len__(self) -> int:
+        return sum(self._waiters.values())
+
+    @contextmanager
+    def watch(self, payment_id: UUID) -> Iterator[asyncio.Event]:
+        event = self._events.setdefault(payment_id, asyncio.Event())
+        self._waiters[payment_id] = self._waiters.get(payment_id, 0) + 1
+        try:
+            yield event
+        finally:
+            self._waiters[payment_id] -= 1
+            if self._waiters[payment_id] == 0:
+                del self._waiters[payment_id]
+                if self._events.get(payment_id) is event:
+                    del self._events[payment_id]
+
+    def notify(self, payment_ids: Iterable[UUID]) -> List[UUID]:
+        woken = []
+        for payment_id in payment_ids:
+            event = self._events.pop(payment_id, None)
+            if event is not None:
+                event.set()
+                woken.append(payment_id)
+        return woken
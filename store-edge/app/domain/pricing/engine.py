@@ -0,0 +1,124 @@
+# app/domain/pricing/engine.py
+import asyncio
+import logging
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List
+from uuid import UUID
+
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.repositories.promotions import get_promotion_version_stamp, list_active_promotions
+from app.db.repositories.transactions import apply_line_pricing, get_pricing_lines
+from app.domain.catalog.index import CatalogEntry, get_catalog_index, refresh_catalog_index
+from .rules import PricingRules, compile_rules, line_tax, money
+
+logger = logging.getLogger(__name__)
+
+_rules = PricingRules(stamp=(None, None), multi_buy={}, thresholds={})
+_refresh_requested = asyncio.Event()
+
+
+def get_pricing_rules() -> PricingRules:
+    return _rules
+
+
+async def refresh_pricing_rules(
+    db: AsyncSession,
+    force: bool = False,
+) -> PricingRules:
+    """Recompile when promotions or the catalog index changed since the last build.
+
+    Keyed by the catalog stamp as well because category promotions are
+    expanded to the SKUs in that category at compile time.
+    """
+    global _rules
+
+    index = get_catalog_index()
+    stamp = (index.stamp, await get_promotion_version_stamp(db))
+    if not force and stamp == _rules.stamp:
+        return _rules
+
+    promotions = await list_active_promotions(db)
+    _rules = compile_rules(promotions, index, stamp)
+    logger.info("pricing rules compiled: %d promotions, stamp=%s", len(promotions), stamp)
+    return _rules
+
+
+def request_pricing_refresh(payload: str = "") -> None:
+    """Handler for CATALOG_NOTIFY_CHANNEL: wake the refresher instead of
+    waiting for its next tick."""
+    _refresh_requested.set()
+
+
+async def run_pricing_rules_refresher(session_factory, interval: float) -> None:
+    """Background loop, run next to the catalog index refresher.
+
+    When woken by a catalog notification it rebuilds the index first, since
+    category promotions expand against it.
+    """
+    while True:
+        try:
+            await asyncio.wait_for(_refresh_requested.wait(), interval)
+            woken = True
+        except asyncio.TimeoutError:
+            woken = False
+        _refresh_requested.clear()
+        try:
+            async with session_factory() as db:
+                if woken:
+                    await refresh_catalog_index(db)
+                await refresh_pricing_rules(db)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("pricing rules refresh failed")
+
+
+def price_new_line(
+    transaction_id: UUID,
+    line_id: UUID,
+    entry: CatalogEntry,
+    quantity: Decimal,
+) -> Dict[str, Any]:
+    """LineItem values for a scan, priced from the catalog; promotions are
+    applied afterwards by ``reprice_basket``."""
+    line_total = money(entry.price * quantity)
+    return {
+        "id": line_id,
+        "transaction_id": transaction_id,
+        "sku": entry.sku,
+        "barcode": entry.barcode,
+        "name": entry.name,
+        "unit_price": entry.price,
+        "quantity": quantity,
+        "discount_amount": Decimal(0),
+        "tax_amount": line_tax(line_total, entry.tax_rate),
+        "tax_rate": entry.tax_rate,
+        "line_total": line_total,
+        "uom": entry.uom,
+    }
+
+
+async def reprice_basket(
+    db: AsyncSession,
+    transaction_id: UUID,
+    started_at: datetime,
+    store_id: str,
+) -> List[Row]:
+    """Re-evaluate promotions for the whole basket and write the lines whose
+    discount or tax moved; returns those lines. Header totals are left to
+    the caller."""
+    lines = await get_pricing_lines(db, transaction_id, started_at)
+    priced = get_pricing_rules().evaluate(store_id, lines, datetime.now(timezone.utc))
+    changed = [
+        (line.id, priced[line.id])
+        for line in lines
+        if (line.discount_amount, line.tax_amount, line.line_total) != (
+            priced[line.id].discount_amount, priced[line.id].tax_amount, priced[line.id].line_total,
+        )
+    ]
+    if not changed:
+        return []
+    return await apply_line_pricing(db, transaction_id, started_at, changed)
@@ -0,0 +1,187 @@
+# app/domain/pricing/rules.py
+from bisect import bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import ROUND_DOWN, ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.domain.catalog.index import CatalogEntry
+
+MULTI_BUY = "MULTI_BUY"
+BASKET_THRESHOLD = "BASKET_THRESHOLD"
+
+CENT = Decimal("0.01")
+ZERO = Decimal(0)
+
+
+def money(value: Decimal) -> Decimal:
+    # same rounding as Postgres ROUND(numeric, 2)
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def line_tax(net: Decimal, tax_rate: Optional[Decimal]) -> Decimal:
+    """Tax on a line's net amount; ``tax_rate`` is a percent (10.00)."""
+    if not tax_rate:
+        return ZERO
+    return money(net * tax_rate / 100)
+
+
+@dataclass(frozen=True, slots=True)
+class MultiBuyDeal:
+    code: str
+    buy_quantity: Decimal
+    bundle_price: Decimal
+    starts_at: Optional[datetime]
+    ends_at: Optional[datetime]
+
+    def live(self, now: datetime) -> bool:
+        return (self.starts_at is None or self.starts_at <= now) and (self.ends_at is None or now < self.ends_at)
+
+
+@dataclass(frozen=True, slots=True)
+class ThresholdTier:
+    code: str
+    min_subtotal: Decimal
+    discount_amount: Optional[Decimal]
+    discount_percent: Optional[Decimal]
+    starts_at: Optional[datetime]
+    ends_at: Optional[datetime]
+
+    def live(self, now: datetime) -> bool:
+        return (self.starts_at is None or self.starts_at <= now) and (self.ends_at is None or now < self.ends_at)
+
+    def discount_for(self, subtotal: Decimal) -> Decimal:
+        if self.discount_amount is not None:
+            return min(self.discount_amount, subtotal)
+        return money(subtotal * (self.discount_percent or ZERO) / 100)
+
+
+@dataclass(frozen=True, slots=True)
+class LinePricing:
+    discount_amount: Decimal
+    tax_amount: Decimal
+    line_total: Decimal
+
+
+class PricingRules:
+    """Promotions compiled into lookup tables for one (catalog, promotions) stamp.
+
+    Multi-buy deals are expanded to a per-(store, sku) tuple, largest bundle
+    first, so category rules cost nothing extra at evaluation time; basket
+    thresholds are a per-store list sorted by ``min_subtotal``. Like the
+    catalog index it is immutable and replaced wholesale on refresh.
+    """
+
+    __slots__ = ("stamp", "_multi_buy", "_thresholds", "_threshold_keys")
+
+    def __init__(
+        self,
+        stamp: Tuple,
+        multi_buy: Dict[Tuple[str, str], Tuple[MultiBuyDeal, ...]],
+        thresholds: Dict[str, Tuple[ThresholdTier, ...]],
+    ):
+        self.stamp = stamp
+        self._multi_buy = multi_buy
+        self._thresholds = thresholds
+        self._threshold_keys = {
+            store_id: [tier.min_subtotal for tier in tiers] for store_id, tiers in thresholds.items()
+        }
+
+    def affects(self, store_id: str, skus: Iterable[str]) -> bool:
+        """Whether a basket change touching ``skus`` can move any discount."""
+        if store_id in self._thresholds:
+            return True
+        return any((store_id, sku) in self._multi_buy for sku in skus)
+
+    def evaluate(self, store_id: str, lines: Sequence, now: datetime) -> Dict[object, LinePricing]:
+        """Discount, tax and total for every line of a basket, in O(lines).
+
+        ``lines`` need id, sku, quantity, unit_price and tax_rate. Multi-buy
+        discounts are spread over the SKU's lines, then the best reached
+        basket threshold is spread over all lines by net amount.
+        """
+        gross = {line.id: money(line.unit_price * line.quantity) for line in lines}
+        discounts = {line.id: ZERO for line in lines}
+
+        by_sku: Dict[str, list] = defaultdict(list)
+        for line in lines:
+            if (store_id, line.sku) in self._multi_buy:
+                by_sku[line.sku].append(line)
+        for sku, sku_lines in by_sku.items():
+            remaining = sum((line.quantity for line in sku_lines), ZERO)
+            unit_price = sku_lines[0].unit_price
+            discount = ZERO
+            for deal in self._multi_buy[(store_id, sku)]:
+                if not deal.live(now):
+                    continue
+                bundles = remaining // deal.buy_quantity
+                saving = deal.buy_quantity * unit_price - deal.bundle_price
+                if bundles > 0 and saving > 0:
+                    discount += money(bundles * saving)
+                    remaining -= bundles * deal.buy_quantity
+            _allocate(discount, sku_lines, gross, discounts)
+
+        tiers = self._thresholds.get(store_id)
+        if tiers:
+            net = {line.id: gross[line.id] - discounts[line.id] for line in lines}
+            subtotal = sum(net.values(), ZERO)
+            # walk down from the highest tier the subtotal reaches
+            for i in range(bisect_right(self._threshold_keys[store_id], subtotal) - 1, -1, -1):
+                if tiers[i].live(now):
+                    _allocate(tiers[i].discount_for(subtotal), lines, net, discounts)
+                    break
+
+        priced = {}
+        for line in lines:
+            line_total = gross[line.id] - discounts[line.id]
+            priced[line.id] = LinePricing(discounts[line.id], line_tax(line_total, line.tax_rate), line_total)
+        return priced
+
+
+def _allocate(amount: Decimal, lines: Sequence, weights: Dict, discounts: Dict) -> None:
+    """Split ``amount`` over ``lines`` pro rata to ``weights``; the last line takes the rounding."""
+    total = sum((weights[line.id] for line in lines), ZERO)
+    if amount <= 0 or total <= 0:
+        return
+    left = amount
+    for line in lines[:-1]:
+        share = (amount * weights[line.id] / total).quantize(CENT, rounding=ROUND_DOWN)
+        discounts[line.id] += share
+        left -= share
+    discounts[lines[-1].id] += left
+
+
+def compile_rules(
+    promotions: Iterable,
+    catalog: Iterable[CatalogEntry],
+    stamp: Tuple,
+) -> PricingRules:
+    multi_buy: Dict[Tuple[str, str], List[MultiBuyDeal]] = defaultdict(list)
+    thresholds: Dict[str, List[ThresholdTier]] = defaultdict(list)
+    by_category: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+    for entry in catalog:
+        if entry.category:
+            by_category[(entry.store_id, entry.category)].append(entry.sku)
+
+    for promo in promotions:
+        if promo.kind == MULTI_BUY:
+            if not promo.buy_quantity or promo.bundle_price is None:
+                continue
+            deal = MultiBuyDeal(promo.code, promo.buy_quantity, promo.bundle_price, promo.starts_at, promo.ends_at)
+            skus = [promo.sku] if promo.sku else by_category.get((promo.store_id, promo.category), [])
+            for sku in skus:
+                multi_buy[(promo.store_id, sku)].append(deal)
+        elif promo.kind == BASKET_THRESHOLD:
+            if promo.min_subtotal is None or (promo.discount_amount is None and promo.discount_percent is None):
+                continue
+            thresholds[promo.store_id].append(ThresholdTier(
+                promo.code, promo.min_subtotal, promo.discount_amount, promo.discount_percent,
+                promo.starts_at, promo.ends_at,
+            ))
+
+    return PricingRules(
+        stamp,
+        {key: tuple(sorted(deals, key=lambda d: d.buy_quantity, reverse=True)) for key, deals in multi_buy.items()},
+        {store_id: tuple(sorted(tiers, key=lambda t: t.min_subtotal)) for store_id, tiers in thresholds.items()},
+    )
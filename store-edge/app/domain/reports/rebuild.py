@@ -0,0 +1,55 @@
+# app/domain/reports/rebuild.py
+"""Rebuild the sales rollups for a range of store-local business days.
+
+    python -m app.domain.reports.rebuild --from 2026-02-01 --to 2026-02-28
+
+Each day is recomputed from transactions/line_items and committed on its
+own; live finalizes for a day wait while that day is being rebuilt.
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date, timedelta
+
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal, engine
+from app.db.repositories.reports import rebuild_rollups
+from .service import business_day_range
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild(store_id: str, first: date, last: date) -> int:
+    days = 0
+    day = first
+    while day <= last:
+        start, end = business_day_range(day)
+        async with AsyncSessionLocal() as db:
+            async with db.begin():
+                await rebuild_rollups(db, store_id, start, end)
+        logger.info("rebuilt sales rollups for %s %s", store_id, day)
+        day += timedelta(days=1)
+        days += 1
+    return days
+
+
+async def main(args: argparse.Namespace) -> None:
+    try:
+        days = await rebuild(args.store_id, args.first, args.last or args.first)
+    finally:
+        await engine.dispose()
+    print(f"rebuilt {days} day(s) of sales rollups for {args.store_id}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--from", dest="first", type=date.fromisoformat, required=True)
+    parser.add_argument("--to", dest="last", type=date.fromisoformat,
+                        help="last day, inclusive (default: same as --from)")
+    parser.add_argument("--store-id", default=settings.STORE_ID)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(parse_args()))
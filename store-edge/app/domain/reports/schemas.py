@@ -0,0 +1,41 @@
+# app/domain/reports/schemas.py
+from datetime import date, datetime
+from decimal import Decimal
+from pydantic import BaseModel
+from typing import List, Optional
+
+class HourlySalesOut(BaseModel):
+    hour: datetime
+    txn_count: int
+    subtotal: Decimal
+    tax_amount: Decimal
+    total: Decimal
+
+class SkuSalesOut(BaseModel):
+    sku_id: str
+    quantity: Decimal
+    revenue: Decimal
+    tax_amount: Decimal
+    txn_count: int
+
+class CashierSalesOut(BaseModel):
+    cashier_id: Optional[str]
+    txn_count: int
+    subtotal: Decimal
+    tax_amount: Decimal
+    total: Decimal
+
+class SalesByHourReport(BaseModel):
+    store_id: str
+    business_date: date
+    hours: List[HourlySalesOut]
+
+class TopSkusReport(BaseModel):
+    store_id: str
+    business_date: date
+    items: List[SkuSalesOut]
+
+class CashierTotalsReport(BaseModel):
+    store_id: str
+    business_date: date
+    cashiers: List[CashierSalesOut]
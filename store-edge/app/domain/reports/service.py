@@ -0,0 +1,102 @@
+# app/domain/reports/service.py
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.repositories.reports import cashier_totals, sales_by_hour, top_skus
+from .schemas import (
+    CashierSalesOut,
+    CashierTotalsReport,
+    HourlySalesOut,
+    SalesByHourReport,
+    SkuSalesOut,
+    TopSkusReport,
+)
+
+# Reports read only the sales_hourly/sales_hourly_sku rollups; a business day
+# is a range of whole UTC-hour buckets, which holds for whole-hour time zones.
+
+def business_day_range(day: date, tz_name: Optional[str] = None) -> Tuple[datetime, datetime]:
+    """[start, end) of a store-local calendar day as aware datetimes."""
+    tz = ZoneInfo(tz_name or settings.STORE_TIMEZONE)
+    start = datetime.combine(day, time.min, tzinfo=tz)
+    end = datetime.combine(day + timedelta(days=1), time.min, tzinfo=tz)
+    return start, end
+
+def today_in_store() -> date:
+    return datetime.now(ZoneInfo(settings.STORE_TIMEZONE)).date()
+
+async def get_sales_by_hour(
+    db: AsyncSession,
+    store_id: str,
+    day: date,
+    terminal_id: Optional[str] = None,
+) -> SalesByHourReport:
+    start, end = business_day_range(day)
+    tz = start.tzinfo
+    rows = await sales_by_hour(db, store_id, start, end, terminal_id)
+    return SalesByHourReport(
+        store_id=store_id,
+        business_date=day,
+        hours=[
+            HourlySalesOut(
+                hour=row.hour.astimezone(tz),
+                txn_count=row.txn_count,
+                subtotal=row.subtotal,
+                tax_amount=row.tax_amount,
+                total=row.total,
+            )
+            for row in rows
+        ],
+    )
+
+async def get_top_skus(
+    db: AsyncSession,
+    store_id: str,
+    day: date,
+    limit: int,
+    terminal_id: Optional[str] = None,
+) -> TopSkusReport:
+    start, end = business_day_range(day)
+    rows = await top_skus(db, store_id, start, end, limit, terminal_id)
+    return TopSkusReport(
+        store_id=store_id,
+        business_date=day,
+        items=[
+            SkuSalesOut(
+                sku_id=row.sku,
+                quantity=row.quantity,
+                revenue=row.revenue,
+                tax_amount=row.tax_amount,
+                txn_count=row.txn_count,
+            )
+            for row in rows
+        ],
+    )
+
+async def get_cashier_totals(
+    db: AsyncSession,
+    store_id: str,
+    day: date,
+    terminal_id: Optional[str] = None,
+) -> CashierTotalsReport:
+    start, end = business_day_range(day)
+    rows = await cashier_totals(db, store_id, start, end, terminal_id)
+    return CashierTotalsReport(
+        store_id=store_id,
+        business_date=day,
+        cashiers=[
+            CashierSalesOut(
+                # '' is the rollup key for sales without a cashier
+                cashier_id=row.cashier_id or None,
+                txn_count=row.txn_count,
+                subtotal=row.subtotal,
+                tax_amount=row.tax_amount,
+                total=row.total,
+            )
+            for row in rows
+        ],
+    )
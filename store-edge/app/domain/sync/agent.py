@@ -0,0 +1,165 @@
+# app/domain/sync/agent.py
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from .catalog_sync import CatalogSync
+from .hq_client import HQClient
+from .relay import OutboxRelay
+
+logger = logging.getLogger(__name__)
+
+ONLINE = "ONLINE"
+OFFLINE = "OFFLINE"
+UNKNOWN = "UNKNOWN"
+
+
+@dataclass
+class SyncState:
+    status: str = UNKNOWN
+    consecutive_failures: int = 0
+    last_ok_at: Optional[datetime] = None
+    last_change_at: Optional[datetime] = None
+    catching_up: bool = False
+
+    def as_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "consecutive_failures": self.consecutive_failures,
+            "last_ok_at": self.last_ok_at.isoformat() if self.last_ok_at else None,
+            "last_change_at": self.last_change_at.isoformat() if self.last_change_at else None,
+            "catching_up": self.catching_up,
+        }
+
+
+class SyncAgent:
+    """Tracks HQ reachability and schedules relay drains and catalog pulls.
+
+    HQ is pinged every ``ping_interval`` seconds; ``offline_after`` failed
+    pings in a row flip the state to OFFLINE, pause the relay and stretch
+    the ping interval exponentially up to ``max_backoff``. The first good
+    ping after an outage drains the outbox backlog with
+    ``catchup_max_in_flight`` parallel batches capped at
+    ``catchup_rate`` events/second, then pulls the catalog.
+    Request handlers only ever read ``state``; they never touch the network.
+    """
+
+    def __init__(
+        self,
+        client: HQClient,
+        relay: OutboxRelay,
+        catalog_sync: CatalogSync,
+        ping_interval: float,
+        offline_after: int,
+        max_backoff: float,
+        catalog_interval: float,
+        catchup_max_in_flight: int,
+        catchup_rate: Optional[float],
+    ):
+        self._client = client
+        self._relay = relay
+        self._catalog_sync = catalog_sync
+        self.ping_interval = ping_interval
+        self.offline_after = offline_after
+        self.max_backoff = max_backoff
+        self.catalog_interval = catalog_interval
+        self.catchup_max_in_flight = catchup_max_in_flight
+        self.catchup_rate = catchup_rate
+        self.state = SyncState()
+        self._catchup_task: Optional[asyncio.Task] = None
+        self._ping_now = asyncio.Event()
+        relay.on_publish_failure = self._on_relay_failure
+
+    @property
+    def is_online(self) -> bool:
+        return self.state.status != OFFLINE
+
+    async def run(self) -> None:
+        catalog_loop = asyncio.create_task(self._catalog_loop())
+        try:
+            while True:
+                ok = False
+                try:
+                    ok = await self._client.ping()
+                except Exception:
+                    logger.debug("HQ ping raised", exc_info=True)
+                if ok:
+                    self._mark_success()
+                else:
+                    self._mark_failure()
+
+                self._ping_now.clear()
+                try:
+                    await asyncio.wait_for(self._ping_now.wait(), self._next_ping_delay())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            catalog_loop.cancel()
+            tasks = [catalog_loop]
+            if self._catchup_task is not None:
+                self._catchup_task.cancel()
+                tasks.append(self._catchup_task)
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _next_ping_delay(self) -> float:
+        if self.state.status != OFFLINE:
+            return self.ping_interval
+        excess = self.state.consecutive_failures - self.offline_after
+        return min(self.max_backoff, self.ping_interval * 2 ** max(0, excess))
+
+    def _mark_success(self) -> None:
+        was_offline = self.state.status == OFFLINE
+        self.state.consecutive_failures = 0
+        self.state.last_ok_at = datetime.now(timezone.utc)
+        if self.state.status != ONLINE:
+            self._transition(ONLINE)
+            self._relay.set_online(True)
+        if was_offline and (self._catchup_task is None or self._catchup_task.done()):
+            self._catchup_task = asyncio.create_task(self._catch_up())
+
+    def _mark_failure(self) -> None:
+        self.state.consecutive_failures += 1
+        if self.state.status != OFFLINE and self.state.consecutive_failures >= self.offline_after:
+            self._transition(OFFLINE)
+            self._relay.set_online(False)
+
+    def _on_relay_failure(self, exc: Exception) -> None:
+        # a failed publish is a hint HQ may be gone; confirm with a ping right away
+        self._ping_now.set()
+
+    def _transition(self, status: str) -> None:
+        logger.warning("HQ connectivity %s -> %s", self.state.status, status)
+        self.state.status = status
+        self.state.last_change_at = datetime.now(timezone.utc)
+
+    async def _catch_up(self) -> None:
+        self.state.catching_up = True
+        try:
+            sent = await self._relay.drain(
+                max_in_flight=self.catchup_max_in_flight,
+                rate_limit=self.catchup_rate,
+            )
+            logger.info("catch-up drained %d outbox events", sent)
+            await self._catalog_sync.sync_once()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("catch-up after reconnect failed")
+            self._ping_now.set()
+        finally:
+            self.state.catching_up = False
+
+    async def _catalog_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.catalog_interval)
+            if not self.is_online:
+                continue
+            try:
+                await self._catalog_sync.sync_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("catalog sync failed")
+                self._ping_now.set()
@@ -0,0 +1,202 @@
+# app/domain/sync/catalog_sync.py
+import json
+import logging
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import select, text
+
+from app.db.models.sync_cursors import SyncCursor
+from app.domain.catalog.index import refresh_catalog_index
+from app.domain.pricing.engine import refresh_pricing_rules
+from .hq_client import HQClient
+
+logger = logging.getLogger(__name__)
+
+CATALOG_STREAM = "catalog"
+
+STAGE_COLUMNS = (
+    "seq", "sku", "barcode", "name", "category", "price", "tax_rate", "uom", "active", "version", "deleted",
+)
+
+# seq is the item's position in the delta, the tie-break between two changes
+# of one SKU at the same version
+CREATE_STAGE_SQL = text("""
+    CREATE TEMP TABLE catalog_stage (
+        seq integer NOT NULL,
+        sku text NOT NULL,
+        barcode text,
+        name text,
+        category text,
+        price numeric(18, 2),
+        tax_rate numeric(5, 2),
+        uom text,
+        active boolean NOT NULL,
+        version integer NOT NULL,
+        deleted boolean NOT NULL
+    ) ON COMMIT DROP
+""")
+
+# A delta may carry several changes of one SKU; only the newest is applied,
+# since ON CONFLICT can't touch a row twice and UPDATE ... FROM would pick
+# an arbitrary one.
+LATEST_STAGE_CTE = """
+    WITH s AS (
+        SELECT DISTINCT ON (sku) *
+        FROM catalog_stage
+        ORDER BY sku, version DESC, seq DESC
+    )
+"""
+
+# Version guard: an older delta replayed after a newer one is a no-op.
+UPSERT_FROM_STAGE_SQL = text(f"""
+    {LATEST_STAGE_CTE}
+    INSERT INTO local_catalog (
+        id, store_id, sku, barcode, name, category, price, tax_rate, uom,
+        active, version, created_at, updated_at
+    )
+    SELECT gen_random_uuid(), :store_id, s.sku, s.barcode, s.name, s.category, s.price,
+           s.tax_rate, COALESCE(s.uom, 'EA'), s.active, s.version, now(), now()
+    FROM s
+    WHERE NOT s.deleted
+    ON CONFLICT (store_id, sku) DO UPDATE
+    SET barcode = EXCLUDED.barcode,
+        name = EXCLUDED.name,
+        category = EXCLUDED.category,
+        price = EXCLUDED.price,
+        tax_rate = EXCLUDED.tax_rate,
+        uom = EXCLUDED.uom,
+        active = EXCLUDED.active,
+        version = EXCLUDED.version,
+        updated_at = now()
+    WHERE local_catalog.version < EXCLUDED.version
+""")
+
+# Deletes are soft: historic line items and reports still resolve the SKU.
+DEACTIVATE_FROM_STAGE_SQL = text(f"""
+    {LATEST_STAGE_CTE}
+    UPDATE local_catalog c
+    SET active = false,
+        version = s.version,
+        updated_at = now()
+    FROM s
+    WHERE s.deleted
+      AND c.store_id = :store_id
+      AND c.sku = s.sku
+      AND c.version < s.version
+""")
+
+SAVE_CURSOR_SQL = text("""
+    INSERT INTO sync_cursors (id, stream_name, last_synced_at, metadata)
+    VALUES (:id, :stream_name, now(), CAST(:metadata AS jsonb))
+    ON CONFLICT (stream_name) DO UPDATE
+    SET last_synced_at = now(),
+        metadata = EXCLUDED.metadata,
+        updated_at = now()
+""")
+
+
+def _to_decimal(value) -> Optional[Decimal]:
+    return None if value is None else Decimal(str(value))
+
+
+def to_stage_record(seq: int, item: Dict[str, Any], current_version: int) -> Tuple:
+    """Row of catalog_stage for one delta item.
+
+    Raises ValueError for an upsert missing the name or price, which
+    local_catalog requires.
+    """
+    deleted = item.get("change_type") == "DELETED"
+    if not deleted and (item.get("product_name") is None or item.get("base_price") is None):
+        raise ValueError(f"catalog item {item.get('sku_id')} has no product_name or base_price")
+    tax_rate = _to_decimal(item.get("tax_rate"))
+    if tax_rate is not None:
+        # HQ publishes fractions (0.10); local_catalog.tax_rate holds percent (10.00)
+        tax_rate = tax_rate * 100
+    return (
+        seq,
+        item["sku_id"],
+        item.get("barcode"),
+        item.get("product_name"),
+        item.get("category"),
+        _to_decimal(item.get("base_price")),
+        tax_rate,
+        item.get("uom"),
+        bool(item.get("is_active", True)) and not deleted,
+        int(item.get("version", current_version)),
+        deleted,
+    )
+
+
+class CatalogSync:
+    """Pulls catalog deltas from HQ and applies them to local_catalog in bulk.
+
+    A delta is COPY-ed into a temp table and merged with one upsert and one
+    soft-delete UPDATE, so the whole apply is a handful of statements no
+    matter how many SKUs changed.
+    """
+
+    def __init__(self, session_factory, client: HQClient, store_id: str):
+        self._session_factory = session_factory
+        self._client = client
+        self.store_id = store_id
+
+    async def sync_once(self) -> int:
+        async with self._session_factory() as db:
+            since_version = await self._load_version(db)
+
+        snapshot = await self._client.fetch_catalog_snapshot(self.store_id, since_version)
+        current_version = int(snapshot.get("current_version", since_version))
+        items = snapshot.get("items", [])
+        if not items and current_version == since_version:
+            return 0
+
+        async with self._session_factory() as db:
+            async with db.begin():
+                await self.apply_delta(db, items, current_version)
+            await refresh_catalog_index(db)
+            # category promotions expand against the new catalog
+            await refresh_pricing_rules(db)
+
+        logger.info("catalog synced: %d changes, version %d -> %d",
+                    len(items), since_version, current_version)
+        return len(items)
+
+    async def apply_delta(
+        self,
+        db: AsyncSession,
+        items: List[Dict[str, Any]],
+        current_version: int,
+    ) -> None:
+        records: List[Tuple] = []
+        for seq, item in enumerate(items):
+            try:
+                records.append(to_stage_record(seq, item, current_version))
+            except ValueError as exc:
+                # the cursor still moves past it; HQ sends the SKU again on its next edit
+                logger.warning("skipping catalog change: %s", exc)
+
+        if records:
+            await db.execute(CREATE_STAGE_SQL)
+            conn = await db.connection()
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                "catalog_stage", records=records, columns=STAGE_COLUMNS,
+            )
+            await db.execute(UPSERT_FROM_STAGE_SQL, {"store_id": self.store_id})
+            await db.execute(DEACTIVATE_FROM_STAGE_SQL, {"store_id": self.store_id})
+
+        await db.execute(SAVE_CURSOR_SQL, {
+            "id": uuid.uuid4(),
+            "stream_name": CATALOG_STREAM,
+            "metadata": json.dumps({"catalog_version": current_version}),
+        })
+
+    async def _load_version(self, db: AsyncSession) -> int:
+        result = await db.execute(
+            select(SyncCursor.meta).where(SyncCursor.stream_name == CATALOG_STREAM)
+        )
+        meta = result.scalar_one_or_none() or {}
+        return int(meta.get("catalog_version", 0))
@@ -0,0 +1,105 @@
+# app/domain/sync/encoding.py
+"""Wire encoding for edge -> HQ event batches.
+
+The columnar format groups events by event_type, factors out fields that
+are constant within a group (store_id, aggregate_type, payload currency)
+and stores the rest as per-field arrays, with each event's position in the
+batch in "seq" so the receiver can restore the relay's order. Timestamps
+are integer microseconds since the epoch. The document is serialized with msgpack and
+compresses with zstd (gzip if zstandard is not installed). Plain JSON is
+kept as the fallback for HQs or environments without msgpack.
+"""
+import gzip
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+JSON_CONTENT_TYPE = "application/json"
+COLUMNAR_CONTENT_TYPE = "application/vnd.pos.events+msgpack"
+COLUMNAR_VERSION = 1
+
+# event-level fields factored out when constant across a group
+SHARED_FIELDS = ("store_id", "aggregate_type")
+# payload keys factored out when constant across a group
+SHARED_PAYLOAD_KEYS = ("currency",)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _timestamp_us(value: str) -> int:
+    # integer arithmetic: a float of microseconds since 1970 can't hold them exactly
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return (dt - EPOCH) // timedelta(microseconds=1)
+
+
+def _columnar_groups(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    by_type: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {}
+    for seq, event in enumerate(events):
+        by_type.setdefault(event["event_type"], []).append((seq, event))
+
+    groups = []
+    for event_type, indexed in by_type.items():
+        members = [event for _, event in indexed]
+        group: Dict[str, Any] = {"event_type": event_type, "shared": {}, "shared_payload": {}}
+        group["seq"] = [seq for seq, _ in indexed]
+
+        for name in SHARED_FIELDS:
+            values = {e.get(name) for e in members}
+            if len(values) == 1:
+                group["shared"][name] = values.pop()
+            else:
+                group[name] = [e.get(name) for e in members]
+
+        payloads = [dict(e["payload"]) for e in members]
+        for key in SHARED_PAYLOAD_KEYS:
+            if all(key in p for p in payloads) and len({p[key] for p in payloads}) == 1:
+                group["shared_payload"][key] = payloads[0][key]
+                for p in payloads:
+                    del p[key]
+
+        group["event_id"] = [uuid.UUID(e["event_id"]).bytes for e in members]
+        group["aggregate_id"] = [e.get("aggregate_id") for e in members]
+        group["timestamp_us"] = [_timestamp_us(e["timestamp"]) for e in members]
+        group["payload"] = payloads
+        groups.append(group)
+    return groups
+
+
+def _compress(body: bytes, compression: str) -> Tuple[bytes, Dict[str, str]]:
+    if compression == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(body), {"Content-Encoding": "zstd"}
+    if compression in ("zstd", "gzip"):
+        return gzip.compress(body, compresslevel=6), {"Content-Encoding": "gzip"}
+    return body, {}
+
+
+def encode_batch(
+    events: List[Dict[str, Any]],
+    wire_format: str = "columnar",
+    compression: str = "zstd",
+) -> Tuple[bytes, Dict[str, str]]:
+    """Encode relay wire events; returns (body, HTTP headers)."""
+    if wire_format == "columnar" and msgpack is not None:
+        doc = {"v": COLUMNAR_VERSION, "groups": _columnar_groups(events)}
+        body = msgpack.packb(doc, use_bin_type=True)
+        headers = {"Content-Type": COLUMNAR_CONTENT_TYPE}
+    else:
+        body = json.dumps({"events": events}, separators=(",", ":")).encode()
+        headers = {"Content-Type": JSON_CONTENT_TYPE}
+
+    body, encoding_headers = _compress(body, compression)
+    headers.update(encoding_headers)
+    return body, headers
@@ -0,0 +1,296 @@
+# app/domain/sync/relay.py
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.sql import text
+
+from app.db.repositories.outbox import (
+    ack_outbox_events,
+    claim_outbox_batch,
+    nack_outbox_events,
+    next_outbox_attempt_at,
+)
+from .hq_client import HQClient
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_STREAM = "outbox_relay"
+# must match the channel used by the outbox_notify() trigger function
+OUTBOX_NOTIFY_CHANNEL = "outbox_events"
+
+# Batches are claimed by next_attempt_at, so a backed-off or leased event can
+# sit below ids that are already published. The cursor only moves up to the
+# lowest unpublished id - 1: everything at or below it has reached HQ, which
+# keeps it safe to replay from. Reads the pending partial index only.
+ADVANCE_CURSOR_SQL = text("""
+    INSERT INTO sync_cursors (id, stream_name, last_outbox_id, last_synced_at)
+    SELECT :id, :stream_name, COALESCE(min(id) - 1, CAST(:last_outbox_id AS bigint)), now()
+    FROM outbox
+    WHERE published_at IS NULL
+    ON CONFLICT (stream_name) DO UPDATE
+    SET last_outbox_id = GREATEST(COALESCE(sync_cursors.last_outbox_id, 0), EXCLUDED.last_outbox_id),
+        last_synced_at = now(),
+        updated_at = now()
+""")
+
+
+class PublishFailed(Exception):
+    pass
+
+
+class RateLimiter:
+    """Token bucket capping events/second during catch-up drains."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, n: int) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                # a batch larger than the bucket only waits for a full bucket
+                needed = min(n, self.rate)
+                if self._tokens >= needed:
+                    self._tokens -= needed
+                    return
+                await asyncio.sleep((needed - self._tokens) / self.rate)
+
+
+def to_wire_event(row) -> Dict[str, Any]:
+    return {
+        "event_id": str(row.event_id),
+        "event_type": row.event_type,
+        "aggregate_type": row.aggregate_type,
+        "aggregate_id": row.aggregate_id,
+        "store_id": row.store_id,
+        "timestamp": row.occurred_at.isoformat(),
+        "payload": row.payload,
+    }
+
+
+class OutboxRelay:
+    """Drains unpublished outbox rows to HQ in batches.
+
+    Each batch is leased for ``claim_lease`` seconds (FOR UPDATE SKIP LOCKED,
+    committed straight away), sent as one request outside any DB
+    transaction, then acknowledged with one bulk UPDATE plus a cursor
+    advance. Up to ``max_in_flight`` batches are worked concurrently; the
+    lease keeps them disjoint. A failed batch is rescheduled per event
+    (next_attempt_at) and skipped until it is due. A batch whose lease runs
+    out before the ack is sent again; HQ drops the duplicates by event_id.
+
+    When an engine is given the relay LISTENs on the outbox trigger channel
+    and sleeps until notified, polling only every ``fallback_poll_interval``
+    as a safety net (or every ``poll_interval`` if LISTEN is unavailable).
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        client: HQClient,
+        batch_size: int,
+        max_in_flight: int,
+        poll_interval: float,
+        max_backoff: float,
+        engine=None,
+        fallback_poll_interval: float = 30.0,
+        coalesce_window: float = 0.05,
+        retry_base_delay: float = 1.0,
+        claim_lease: float = 60.0,
+    ):
+        self._session_factory = session_factory
+        self._client = client
+        self.batch_size = batch_size
+        self.max_in_flight = max_in_flight
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.fallback_poll_interval = fallback_poll_interval
+        self.coalesce_window = coalesce_window
+        self.retry_base_delay = retry_base_delay
+        self.claim_lease = claim_lease
+        self._engine = engine
+        self._listen_conn = None
+        self._wakeup = asyncio.Event()
+        self._online = asyncio.Event()
+        self._online.set()
+        self._failures = 0
+        self.on_publish_failure: Optional[Callable[[Exception], None]] = None
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def set_online(self, online: bool) -> None:
+        """Pause/resume publishing; the sync agent calls this on HQ state changes."""
+        if online:
+            self._online.set()
+            self._wakeup.set()
+        else:
+            self._online.clear()
+
+    async def run(self) -> None:
+        try:
+            while True:
+                if self._engine is not None and not self._is_listening():
+                    await self._listen()
+                # while HQ is known to be down, don't spend requests discovering it again
+                await self._online.wait()
+
+                # clear before draining so notifications that land mid-drain
+                # trigger exactly one more pass
+                self._wakeup.clear()
+                try:
+                    await self.drain()
+                    self._failures = 0
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    self._failures += 1
+                    if self.on_publish_failure is not None:
+                        self.on_publish_failure(exc)
+                    delay = min(self.max_backoff, 2 ** (self._failures - 1))
+                    logger.warning("outbox relay failed (attempt %d), retrying in %.0fs: %s",
+                                   self._failures, delay, exc)
+                    await asyncio.sleep(delay)
+                    continue
+
+                await self._wait_for_wakeup()
+        finally:
+            await self._unlisten()
+
+    async def _wait_for_wakeup(self) -> None:
+        timeout = self.fallback_poll_interval if self._is_listening() else self.poll_interval
+        # backed-off events don't NOTIFY when they come due, so wake up for them
+        try:
+            async with self._session_factory() as db:
+                next_attempt = await next_outbox_attempt_at(db)
+        except Exception:
+            logger.debug("could not read next outbox attempt time", exc_info=True)
+            next_attempt = None
+        if next_attempt is not None:
+            due_in = (next_attempt - datetime.now(timezone.utc)).total_seconds()
+            timeout = max(0.0, min(timeout, due_in))
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return
+        if self.coalesce_window > 0:
+            await asyncio.sleep(self.coalesce_window)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self._wakeup.set()
+
+    def _is_listening(self) -> bool:
+        if self._listen_conn is None:
+            return False
+        driver = self._listen_conn[1]
+        return not driver.is_closed()
+
+    async def _listen(self) -> None:
+        await self._unlisten()
+        conn = None
+        try:
+            conn = await self._engine.connect()
+            raw = await conn.get_raw_connection()
+            driver = raw.driver_connection
+            await driver.add_listener(OUTBOX_NOTIFY_CHANNEL, self._on_notify)
+        except Exception as exc:
+            logger.warning("outbox LISTEN unavailable, polling every %.1fs: %s",
+                           self.poll_interval, exc)
+            if conn is not None:
+                await conn.close()
+            return
+        self._listen_conn = (conn, driver)
+        logger.info("outbox relay listening on %s", OUTBOX_NOTIFY_CHANNEL)
+
+    async def _unlisten(self) -> None:
+        if self._listen_conn is None:
+            return
+        conn, driver = self._listen_conn
+        self._listen_conn = None
+        try:
+            if not driver.is_closed():
+                await driver.remove_listener(OUTBOX_NOTIFY_CHANNEL, self._on_notify)
+            await conn.close()
+        except Exception:
+            logger.debug("error closing outbox LISTEN connection", exc_info=True)
+
+    async def drain(
+        self,
+        max_in_flight: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+    ) -> int:
+        """Publish until the outbox is empty; returns the number of events sent.
+
+        ``max_in_flight`` and ``rate_limit`` (events/second) override the
+        steady-state settings, e.g. for a capped full-parallel catch-up.
+        """
+        workers = max(1, max_in_flight or self.max_in_flight)
+        limiter = RateLimiter(rate_limit) if rate_limit else None
+        tasks = [asyncio.create_task(self._drain_worker(limiter)) for _ in range(workers)]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            # one failed worker stops the drain: the others must not keep
+            # publishing next to the ones run() starts on its retry
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for task in tasks:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+        return sum(task.result() for task in tasks)
+
+    async def _drain_worker(self, limiter: Optional[RateLimiter] = None) -> int:
+        total = 0
+        while True:
+            if limiter is not None:
+                await limiter.acquire(self.batch_size)
+            published = await self.relay_batch()
+            if published == 0:
+                return total
+            total += published
+
+    async def relay_batch(self) -> int:
+        # the claim commits before HQ is called: no row locks or pooled
+        # connection are held while the request is in flight
+        async with self._session_factory() as db:
+            async with db.begin():
+                rows = await claim_outbox_batch(db, self.batch_size, self.claim_lease)
+        if not rows:
+            return 0
+
+        ids: List[int] = [row.id for row in rows]
+        try:
+            result = await self._client.publish_events([to_wire_event(row) for row in rows])
+        except Exception as exc:
+            # record the failure; the backoff replaces the lease
+            async with self._session_factory() as db:
+                async with db.begin():
+                    await nack_outbox_events(
+                        db, ids, str(exc),
+                        base_delay=self.retry_base_delay,
+                        max_delay=self.max_backoff,
+                    )
+            raise PublishFailed(str(exc)) from exc
+
+        async with self._session_factory() as db:
+            async with db.begin():
+                await ack_outbox_events(db, ids)
+                await db.execute(ADVANCE_CURSOR_SQL, {
+                    "id": uuid.uuid4(),
+                    "stream_name": OUTBOX_STREAM,
+                    "last_outbox_id": max(ids),
+                })
+
+        logger.info("published %d outbox events (accepted=%d duplicates=%d, last_id=%d)",
+                    len(ids), result.accepted, result.duplicates, max(ids))
+        return len(ids)
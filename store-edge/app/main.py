@@ -1,10 +1,241 @@
-from fastapi import FastAPI
+# first, so the "imports" startup phase covers everything below
+from app.core.startup import startup_timer
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from functools import partial
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.api.v1.routes_catalog import router as catalog_router
 from app.api.v1.routes_checkout import router as checkout_router
+from app.api.v1.routes_exports import router as exports_router
+from app.api.v1.routes_inventory import router as inventory_router
+from app.api.v1.routes_payments import router as payments_router
+from app.api.v1.routes_reports import router as reports_router
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, registry
+from app.db.base import AsyncSessionLocal, engine, pool_stats
+from app.db.leader import LeaderElection, leader_lock_key
+from app.db.notifications import NotificationHub
+from app.db.partitions import run_partition_maintainer
+from app.db.warmup import prepare_orm, warm_pool
+from app.domain.catalog.index import (
+    CATALOG_NOTIFY_CHANNEL,
+    refresh_catalog_index,
+    run_catalog_index_refresher,
+)
+from app.domain.checkout.idempotency import run_idempotency_key_purger
+from app.domain.errors import BusinessError, NotFoundError
+from app.domain.inventory.availability import (
+    INVENTORY_NOTIFY_CHANNEL,
+    availability,
+    run_availability_refresher,
+    run_reservation_sweeper,
+)
+from app.domain.payments.poller import PaymentPoller
+from app.domain.payments.providers import FakePaymentProvider, register_provider
+from app.domain.payments.service import (
+    PAYMENT_STATUS_NOTIFY_CHANNEL,
+    on_payment_status_notify,
+    payment_watchers,
+)
+from app.domain.pricing.engine import (
+    refresh_pricing_rules,
+    request_pricing_refresh,
+    run_pricing_rules_refresher,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs once per worker process. Caches, their refreshers and the LISTEN
+    # connection are per worker; the singleton jobs run in one worker only.
+    startup_timer.lap("imports")
+
+    with startup_timer.phase("orm"):
+        prepare_orm()
+
+    # pre-open connections so the first scans after a restart skip connection
+    # setup and statement compilation
+    with startup_timer.phase("pool_warmup"):
+        try:
+            await warm_pool(engine, min(settings.DB_WARMUP_CONNECTIONS, settings.DB_POOL_SIZE))
+        except Exception:
+            logger.exception("db pool warm-up failed, continuing with a cold pool")
+
+    # listen before loading the caches so no change falls between the two
+    notifications = NotificationHub(engine, reconnect_interval=settings.NOTIFY_RECONNECT_SECONDS)
+    notifications.subscribe(CATALOG_NOTIFY_CHANNEL, request_pricing_refresh)
+    notifications.subscribe(INVENTORY_NOTIFY_CHANNEL, availability.apply_notification)
+    notifications.subscribe(PAYMENT_STATUS_NOTIFY_CHANNEL, on_payment_status_notify)
+    with startup_timer.phase("listen"):
+        await notifications.listen()
+
+    # warm the barcode index before the first scan hits the API
+    with startup_timer.phase("caches"):
+        async with AsyncSessionLocal() as db:
+            await refresh_catalog_index(db, force=True)
+            await refresh_pricing_rules(db, force=True)
+            await availability.refresh(db)
+    tasks = [
+        asyncio.create_task(notifications.run()),
+        asyncio.create_task(
+            run_catalog_index_refresher(AsyncSessionLocal, settings.CATALOG_INDEX_REFRESH_SECONDS)
+        ),
+        asyncio.create_task(
+            run_pricing_rules_refresher(AsyncSessionLocal, settings.CATALOG_INDEX_REFRESH_SECONDS)
+        ),
+        asyncio.create_task(
+            run_availability_refresher(AsyncSessionLocal, settings.AVAILABILITY_REFRESH_SECONDS)
+        ),
+    ]
+
+    if "fake" in settings.PAYMENT_PROVIDERS.split(","):
+        register_provider(FakePaymentProvider(
+            max_batch=settings.PAYMENT_STATUS_BATCH_SIZE,
+            max_concurrency=settings.PAYMENT_PROVIDER_MAX_CONCURRENCY,
+        ))
+    payment_poller = PaymentPoller(
+        AsyncSessionLocal,
+        payment_watchers,
+        interval=settings.PAYMENT_POLL_INTERVAL_SECONDS,
+    )
 
-app = FastAPI()
+    jobs = [
+        partial(
+            run_partition_maintainer,
+            engine,
+            settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+            months_ahead=settings.PARTITION_MONTHS_AHEAD,
+            retention_months=settings.TRANSACTION_RETENTION_MONTHS,
+            outbox_retention_months=settings.OUTBOX_RETENTION_MONTHS,
+        ),
+        partial(
+            run_reservation_sweeper,
+            AsyncSessionLocal,
+            settings.RESERVATION_SWEEP_INTERVAL_SECONDS,
+            ttl=settings.RESERVATION_TTL_SECONDS,
+        ),
+        partial(
+            run_idempotency_key_purger,
+            AsyncSessionLocal,
+            settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS,
+            ttl=settings.IDEMPOTENCY_KEY_TTL_SECONDS,
+        ),
+        payment_poller.run,
+    ]
+
+    hq_client = None
+    app.state.sync_agent = None
+    if settings.HQ_BASE_URL:
+        # the sync stack (httpx, msgpack, zstandard) is only imported by
+        # stores that talk to HQ
+        from app.domain.sync.agent import SyncAgent
+        from app.domain.sync.catalog_sync import CatalogSync
+        from app.domain.sync.hq_client import HttpHQClient
+        from app.domain.sync.relay import OutboxRelay
+
+        hq_client = HttpHQClient(
+            settings.HQ_BASE_URL,
+            settings.HQ_TIMEOUT_SECONDS,
+            ping_timeout=settings.HQ_PING_TIMEOUT_SECONDS,
+            wire_format=settings.SYNC_WIRE_FORMAT,
+            compression=settings.SYNC_WIRE_COMPRESSION,
+        )
+        relay = OutboxRelay(
+            AsyncSessionLocal,
+            hq_client,
+            batch_size=settings.OUTBOX_BATCH_SIZE,
+            max_in_flight=settings.OUTBOX_MAX_IN_FLIGHT,
+            poll_interval=settings.OUTBOX_POLL_INTERVAL_SECONDS,
+            max_backoff=settings.OUTBOX_MAX_BACKOFF_SECONDS,
+            engine=engine,
+            fallback_poll_interval=settings.OUTBOX_FALLBACK_POLL_SECONDS,
+            coalesce_window=settings.OUTBOX_NOTIFY_COALESCE_SECONDS,
+            retry_base_delay=settings.OUTBOX_RETRY_BASE_SECONDS,
+            claim_lease=settings.OUTBOX_CLAIM_LEASE_SECONDS,
+        )
+        catalog_sync = CatalogSync(
+            AsyncSessionLocal,
+            hq_client,
+            store_id=settings.STORE_ID,
+        )
+        sync_agent = SyncAgent(
+            hq_client,
+            relay,
+            catalog_sync,
+            ping_interval=settings.SYNC_PING_INTERVAL_SECONDS,
+            offline_after=settings.SYNC_OFFLINE_AFTER_FAILURES,
+            max_backoff=settings.SYNC_MAX_PING_BACKOFF_SECONDS,
+            catalog_interval=settings.CATALOG_SYNC_INTERVAL_SECONDS,
+            catchup_max_in_flight=settings.SYNC_CATCHUP_MAX_IN_FLIGHT,
+            catchup_rate=settings.SYNC_CATCHUP_RATE_PER_SECOND,
+        )
+        app.state.sync_agent = sync_agent
+        jobs.append(relay.run)
+        jobs.append(sync_agent.run)
+
+    leader = LeaderElection(
+        engine,
+        leader_lock_key(f"{settings.LEADER_LOCK_NAME}:{settings.STORE_ID}"),
+        jobs,
+        interval=settings.LEADER_RETRY_SECONDS,
+    )
+    app.state.leader = leader
+    tasks.append(asyncio.create_task(leader.run()))
+    startup_timer.ready()
+
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if hq_client is not None:
+            await hq_client.close()
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+
+@app.exception_handler(NotFoundError)
+async def not_found_handler(request: Request, exc: NotFoundError):
+    return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+@app.exception_handler(BusinessError)
+async def business_error_handler(request: Request, exc: BusinessError):
+    return JSONResponse(status_code=409, content={"detail": str(exc)})
 
 app.include_router(checkout_router)
+app.include_router(catalog_router)
+app.include_router(reports_router)
+app.include_router(payments_router)
+app.include_router(exports_router)
+app.include_router(inventory_router)
 
 @app.get("/health")
-async def health():
-    return {"status": "ok"}
+async def health(request: Request):
+    sync_agent = request.app.state.sync_agent
+    leader = request.app.state.leader
+    return {
+        "status": "ok",
+        "worker_pid": os.getpid(),
+        "leader": leader.is_leader,
+        # the sync agent only runs in the leader; other workers have no live state
+        "sync": sync_agent.state.as_dict() if sync_agent is not None and leader.is_leader else None,
+    }
+
+@app.get("/health/db")
+async def health_db():
+    return {"pool": pool_stats()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    gauges = {f"edge_db_pool_{name}": value for name, value in pool_stats().items()}
+    gauges.update(startup_timer.gauges())
+    return registry.render(gauges)
@@ -0,0 +1,93 @@
+# benchmarks/checkout_load.py
+"""Simulated POS terminals driving the checkout API end to end.
+
+Each terminal runs create -> add K items -> finalize in a loop through the
+real FastAPI app (in-process ASGI transport, real Postgres from DB_URL).
+DB_URL should be a scratch database and HQ_BASE_URL must be unset; the
+run's transactions, rollups, outbox events and seeded BENCH-* rows are
+deleted afterwards unless --keep.
+
+    python -m benchmarks.checkout_load --terminals 5 --items 10 --transactions 50 --out run.json
+"""
+import argparse
+import asyncio
+import uuid
+
+import httpx
+
+from app.core.config import settings
+from app.db.base import engine
+from app.main import app
+from benchmarks.common import (
+    Recorder,
+    bench_barcode,
+    cleanup_bench_run,
+    refuse_live_store,
+    seed_bench_catalog,
+    write_results,
+)
+
+
+async def run_terminal(client: httpx.AsyncClient, recorder: Recorder,
+                       terminal_id: str, transactions: int, items: int) -> None:
+    for _ in range(transactions):
+        with recorder.measure("POST /transactions"):
+            resp = await client.post("/api/v1/transactions", json={
+                "store_id": settings.STORE_ID, "terminal_id": terminal_id, "cashier_id": f"C-{terminal_id}",
+            })
+            resp.raise_for_status()
+        txn_id = resp.json()["id"]
+
+        for i in range(items):
+            with recorder.measure("POST /transactions/{id}/items"):
+                resp = await client.post(f"/api/v1/transactions/{txn_id}/items", json={
+                    "barcode": bench_barcode(i),
+                    "quantity": "1",
+                })
+                resp.raise_for_status()
+
+        with recorder.measure("POST /transactions/{id}/finalize"):
+            resp = await client.post(f"/api/v1/transactions/{txn_id}/finalize")
+            resp.raise_for_status()
+
+
+async def main(args: argparse.Namespace) -> dict:
+    refuse_live_store()
+    recorder = Recorder()
+    recorder.install(engine)
+    terminal_prefix = f"BENCH-{uuid.uuid4().hex[:6]}-"
+    # before lifespan, so the startup index build already includes the items;
+    # the edge only serves settings.STORE_ID, so seed and transact on it
+    await seed_bench_catalog(engine, settings.STORE_ID)
+
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://edge") as client:
+                # exclude lifespan warm-up from throughput
+                recorder.reset_clock()
+                await asyncio.gather(*(
+                    run_terminal(client, recorder, f"{terminal_prefix}{n:02d}",
+                                 args.transactions, args.items)
+                    for n in range(args.terminals)
+                ))
+    finally:
+        if not args.keep:
+            await cleanup_bench_run(engine, settings.STORE_ID, terminal_prefix)
+
+    return recorder.report("checkout_load", vars(args))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--terminals", type=int, default=5)
+    parser.add_argument("--items", type=int, default=10, help="items scanned per transaction")
+    parser.add_argument("--transactions", type=int, default=20, help="transactions per terminal")
+    parser.add_argument("--keep", action="store_true", help="leave the run's transactions and seeded rows in place")
+    parser.add_argument("--out", help="write the JSON report here as well as stdout")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    write_results(asyncio.run(main(args)), args.out)
@@ -0,0 +1,211 @@
+# benchmarks/common.py
+import contextvars
+import json
+import platform
+import statistics
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.sql import text
+
+from app.core.config import settings
+
+_current_op: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("bench_op", default=None)
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+class OpStats:
+    """Latency and DB round-trip samples for one named operation."""
+
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.statements: List[int] = []
+        self.commits: List[int] = []
+        self.errors = 0
+
+    def summary(self, elapsed_s: float) -> dict:
+        lat = self.latencies_ms
+        return {
+            "count": len(lat),
+            "errors": self.errors,
+            "throughput_per_s": round(len(lat) / elapsed_s, 2) if elapsed_s else 0.0,
+            "p50_ms": round(percentile(lat, 50), 3),
+            "p95_ms": round(percentile(lat, 95), 3),
+            "p99_ms": round(percentile(lat, 99), 3),
+            "mean_ms": round(statistics.fmean(lat), 3) if lat else 0.0,
+            "statements_per_op": round(statistics.fmean(self.statements), 2) if self.statements else 0.0,
+            "commits_per_op": round(statistics.fmean(self.commits), 2) if self.commits else 0.0,
+        }
+
+
+class Recorder:
+    """Collects per-operation samples; DB counts come from engine event hooks."""
+
+    def __init__(self):
+        self.ops: Dict[str, OpStats] = defaultdict(OpStats)
+        self.started = time.perf_counter()
+
+    def reset_clock(self) -> None:
+        self.started = time.perf_counter()
+
+    def install(self, engine) -> None:
+        sync_engine = getattr(engine, "sync_engine", engine)
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _count_statement(conn, cursor, statement, parameters, context, executemany):
+            op = _current_op.get()
+            if op is not None:
+                op["statements"] += 1
+
+        @event.listens_for(sync_engine, "commit")
+        def _count_commit(conn):
+            op = _current_op.get()
+            if op is not None:
+                op["commits"] += 1
+
+    @contextmanager
+    def measure(self, name: str):
+        counters = {"statements": 0, "commits": 0}
+        token = _current_op.set(counters)
+        start = time.perf_counter()
+        stats = self.ops[name]
+        try:
+            yield
+        except Exception:
+            stats.errors += 1
+            raise
+        else:
+            stats.latencies_ms.append((time.perf_counter() - start) * 1000)
+            stats.statements.append(counters["statements"])
+            stats.commits.append(counters["commits"])
+        finally:
+            _current_op.reset(token)
+
+    def report(self, name: str, params: dict) -> dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "benchmark": name,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "params": params,
+            "elapsed_s": round(elapsed, 3),
+            "operations": {op: stats.summary(elapsed) for op, stats in sorted(self.ops.items())},
+        }
+
+
+BENCH_CATALOG_SIZE = 50
+
+# items are priced from local_catalog, so the scanned barcodes must exist
+SEED_CATALOG_SQL = text("""
+    INSERT INTO local_catalog (id, store_id, sku, barcode, name, price, tax_rate, uom, active, version)
+    SELECT gen_random_uuid(), CAST(:store_id AS varchar), 'BENCH-' || lpad(CAST(g AS text), 4, '0'),
+           '89300000' || lpad(CAST(g AS text), 5, '0'), 'Bench item ' || g, 10000, 10, 'EA', true, 1
+    FROM generate_series(0, CAST(:n AS integer) - 1) AS g
+    ON CONFLICT (store_id, sku) DO NOTHING
+""")
+
+# finalize only decrements SKUs with an inventory row, so seed one per item
+# with enough stock that repeated runs never go negative
+SEED_INVENTORY_SQL = text("""
+    INSERT INTO local_inventory (id, store_id, sku, on_hand, reserved, updated_at)
+    SELECT gen_random_uuid(), CAST(:store_id AS varchar), 'BENCH-' || lpad(CAST(g AS text), 4, '0'),
+           1000000000, 0, now()
+    FROM generate_series(0, CAST(:n AS integer) - 1) AS g
+    ON CONFLICT (store_id, sku) DO NOTHING
+""")
+
+
+def bench_barcode(i: int) -> str:
+    return f"89300000{i % BENCH_CATALOG_SIZE:05d}"
+
+
+async def seed_bench_catalog(engine, store_id: str) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(SEED_CATALOG_SQL, {"store_id": store_id, "n": BENCH_CATALOG_SIZE})
+        await conn.execute(SEED_INVENTORY_SQL, {"store_id": store_id, "n": BENCH_CATALOG_SIZE})
+
+
+def refuse_live_store() -> None:
+    """Exit unless this process is cut off from HQ.
+
+    The checkout benchmarks finalize real PAID transactions: they reach the
+    rollups and the outbox, and a relay would publish them to HQ. Run them
+    against a scratch database (DB_URL) with HQ_BASE_URL unset.
+    """
+    if settings.HQ_BASE_URL:
+        raise SystemExit(
+            "HQ_BASE_URL is set; benchmark sales would be published to HQ. "
+            "Point DB_URL at a scratch database and unset HQ_BASE_URL."
+        )
+
+
+# Everything a run left behind, children first. Bench terminals are unique
+# per run, so rollup rows are removed by terminal rather than rebuilt.
+BENCH_TRANSACTIONS = """
+    SELECT id FROM transactions
+    WHERE store_id = :store_id AND starts_with(terminal_id, :terminal_prefix)
+"""
+
+CLEANUP_RUN_SQL = [
+    text(f"""
+        DELETE FROM outbox
+        WHERE aggregate_type = 'Transaction'
+          AND aggregate_id IN (SELECT CAST(id AS text) FROM ({BENCH_TRANSACTIONS}) b)
+    """),
+    text(f"DELETE FROM inventory_reservations WHERE transaction_id IN ({BENCH_TRANSACTIONS})"),
+    text(f"DELETE FROM idempotency_keys WHERE transaction_id IN ({BENCH_TRANSACTIONS})"),
+    text(f"DELETE FROM payments WHERE transaction_id IN ({BENCH_TRANSACTIONS})"),
+    text(f"DELETE FROM line_items WHERE transaction_id IN ({BENCH_TRANSACTIONS})"),
+    text("""
+        DELETE FROM transactions
+        WHERE store_id = :store_id AND starts_with(terminal_id, :terminal_prefix)
+    """),
+    text("""
+        DELETE FROM sales_hourly
+        WHERE store_id = :store_id AND starts_with(terminal_id, :terminal_prefix)
+    """),
+    text("""
+        DELETE FROM sales_hourly_sku
+        WHERE store_id = :store_id AND starts_with(terminal_id, :terminal_prefix)
+    """),
+    text("""
+        DELETE FROM receipt_counters
+        WHERE store_id = :store_id AND starts_with(terminal_id, :terminal_prefix)
+    """),
+]
+
+CLEANUP_CATALOG_SQL = [
+    text("DELETE FROM local_inventory WHERE store_id = :store_id AND starts_with(sku, 'BENCH-')"),
+    text("DELETE FROM local_catalog WHERE store_id = :store_id AND starts_with(sku, 'BENCH-')"),
+]
+
+
+async def cleanup_bench_run(engine, store_id: str, terminal_prefix: str) -> None:
+    """Delete the run's transactions and everything derived from them,
+    then the seeded BENCH-* catalog and inventory rows."""
+    params = {"store_id": store_id, "terminal_prefix": terminal_prefix}
+    async with engine.begin() as conn:
+        for stmt in CLEANUP_RUN_SQL:
+            await conn.execute(stmt, params)
+        for stmt in CLEANUP_CATALOG_SQL:
+            await conn.execute(stmt, {"store_id": store_id})
+
+
+def write_results(report: dict, path: Optional[str]) -> None:
+    text = json.dumps(report, indent=2)
+    if path:
+        with open(path, "w") as fh:
+            fh.write(text + "\n")
+    print(text)
@@ -0,0 +1,47 @@
+# benchmarks/compare.py
+"""Compare two benchmark JSON reports and flag regressions.
+
+    python -m benchmarks.compare before.json after.json --threshold 10
+"""
+import argparse
+import json
+import sys
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "statements_per_op")
+
+
+def compare(before: dict, after: dict, threshold_pct: float) -> int:
+    regressions = 0
+    for op, new in after["operations"].items():
+        old = before["operations"].get(op)
+        if old is None:
+            print(f"{op}: new operation")
+            continue
+        parts = []
+        for metric in METRICS:
+            a, b = old.get(metric, 0.0), new.get(metric, 0.0)
+            delta = ((b - a) / a * 100) if a else 0.0
+            flag = ""
+            if delta > threshold_pct:
+                flag = " !"
+                regressions += 1
+            parts.append(f"{metric} {a} -> {b} ({delta:+.1f}%){flag}")
+        print(f"{op}: " + ", ".join(parts))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent increase counted as regression")
+    args = parser.parse_args()
+    with open(args.before) as fh:
+        before = json.load(fh)
+    with open(args.after) as fh:
+        after = json.load(fh)
+    sys.exit(1 if compare(before, after, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# benchmarks/outbox_claim.py
+"""Outbox claim latency as the table grows with already-published rows.
+
+    python -m benchmarks.outbox_claim --sizes 100000,1000000,10000000 --out claim.json
+
+Keeps a fixed backlog (due plus backed-off events) and grows the published
+history around it; with the partial queue index the claim latency should
+not move with table size. Rows are seeded into a copy of the outbox in a
+scratch schema, out of reach of a running relay, which is dropped
+afterwards unless --keep.
+"""
+import argparse
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.sql import text
+
+from app.db.base import DB_URL, engine
+from app.db.repositories.outbox import claim_outbox_batch, next_outbox_attempt_at
+from benchmarks.common import Recorder, write_results
+
+SEED_SQL = text("""
+    INSERT INTO outbox (
+        event_id, event_type, aggregate_type, aggregate_id, store_id,
+        payload, occurred_at, publish_attempts, published_at, next_attempt_at
+    )
+    SELECT gen_random_uuid(), 'SaleRecorded', 'Transaction', CAST(g AS text), CAST(:store_id AS varchar),
+           jsonb_build_object('seq', g, 'currency', 'VND'),
+           now(), CAST(:attempts AS bigint), CASE WHEN CAST(:published AS boolean) THEN now() END,
+           now() + make_interval(secs => CAST(:delay AS float8))
+    FROM generate_series(1, CAST(:n AS integer)) AS g
+""")
+
+SCRATCH_SCHEMA = "bench_outbox_claim"
+
+# same columns, defaults and indexes as the live outbox, own id sequence, no NOTIFY trigger
+SCRATCH_DDL = [
+    f"DROP SCHEMA IF EXISTS {SCRATCH_SCHEMA} CASCADE",
+    f"CREATE SCHEMA {SCRATCH_SCHEMA}",
+    f"CREATE SEQUENCE {SCRATCH_SCHEMA}.outbox_id_seq",
+    f"CREATE TABLE {SCRATCH_SCHEMA}.outbox (LIKE public.outbox INCLUDING ALL) PARTITION BY RANGE (occurred_at)",
+    f"ALTER TABLE {SCRATCH_SCHEMA}.outbox ALTER COLUMN id SET DEFAULT nextval('{SCRATCH_SCHEMA}.outbox_id_seq')",
+    f"CREATE TABLE {SCRATCH_SCHEMA}.outbox_default PARTITION OF {SCRATCH_SCHEMA}.outbox DEFAULT",
+]
+
+CLEANUP_SQL = text(f"DROP SCHEMA IF EXISTS {SCRATCH_SCHEMA} CASCADE")
+
+
+async def seed(bench_engine, n: int, store_id: str, published: bool, delay: float = 0.0,
+               chunk: int = 1_000_000) -> None:
+    while n > 0:
+        batch = min(n, chunk)
+        async with bench_engine.begin() as conn:
+            await conn.execute(SEED_SQL, {
+                "n": batch, "store_id": store_id, "published": published,
+                "attempts": 1 if published else 0, "delay": delay,
+            })
+        n -= batch
+
+
+async def main(args: argparse.Namespace) -> dict:
+    async with engine.begin() as conn:
+        for ddl in SCRATCH_DDL:
+            await conn.execute(text(ddl))
+    # unqualified "outbox" in the repository SQL resolves to the scratch copy
+    bench_engine = create_async_engine(
+        DB_URL, connect_args={"server_settings": {"search_path": f"{SCRATCH_SCHEMA},public"}},
+    )
+    recorder = Recorder()
+    recorder.install(bench_engine)
+    sizes = sorted(int(s) for s in args.sizes.split(","))
+
+    try:
+        await seed(bench_engine, args.pending, args.store_id, published=False)
+        await seed(bench_engine, args.backed_off, args.store_id, published=False, delay=86400.0)
+        seeded = args.pending + args.backed_off
+
+        for size in sizes:
+            if size > seeded:
+                await seed(bench_engine, size - seeded, args.store_id, published=True)
+                seeded = size
+            async with bench_engine.begin() as conn:
+                await conn.execute(text("ANALYZE outbox"))
+
+            recorder.reset_clock()
+            async with AsyncSession(bench_engine) as db:
+                for _ in range(args.iterations):
+                    async with db.begin() as txn:
+                        with recorder.measure(f"claim_batch@{size}"):
+                            await claim_outbox_batch(db, args.batch_size, lease=60.0)
+                        await txn.rollback()
+                    with recorder.measure(f"next_attempt_at@{size}"):
+                        await next_outbox_attempt_at(db)
+    finally:
+        await bench_engine.dispose()
+        if not args.keep:
+            async with engine.begin() as conn:
+                await conn.execute(CLEANUP_SQL)
+        await engine.dispose()
+
+    return recorder.report("outbox_claim", vars(args))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100000,1000000,10000000",
+                        help="comma-separated total outbox rows to measure at")
+    parser.add_argument("--pending", type=int, default=2000, help="due unpublished events")
+    parser.add_argument("--backed-off", type=int, default=2000, help="unpublished events scheduled later")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--store-id", default="BENCH_OUTBOX")
+    parser.add_argument("--keep", action="store_true", help=f"leave the {SCRATCH_SCHEMA} schema in place")
+    parser.add_argument("--out")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    write_results(asyncio.run(main(args)), args.out)
@@ -0,0 +1,79 @@
+# benchmarks/service_micro.py
+"""Micro-benchmarks of the checkout service functions, without HTTP.
+
+Finalizes real transactions, so like checkout_load it refuses to run with
+HQ_BASE_URL set and cleans up after itself unless --keep.
+
+    python -m benchmarks.service_micro --iterations 200 --out micro.json
+"""
+import argparse
+import asyncio
+import uuid
+from decimal import Decimal
+
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal, engine
+from app.domain.catalog.index import refresh_catalog_index
+from app.domain.checkout.schemas import AddItem, TransactionCreate
+from app.domain.checkout.service import (
+    add_item_to_transaction,
+    create_transaction,
+    finalize_transaction,
+    remove_item_from_transaction,
+    update_item_quantity,
+)
+from benchmarks.common import (
+    Recorder,
+    bench_barcode,
+    cleanup_bench_run,
+    refuse_live_store,
+    seed_bench_catalog,
+    write_results,
+)
+
+
+async def main(args: argparse.Namespace) -> dict:
+    refuse_live_store()
+    recorder = Recorder()
+    recorder.install(engine)
+    terminal_id = f"MICRO-{uuid.uuid4().hex[:6]}"
+    item = AddItem(barcode=bench_barcode(1), quantity=Decimal(1))
+    await seed_bench_catalog(engine, settings.STORE_ID)
+
+    try:
+        async with AsyncSessionLocal() as db:
+            await refresh_catalog_index(db, force=True)
+            for _ in range(args.iterations):
+                with recorder.measure("create_transaction"):
+                    txn = await create_transaction(db, TransactionCreate(
+                        store_id=settings.STORE_ID, terminal_id=terminal_id,
+                    ))
+                for _ in range(args.lines):
+                    with recorder.measure("add_item_to_transaction"):
+                        line = await add_item_to_transaction(db, txn.id, item)
+                with recorder.measure("update_item_quantity"):
+                    await update_item_quantity(db, txn.id, line.id, Decimal(2))
+                with recorder.measure("remove_item_from_transaction"):
+                    await remove_item_from_transaction(db, txn.id, line.id)
+                with recorder.measure("finalize_transaction"):
+                    await finalize_transaction(db, txn.id, verify_totals=args.verify_totals)
+    finally:
+        if not args.keep:
+            await cleanup_bench_run(engine, settings.STORE_ID, terminal_id)
+        await engine.dispose()
+    return recorder.report("service_micro", vars(args))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--lines", type=int, default=5, help="lines added per transaction")
+    parser.add_argument("--verify-totals", action="store_true")
+    parser.add_argument("--keep", action="store_true", help="leave the run's transactions and seeded rows in place")
+    parser.add_argument("--out")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    write_results(asyncio.run(main(args)), args.out)
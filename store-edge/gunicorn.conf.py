@@ -0,0 +1,20 @@
+# Multi-worker mode: gunicorn -c gunicorn.conf.py app.main:app
+#
+# Every worker runs the FastAPI lifespan on its own: its own connection pool
+# (DB_POOL_SIZE + DB_MAX_OVERFLOW each, keep workers * that under Postgres'
+# max_connections), its own caches kept in step through LISTEN/NOTIFY, and
+# one of them wins the advisory lock that runs the relay, catalog sync and
+# sweepers. Migrations run once, before gunicorn starts.
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", min(4, multiprocessing.cpu_count())))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# payment long polls hold a request for up to PAYMENT_LONG_POLL_MAX_SECONDS
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+# app import happens after fork so no engine, pool or event loop is shared
+preload_app = False
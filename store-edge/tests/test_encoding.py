@@ -0,0 +1,102 @@
+import importlib.util
+import os
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.domain.sync.encoding import _columnar_groups, encode_batch
+
+# the decoder lives in HQ; load it by path, under a name that can't clash
+# with this service's "app" package
+HQ_ENCODING = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir,
+    "hq-platform", "app", "domain", "ingestion", "encoding.py",
+)
+
+
+@pytest.fixture(scope="module")
+def hq_encoding():
+    if not os.path.exists(HQ_ENCODING):
+        pytest.skip("hq-platform is not checked out next to store-edge")
+    spec = importlib.util.spec_from_file_location("hq_ingestion_encoding", HQ_ENCODING)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def wire_event(event_type, aggregate_id, timestamp, store_id="STORE_001", currency="VND"):
+    return {
+        "event_id": str(uuid.uuid4()),
+        "event_type": event_type,
+        "aggregate_type": "Transaction" if event_type == "SaleRecorded" else "Inventory",
+        "aggregate_id": aggregate_id,
+        "store_id": store_id,
+        "timestamp": timestamp,
+        "payload": {"currency": currency, "n": aggregate_id},
+    }
+
+
+def interleaved_batch():
+    types = ["SaleRecorded", "InventoryAdjusted", "SaleRecorded", "InventoryAdjusted", "SaleRecorded"]
+    return [
+        wire_event(event_type, str(i), f"2026-10-18T12:00:0{i}.{123456 + i}+07:00")
+        for i, event_type in enumerate(types)
+    ]
+
+
+def test_groups_factor_out_constant_fields():
+    groups = _columnar_groups(interleaved_batch())
+
+    sales = next(g for g in groups if g["event_type"] == "SaleRecorded")
+    assert sales["shared"] == {"store_id": "STORE_001", "aggregate_type": "Transaction"}
+    assert sales["shared_payload"] == {"currency": "VND"}
+    assert sales["seq"] == [0, 2, 4]
+    assert all("currency" not in p for p in sales["payload"])
+
+
+def test_timestamps_are_exact_integer_microseconds():
+    late = "2286-11-20T17:46:39.999999+00:00"
+    groups = _columnar_groups([wire_event("SaleRecorded", "1", late)])
+
+    assert groups[0]["timestamp_us"] == [9_999_999_999_999_999]
+
+
+def test_round_trip_keeps_order_fields_and_timestamps(hq_encoding):
+    events = interleaved_batch()
+    events[3]["store_id"] = "STORE_002"
+
+    decoded = hq_encoding._expand_columnar({"v": 1, "groups": _columnar_groups(events)})
+
+    assert [e["event_id"] for e in decoded] == [uuid.UUID(e["event_id"]) for e in events]
+    for sent, received in zip(events, decoded):
+        assert received["event_type"] == sent["event_type"]
+        assert received["aggregate_type"] == sent["aggregate_type"]
+        assert received["aggregate_id"] == sent["aggregate_id"]
+        assert received["store_id"] == sent["store_id"]
+        assert received["payload"] == sent["payload"]
+        assert received["timestamp"] == datetime.fromisoformat(sent["timestamp"])
+        assert received["timestamp"].tzinfo == timezone.utc
+
+
+def test_wire_round_trip(hq_encoding):
+    pytest.importorskip("msgpack")
+    events = interleaved_batch()
+
+    body, headers = encode_batch(events, "columnar", "gzip")
+    decoded = hq_encoding.decode_batch(
+        body, headers["Content-Type"], headers.get("Content-Encoding"), max_bytes=1 << 20,
+    )
+
+    assert [str(e["event_id"]) for e in decoded] == [e["event_id"] for e in events]
+
+
+def test_json_fallback_round_trip(hq_encoding):
+    events = interleaved_batch()
+
+    body, headers = encode_batch(events, "json", "gzip")
+    decoded = hq_encoding.decode_batch(
+        body, headers["Content-Type"], headers.get("Content-Encoding"), max_bytes=1 << 20,
+    )
+
+    assert decoded == events
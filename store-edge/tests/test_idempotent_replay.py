@@ -0,0 +1,64 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.domain.checkout import service
+from app.domain.checkout.idempotency import request_hash
+from app.domain.checkout.schemas import BasketUpdate
+from app.domain.errors import BusinessError
+
+
+def basket(quantity="2"):
+    return BasketUpdate.model_validate({"operations": [
+        {"op": "add", "barcode": "8930000000001", "quantity": quantity},
+        {"op": "remove", "line_item_id": "00000000-0000-0000-0000-000000000001"},
+    ]})
+
+
+def stored_key(monkeypatch, transaction_id, fingerprint, response):
+    calls = []
+
+    async def get_idempotency_key(db, key):
+        calls.append(key)
+        return SimpleNamespace(transaction_id=transaction_id, request_hash=fingerprint, response=response)
+
+    monkeypatch.setattr(service, "get_idempotency_key", get_idempotency_key)
+    return calls
+
+
+def test_request_hash_is_stable_and_covers_transaction_and_payload():
+    txn = uuid4()
+
+    assert request_hash(txn, basket()) == request_hash(txn, basket())
+    assert request_hash(txn, basket()) != request_hash(uuid4(), basket())
+    assert request_hash(txn, basket()) != request_hash(txn, basket(quantity="3"))
+
+
+def test_retry_with_same_key_replays_stored_response(monkeypatch):
+    txn = uuid4()
+    response = {"id": str(txn), "total": "20.00", "lines": []}
+    calls = stored_key(monkeypatch, txn, request_hash(txn, basket()), response)
+
+    # db is never touched: the stored response is returned before any write
+    result, replayed = asyncio.run(service.submit_basket(None, txn, basket(), idempotency_key="k-1"))
+
+    assert (result, replayed) == (response, True)
+    assert calls == ["k-1"]
+
+
+def test_key_reused_for_a_different_basket_is_refused(monkeypatch):
+    txn = uuid4()
+    stored_key(monkeypatch, txn, request_hash(txn, basket()), {})
+
+    with pytest.raises(BusinessError):
+        asyncio.run(service.submit_basket(None, txn, basket(quantity="3"), idempotency_key="k-1"))
+
+
+def test_key_reused_for_another_transaction_is_refused(monkeypatch):
+    txn, other = uuid4(), uuid4()
+    stored_key(monkeypatch, txn, request_hash(txn, basket()), {})
+
+    with pytest.raises(BusinessError):
+        asyncio.run(service.submit_basket(None, other, basket(), idempotency_key="k-1"))
@@ -0,0 +1,110 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import text
+
+from app.db.repositories.outbox import claim_outbox_batch, insert_inventory_adjusted
+from app.domain.sync.hq_client import PublishResult
+from app.domain.sync.relay import OUTBOX_STREAM, OutboxRelay, PublishFailed
+
+
+class FakeHQ:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.batches: List[List[Dict[str, Any]]] = []
+
+    async def publish_events(self, events: List[Dict[str, Any]]) -> PublishResult:
+        if self.fail:
+            raise ConnectionError("HQ unreachable")
+        self.batches.append(events)
+        return PublishResult(accepted=len(events), duplicates=0)
+
+
+async def outbox_state(session_factory) -> Dict[int, Any]:
+    async with session_factory() as db:
+        rows = await db.execute(text("""
+            SELECT id, published_at IS NOT NULL AS published, publish_attempts, last_error,
+                   next_attempt_at > now() AS deferred
+            FROM outbox ORDER BY id
+        """))
+        return {row.id: row for row in rows}
+
+
+async def cursor(session_factory):
+    async with session_factory() as db:
+        return await db.scalar(
+            text("SELECT last_outbox_id FROM sync_cursors WHERE stream_name = :stream"),
+            {"stream": OUTBOX_STREAM},
+        )
+
+
+async def make_due(session_factory, ids) -> None:
+    async with session_factory() as db:
+        async with db.begin():
+            await db.execute(
+                text("UPDATE outbox SET next_attempt_at = now() WHERE id = ANY(:ids)"), {"ids": list(ids)},
+            )
+
+
+def relay(session_factory, client, batch_size=10) -> OutboxRelay:
+    return OutboxRelay(
+        session_factory, client, batch_size=batch_size, max_in_flight=1,
+        poll_interval=1.0, max_backoff=300.0, retry_base_delay=60.0, claim_lease=60.0,
+    )
+
+
+def test_claim_nack_ack_and_cursor(db_engine):
+    async def scenario():
+        engine = db_engine()
+        session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        try:
+            async with session_factory() as db:
+                async with db.begin():
+                    await db.execute(text("DELETE FROM outbox"))
+                    await db.execute(text("DELETE FROM sync_cursors WHERE stream_name = :s"), {"s": OUTBOX_STREAM})
+                    for sku in ("A", "B", "C"):
+                        await insert_inventory_adjusted(db, "STORE_TEST", sku, "COUNT", 1)
+            ids = sorted(await outbox_state(session_factory))
+
+            # a failed publish records the attempt and backs every event off
+            with pytest.raises(PublishFailed):
+                await relay(session_factory, FakeHQ(fail=True)).relay_batch()
+            state = await outbox_state(session_factory)
+            assert all(not r.published and r.publish_attempts == 1 and r.deferred for r in state.values())
+            assert all("HQ unreachable" in r.last_error for r in state.values())
+            assert await cursor(session_factory) is None
+
+            # backed-off events are not claimable until due
+            async with session_factory() as db:
+                async with db.begin():
+                    assert await claim_outbox_batch(db, 10, lease=60.0) == []
+
+            # once due, a batch is published in id order and acked; the cursor
+            # stops below the lowest event still unpublished
+            await make_due(session_factory, ids)
+            hq = FakeHQ()
+            assert await relay(session_factory, hq, batch_size=2).relay_batch() == 2
+            assert [e["aggregate_id"] for e in hq.batches[0]] == ["A", "B"]
+            state = await outbox_state(session_factory)
+            assert [state[i].published for i in ids] == [True, True, False]
+            assert state[ids[0]].last_error is None
+            assert await cursor(session_factory) == ids[2] - 1
+
+            # another relay's lease hides the last event until it expires
+            async with session_factory() as db:
+                async with db.begin():
+                    leased = await claim_outbox_batch(db, 10, lease=60.0)
+            assert [row.id for row in leased] == [ids[2]]
+            assert await relay(session_factory, hq).relay_batch() == 0
+
+            await make_due(session_factory, [ids[2]])
+            assert await relay(session_factory, hq).relay_batch() == 1
+            assert all(r.published for r in (await outbox_state(session_factory)).values())
+            assert await cursor(session_factory) == ids[2]
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
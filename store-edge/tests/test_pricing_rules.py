@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.domain.catalog.index import CatalogEntry
+from app.domain.pricing.rules import BASKET_THRESHOLD, MULTI_BUY, compile_rules
+
+STORE = "STORE_001"
+NOW = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+def promotion(kind, code, **fields):
+    values = {
+        "store_id": STORE, "sku": None, "category": None, "buy_quantity": None,
+        "bundle_price": None, "min_subtotal": None, "discount_amount": None,
+        "discount_percent": None, "starts_at": None, "ends_at": None,
+    }
+    values.update(fields)
+    return SimpleNamespace(kind=kind, code=code, **values)
+
+
+def line(sku, quantity, unit_price, tax_rate=None):
+    return SimpleNamespace(
+        id=uuid4(), sku=sku, quantity=Decimal(quantity), unit_price=Decimal(unit_price),
+        tax_rate=None if tax_rate is None else Decimal(tax_rate),
+    )
+
+
+def entry(sku, category):
+    return CatalogEntry(STORE, sku, None, sku, category, Decimal("10.00"), None, "EA", 1)
+
+
+def test_multi_buy_discounts_whole_bundles_only():
+    rules = compile_rules(
+        [promotion(MULTI_BUY, "3FOR25", sku="A", buy_quantity=Decimal(3), bundle_price=Decimal("25.00"))],
+        [], stamp=(1,),
+    )
+    a = line("A", 7, "10.00")
+
+    priced = rules.evaluate(STORE, [a], NOW)
+
+    # two bundles of 3 save 5.00 each, the seventh item is full price
+    assert priced[a.id].discount_amount == Decimal("10.00")
+    assert priced[a.id].line_total == Decimal("60.00")
+
+
+def test_multi_buy_spreads_over_lines_of_the_sku_and_taxes_the_net():
+    rules = compile_rules(
+        [promotion(MULTI_BUY, "2FOR15", sku="A", buy_quantity=Decimal(2), bundle_price=Decimal("15.00"))],
+        [], stamp=(1,),
+    )
+    first, second = line("A", 1, "10.00", "10"), line("A", 1, "10.00", "10")
+
+    priced = rules.evaluate(STORE, [first, second], NOW)
+
+    assert priced[first.id].discount_amount + priced[second.id].discount_amount == Decimal("5.00")
+    assert priced[first.id].tax_amount == Decimal("0.75")
+    assert priced[second.id].tax_amount == Decimal("0.75")
+
+
+def test_category_promotion_expands_to_catalog_skus():
+    rules = compile_rules(
+        [promotion(MULTI_BUY, "DRINKS", category="drinks", buy_quantity=Decimal(2), bundle_price=Decimal("15.00"))],
+        [entry("A", "drinks"), entry("B", "snacks")], stamp=(1,),
+    )
+
+    assert rules.affects(STORE, ["A"])
+    assert not rules.affects(STORE, ["B"])
+
+
+def test_best_reached_threshold_applies_to_the_basket():
+    rules = compile_rules(
+        [
+            promotion(BASKET_THRESHOLD, "OVER50", min_subtotal=Decimal("50.00"), discount_amount=Decimal("5.00")),
+            promotion(BASKET_THRESHOLD, "OVER100", min_subtotal=Decimal("100.00"), discount_percent=Decimal(10)),
+        ],
+        [], stamp=(1,),
+    )
+    a, b = line("A", 3, "20.00"), line("B", 1, "60.00")
+
+    priced = rules.evaluate(STORE, [a, b], NOW)
+
+    # 120.00 reaches OVER100: 12.00 split pro rata by net amount
+    assert priced[a.id].discount_amount == Decimal("6.00")
+    assert priced[b.id].discount_amount == Decimal("6.00")
+    assert rules.affects(STORE, ["anything"])
+
+
+def test_ended_promotion_leaves_lines_at_full_price():
+    ended = NOW - timedelta(hours=1)
+    rules = compile_rules(
+        [promotion(MULTI_BUY, "OLD", sku="A", buy_quantity=Decimal(2), bundle_price=Decimal("15.00"), ends_at=ended)],
+        [], stamp=(1,),
+    )
+    a = line("A", 2, "10.00")
+
+    priced = rules.evaluate(STORE, [a], NOW)
+
+    assert priced[a.id].discount_amount == Decimal(0)
+    assert priced[a.id].line_total == Decimal("20.00")
+
+
+def test_removed_promotion_reprices_stale_discounts_to_zero():
+    # the rules no longer know the SKU, so affects() can't ask for a reprice;
+    # checkout reprices on discount_amount <> 0 and evaluate clears it
+    rules = compile_rules([], [], stamp=(2,))
+    a = line("A", 2, "10.00")
+
+    assert not rules.affects(STORE, ["A"])
+    assert rules.evaluate(STORE, [a], NOW)[a.id].discount_amount == Decimal(0)